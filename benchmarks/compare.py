@@ -0,0 +1,61 @@
+"""Compare two benchmark result files and flag regressions.
+
+    python benchmarks/compare.py baseline.json results.json --threshold 0.2
+
+Exits with status 1 if any timing got slower, or any throughput lower, by more than `threshold`.
+
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Metrics where higher is better; every other timing or count is better when lower
+HIGHER_IS_BETTER = ("per_second", "recall")
+LOWER_IS_BETTER = ("_ms", "seconds", "requests", "_mb")
+
+
+def flatten(data: dict, prefix: str = "") -> dict[str, float]:
+    flat = {}
+    for key, value in data.items():
+        name = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            flat |= flatten(value, name)
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("current", type=Path)
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed relative change")
+    args = parser.parse_args()
+
+    baseline = flatten(json.loads(args.baseline.read_text(encoding="utf-8"))["results"])
+    current = flatten(json.loads(args.current.read_text(encoding="utf-8"))["results"])
+
+    regressions = []
+    for name in sorted(baseline.keys() & current.keys()):
+        before, after = baseline[name], current[name]
+        change = (after - before) / before if before else 0.0
+        if any(marker in name for marker in HIGHER_IS_BETTER):
+            regressed = change < -args.threshold
+        elif any(marker in name for marker in LOWER_IS_BETTER):
+            regressed = change > args.threshold
+        else:
+            regressed = False
+        flag = "REGRESSION" if regressed else ""
+        print(f"{name:55} {before:12.3f} {after:12.3f} {change:+8.1%} {flag}")
+        if regressed:
+            regressions.append(name)
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""Local stand-in for the glossary API, serving fixture data for benchmarks.
+
+Fixtures are JSON files with this layout:
+
+    {
+        "schemes": [{"iri": ..., "prefLabel": ..., ...}, ...],
+        "concepts": {"<scheme iri>": [{"iri": ..., "prefLabel": ..., ...}, ...]},
+        "concept": {"<concept iri>": {"iri": ..., "relations": [...], ...}}
+    }
+
+Record one from the live API with `python benchmarks/record.py`, or generate a synthetic one with
+`synthetic_fixture()`.
+
+"""
+
+import json
+import random
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+WORDS = (
+    "wheat maize rice barley oats rye sorghum soya beans peas lentils potatoes cassava sugar "
+    "beet cane cotton flax hemp wool silk leather steel iron copper aluminium zinc lead tin "
+    "nickel cement lime plaster glass ceramic brick tile timber paper pulp board plastic rubber "
+    "textile yarn fabric carpet coir coconut fibre floor covering woven knitted machinery engine "
+    "pump valve turbine vehicle ship boat aircraft electric power gas water waste recycling "
+    "fresh frozen dried processed raw refined crude manufacture production wholesale retail"
+).split()
+
+
+def synthetic_fixture(
+    num_schemes: int = 2, num_concepts: int = 2000, depth: int = 4, seed: int = 0
+) -> dict:
+    """Deterministic fixture with a broader/narrower hierarchy, for when nothing was recorded."""
+    rng = random.Random(seed)
+    fixture = {"schemes": [], "concepts": {}, "concept": {}}
+    for number in range(num_schemes):
+        scheme_iri = f"http://example.org/scheme{number}/scheme"
+        fixture["schemes"].append(
+            {"iri": scheme_iri, "notation": f"S{number}", "prefLabel": f"Scheme {number}"}
+        )
+        concepts, parents, broader = [], [None], []
+        for idx in range(num_concepts):
+            iri = f"http://example.org/scheme{number}/{idx}"
+            words = " ".join(rng.sample(WORDS, rng.randint(2, 6)))
+            concepts.append(
+                {
+                    "iri": iri,
+                    "notation": f"{idx:06d}",
+                    "identifier": f"{idx:06d}",
+                    "prefLabel": f"{idx:06d} - {words.capitalize()}",
+                    "altLabel": words,
+                    "scopeNote": f"{words.capitalize()}, {' '.join(rng.sample(WORDS, 3))}",
+                }
+            )
+            parent = rng.choice(parents[-200:])
+            if parent is not None:
+                broader.append(
+                    {"type": "broader", "source_concept_iri": iri, "target_concept_iri": parent}
+                )
+            if idx < num_concepts * (depth - 1) // depth:
+                parents.append(iri)
+        for concept in concepts:
+            fixture["concept"][concept["iri"]] = concept | {
+                "concept_schemes": [scheme_iri],
+                "relations": [],
+            }
+        # Like the real API, a concept lists both its broader and its narrower relations
+        for relation in broader:
+            fixture["concept"][relation["source_concept_iri"]]["relations"].append(relation)
+            fixture["concept"][relation["target_concept_iri"]]["relations"].append(relation)
+        fixture["concepts"][scheme_iri] = concepts
+    return fixture
+
+
+def load_fixture(path: Path | str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+class MockGlossaryServer:
+    """Serve a fixture on `/<api_version>/{schemes,concepts,concept,search}` in a thread.
+
+    Every request is counted per endpoint in `counts`, so benchmarks can measure how many HTTP
+    calls an operation needs.
+
+        with MockGlossaryServer(synthetic_fixture()) as server:
+            api = GlossaryAPI(Settings(base_url=server.url))
+
+    """
+
+    def __init__(self, fixture: dict, host: str = "127.0.0.1", port: int = 0):
+        self.fixture = fixture
+        # Concepts which weren't recorded individually are served from the scheme listings
+        self._listed = {
+            concept["iri"]: concept | {"relations": []}
+            for concepts in fixture["concepts"].values()
+            for concept in concepts
+        }
+        self.counts: Counter[str] = Counter()
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def __enter__(self) -> "MockGlossaryServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def reset_counts(self) -> None:
+        with self._lock:
+            self.counts.clear()
+
+    def respond(self, endpoint: str, params: dict[str, str]) -> tuple[int, object]:
+        if endpoint == "schemes":
+            return 200, self.fixture["schemes"]
+        if endpoint == "concepts":
+            concepts = self.fixture["concepts"].get(params.get("concept_scheme_iri"))
+            return (200, concepts) if concepts is not None else (404, {"detail": "Not Found"})
+        if endpoint == "concept":
+            iri = params.get("concept_iri")
+            concept = self.fixture["concept"].get(iri, self._listed.get(iri))
+            return (200, concept) if concept is not None else (404, {"detail": "Not Found"})
+        if endpoint == "search":
+            term = params.get("search_term", "").lower()
+            return (
+                200,
+                [
+                    concept
+                    for concepts in self.fixture["concepts"].values()
+                    for concept in concepts
+                    if term in concept.get("prefLabel", "").lower()
+                ][:100],
+            )
+        return 404, {"detail": "Not Found"}
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                endpoint = url.path.rstrip("/").rsplit("/", 1)[-1]
+                params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+                with server._lock:
+                    server.counts[endpoint] += 1
+                status, data = server.respond(endpoint, params)
+                body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
@@ -0,0 +1,45 @@
+"""Record a benchmark fixture from the live glossary API.
+
+python benchmarks/record.py fixture.json --scheme nace21 --scheme isic4 --max-concepts 500
+
+"""
+
+import argparse
+import json
+from pathlib import Path
+
+from sentier_glossary import CommonSchemes, GlossaryAPI
+from sentier_glossary.settings import Settings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("output", type=Path)
+    parser.add_argument(
+        "--scheme",
+        action="append",
+        choices=[cs.name for cs in CommonSchemes],
+        help="Scheme to record (repeatable); defaults to all `CommonSchemes`",
+    )
+    parser.add_argument("--language", default="en")
+    parser.add_argument(
+        "--max-concepts",
+        type=int,
+        default=200,
+        help="Concepts per scheme recorded individually (with relations) from `/concept`",
+    )
+    args = parser.parse_args()
+
+    api = GlossaryAPI(cfg=Settings(cache_maxsize=0), language_code=args.language)
+    schemes = [CommonSchemes[name] for name in args.scheme] if args.scheme else list(CommonSchemes)
+    fixture = {"schemes": api.schemes(), "concepts": {}, "concept": {}}
+    for scheme in schemes:
+        concepts = api.concepts_for_scheme(scheme)
+        fixture["concepts"][scheme.value] = concepts
+        iris = [concept["iri"] for concept in concepts[: args.max_concepts]]
+        fixture["concept"].update(api._fetch_concepts(iris))
+    args.output.write_text(json.dumps(fixture, ensure_ascii=False), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
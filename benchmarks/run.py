@@ -0,0 +1,331 @@
+"""Benchmark `GlossaryAPI` hot paths against a local mock of the glossary API.
+
+    python benchmarks/run.py --output results.json
+    python benchmarks/run.py --fixture fixture.json --model all-mpnet-base-v2
+
+Results are written as JSON, so two runs (e.g. two releases) can be compared with `compare.py`.
+
+"""
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+from mock_server import WORDS, MockGlossaryServer, load_fixture, synthetic_fixture
+
+import sentier_glossary
+from sentier_glossary import GlossaryAPI
+from sentier_glossary.settings import Settings
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def percentiles(samples: list[float]) -> dict[str, float]:
+    """Summary statistics in milliseconds."""
+    ms = sorted(sample * 1000 for sample in samples)
+    quantiles = statistics.quantiles(ms, n=100, method="inclusive") if len(ms) > 1 else ms * 99
+    return {
+        "n": len(ms),
+        "mean_ms": statistics.fmean(ms),
+        "p50_ms": quantiles[49],
+        "p95_ms": quantiles[94],
+        "p99_ms": quantiles[98],
+        "max_ms": ms[-1],
+    }
+
+
+@contextmanager
+def timer(result: dict, name: str = "seconds"):
+    start = time.perf_counter()
+    yield
+    result[name] = time.perf_counter() - start
+
+
+def make_queries(num: int, seed: int = 1) -> list[str]:
+    rng = random.Random(seed)
+    return [" ".join(rng.sample(WORDS, rng.randint(1, 3))) for _ in range(num)]
+
+
+def make_api(server: MockGlossaryServer, cache_dir: Path, **settings) -> GlossaryAPI:
+    cfg = Settings(base_url=server.url, embedding_cache_dir=cache_dir, **settings)
+    return GlossaryAPI(cfg=cfg, language_code="en")
+
+
+def run(args: argparse.Namespace) -> dict:
+    fixture = (
+        load_fixture(args.fixture)
+        if args.fixture
+        else synthetic_fixture(num_schemes=args.schemes, num_concepts=args.concepts)
+    )
+    schemes = [
+        scheme["iri"] for scheme in fixture["schemes"] if scheme["iri"] in fixture["concepts"]
+    ]
+    queries = make_queries(args.queries)
+    results: dict[str, dict] = {}
+
+    with MockGlossaryServer(fixture) as server, tempfile.TemporaryDirectory() as cache_dir:
+        # Cold start: download every scheme and encode every label
+        api = make_api(server, Path(cache_dir))
+        results["setup_cold"] = {}
+        # tracemalloc slows down allocation-heavy code, so it only covers this step
+        tracemalloc.start()
+        with timer(results["setup_cold"]):
+            api.setup_semantic_search(model_id=args.model, schemes=schemes)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results["setup_cold"]["python_peak_mb"] = peak / 2**20
+        results["setup_cold"]["requests"] = dict(server.counts)
+        results["setup_cold"]["labels"] = sum(
+            api._prepare_scope(scheme).catalogue.num_rows for scheme in schemes
+        )
+
+        # Warm start: a new worker reusing the on-disk embedding cache
+        server.reset_counts()
+        warm = make_api(server, Path(cache_dir))
+        results["setup_warm"] = {}
+        with timer(results["setup_warm"]):
+            warm.setup_semantic_search(model_id=args.model, schemes=schemes)
+        results["setup_warm"]["requests"] = dict(server.counts)
+
+        # Raw encoding throughput of the model, independent of any caching
+        corpus = api._prepare_scope(schemes[0]).catalogue.labels[: args.encode_labels]
+        results["encode"] = {"labels": len(corpus)}
+        with timer(results["encode"]):
+            api._encode_sentences(corpus)
+        results["encode"]["labels_per_second"] = len(corpus) / results["encode"]["seconds"]
+        if args.encode_processes > 1:
+            # Sharded over worker processes; starting the pool is included
+            pooled = make_api(server, Path(cache_dir), encode_processes=args.encode_processes)
+            pooled.setup_semantic_search(model_id=args.model)
+            results["encode_pool"] = {"labels": len(corpus), "processes": args.encode_processes}
+            with timer(results["encode_pool"]):
+                pooled._encode_sentences(corpus)
+            results["encode_pool"]["labels_per_second"] = (
+                len(corpus) / results["encode_pool"]["seconds"]
+            )
+
+        # Per-query latency, with a cold response cache for every query so hydration is included
+        for name, options in [("exact", {}), ("ann", {"nprobe": args.nprobe})]:
+            api._cache.clear()
+            samples, requests = [], []
+            for query in queries:
+                # Every query is new: nothing cached, neither responses nor query embeddings
+                api._cache.clear()
+                api._query_cache.clear()
+                server.reset_counts()
+                start = time.perf_counter()
+                api.semantic_search(query, schemes[0], min_num_results=args.k, **options)
+                samples.append(time.perf_counter() - start)
+                requests.append(sum(server.counts.values()))
+            results[f"semantic_search_{name}"] = percentiles(samples) | {
+                "hydration_requests_mean": statistics.fmean(requests),
+                "hydration_requests_max": max(requests),
+            }
+
+        # Latency once the response and query embedding caches are warm, i.e. scoring only
+        for query in queries:
+            api.semantic_search(query, schemes[0], min_num_results=args.k)
+        samples = []
+        for query in queries:
+            start = time.perf_counter()
+            api.semantic_search(query, schemes[0], min_num_results=args.k)
+            samples.append(time.perf_counter() - start)
+        results["semantic_search_cached"] = percentiles(samples)
+
+        # Recurring queries with the result cache, which also skips scoring and hydration
+        memoized = make_api(server, Path(cache_dir), result_cache_maxsize=1024)
+        memoized.setup_semantic_search(model_id=args.model, schemes=schemes[:1])
+        for query in queries:
+            memoized.semantic_search(query, schemes[0], min_num_results=args.k)
+        samples = []
+        for query in queries:
+            start = time.perf_counter()
+            memoized.semantic_search(query, schemes[0], min_num_results=args.k)
+            samples.append(time.perf_counter() - start)
+        results["semantic_search_memoized"] = percentiles(samples)
+
+        # All schemes in one fused search, against searching each scheme separately
+        for query in queries:
+            for scope in [None, *schemes]:
+                api.semantic_search(query, scope, min_num_results=args.k)
+        fused, separate = [], []
+        for query in queries:
+            start = time.perf_counter()
+            api.semantic_search(query, None, min_num_results=args.k)
+            fused.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            for scheme in schemes:
+                api.semantic_search(query, scheme, min_num_results=args.k)
+            separate.append(time.perf_counter() - start)
+        results["semantic_search_all_schemes"] = percentiles(fused) | {
+            "schemes": len(schemes),
+            "separate_p50_ms": percentiles(separate)["p50_ms"],
+        }
+
+        # Offline keyword search; the first query also builds the lexical index
+        results["lexical_search"] = {}
+        with timer(results["lexical_search"], "build_seconds"):
+            api.lexical_search(queries[0], schemes[0], num_results=args.k)
+        samples = []
+        for query in queries:
+            start = time.perf_counter()
+            api.lexical_search(query, schemes[0], num_results=args.k)
+            samples.append(time.perf_counter() - start)
+        results["lexical_search"] |= percentiles(samples)
+
+        # Scoring alone, with float32, the ANN index and reduced precision embeddings; recall is
+        # measured against exact float32 search
+        index = api._prepare_scope(schemes[0])
+        query_embeddings = api._model().encode(queries, convert_to_tensor=True)
+        k = min(args.k, index.catalogue.num_rows)
+        expected = api._top_k(index, query_embeddings, k)
+        variants = [("float32", api, None), ("ann", api, args.nprobe)]
+        for precision in ("float16", "int8", "binary"):
+            variant = make_api(
+                server,
+                Path(cache_dir),
+                embedding_precision=precision,
+                rescore_factor=args.rescore_factor,
+            )
+            variant.setup_semantic_search(model_id=args.model)
+            variant._embedder = api._embedder
+            variants.append((precision, variant, None))
+        for name, variant, nprobe in variants:
+            variant_index = variant._prepare_scope(schemes[0])
+            samples, found = [], []
+            for row, query_embedding in enumerate(query_embeddings):
+                start = time.perf_counter()
+                [rows] = variant._top_k(variant_index, query_embedding[None], k, nprobe)
+                samples.append(time.perf_counter() - start)
+                found.append(len(set(rows) & set(expected[row])) / k)
+            quantized = variant_index.quantized
+            results[f"topk_{name}"] = percentiles(samples) | {
+                "recall": statistics.fmean(found),
+                "embeddings_mb": (
+                    quantized.nbytes if quantized is not None else variant_index.embeddings.nbytes
+                )
+                / 2**20,
+            }
+
+        api._cache.clear()
+        server.reset_counts()
+        results["semantic_search_many"] = {"queries": len(queries)}
+        with timer(results["semantic_search_many"]):
+            api.semantic_search_many(queries, schemes[0], min_num_results=args.k)
+        results["semantic_search_many"]["queries_per_second"] = (
+            len(queries) / results["semantic_search_many"]["seconds"]
+        )
+        results["semantic_search_many"]["requests"] = dict(server.counts)
+
+        # Local hierarchy: one request per concept once, then hydration without requests
+        server.reset_counts()
+        results["hierarchy"] = {}
+        with timer(results["hierarchy"], "build_seconds"):
+            api.hierarchy(schemes[0])
+        results["hierarchy"]["requests"] = dict(server.counts)
+        api._cache.clear()
+        server.reset_counts()
+        samples = []
+        for query in queries:
+            start = time.perf_counter()
+            api.semantic_search(query, schemes[0], min_num_results=args.k)
+            samples.append(time.perf_counter() - start)
+        results["hierarchy"] |= percentiles(samples) | {"search_requests": dict(server.counts)}
+
+        # Bulk mapping of a file where texts recur, as in real descriptions
+        rows = [random.Random(2).choice(queries) for _ in range(len(queries) * 10)]
+        input_csv = Path(cache_dir) / "map_input.csv"
+        input_csv.write_text("text\n" + "\n".join(rows) + "\n", encoding="utf-8")
+        results["map_file"] = {"rows": len(rows)}
+        with timer(results["map_file"]):
+            sentier_glossary.map_file(
+                api,
+                input_csv,
+                Path(cache_dir) / "map_output.csv",
+                "text",
+                schemes[0],
+                chunk_size=max(len(rows) // 4, 1),
+            )
+        results["map_file"]["rows_per_second"] = len(rows) / results["map_file"]["seconds"]
+
+        # Incremental refresh after 1% of the concepts of a scheme changed their labels
+        for concept in fixture["concepts"][schemes[0]][::100]:
+            concept["prefLabel"] = f"{concept.get('prefLabel', '')} (revised)"
+        server.reset_counts()
+        results["refresh_scheme"] = {}
+        with timer(results["refresh_scheme"]):
+            results["refresh_scheme"] |= api.refresh_scheme(schemes[0])
+        results["refresh_scheme"]["requests"] = dict(server.counts)
+
+        # Offline start: a new worker loading an exported snapshot instead of the API
+        snapshot = Path(cache_dir) / "snapshot"
+        results["snapshot"] = {}
+        with timer(results["snapshot"], "export_seconds"):
+            api.export_snapshot(snapshot)
+        results["snapshot"]["mb"] = (
+            sum(path.stat().st_size for path in snapshot.rglob("*") if path.is_file()) / 2**20
+        )
+        server.reset_counts()
+        offline = make_api(server, None)
+        with timer(results["snapshot"], "load_seconds"):
+            offline.load_snapshot(snapshot)
+        results["snapshot"]["requests"] = dict(server.counts)
+
+        if resource is not None:
+            # kilobytes on Linux, bytes on macOS
+            scale = 2**20 if sys.platform == "darwin" else 2**10
+            maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            results["memory"] = {"max_rss_mb": maxrss / scale}
+
+    return {
+        "meta": {
+            "version": sentier_glossary.__version__,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "model": args.model,
+            "fixture": str(args.fixture) if args.fixture else "synthetic",
+            "schemes": len(schemes),
+            "queries": len(queries),
+            "k": args.k,
+        },
+        "results": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fixture", type=Path, help="Recorded fixture; default is synthetic")
+    parser.add_argument("--schemes", type=int, default=2, help="Synthetic fixture schemes")
+    parser.add_argument("--concepts", type=int, default=2000, help="Synthetic concepts per scheme")
+    parser.add_argument("--model", default="paraphrase-MiniLM-L3-v2")
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--k", type=int, default=10, help="`min_num_results` per query")
+    parser.add_argument("--nprobe", type=int, default=8)
+    parser.add_argument("--rescore-factor", type=int, default=4)
+    parser.add_argument("--encode-labels", type=int, default=8192)
+    parser.add_argument("--encode-processes", type=int, default=1, help="Also time a pool")
+    parser.add_argument("--output", type=Path, help="Write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    output = json.dumps(run(args), indent=2)
+    if args.output:
+        args.output.write_text(output + "\n", encoding="utf-8")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
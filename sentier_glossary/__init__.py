@@ -1,10 +1,36 @@
 __all__ = (
     "__version__",
     "GlossaryAPI",
+    "GlossaryClient",
+    "GlossaryServer",
+    "AsyncGlossaryAPI",
     "CommonSchemes",
+    "Event",
+    "Events",
+    "Hierarchy",
+    "map_file",
+    "OpenTelemetryExporter",
+    "StatsCollector",
+    "MemoryCache",
+    "ResponseCache",
+    "SQLiteCache",
 )
 
 __version__ = "0.5.2"
 
 
+from .async_api import AsyncGlossaryAPI
+from .bulk import map_file
+from .events import Event, Events, OpenTelemetryExporter, StatsCollector
+from .hierarchy import Hierarchy
 from .main import CommonSchemes, GlossaryAPI
+from .response_cache import MemoryCache, ResponseCache, SQLiteCache
+
+
+def __getattr__(name):
+    # The server isn't needed to use the API, so it is only imported when asked for
+    if name in ("GlossaryClient", "GlossaryServer"):
+        from . import server
+
+        return getattr(server, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,158 @@
+import numpy as np
+
+
+class IVFIndex:
+    """Inverted file (IVF) index for approximate cosine similarity search.
+
+    Embeddings are clustered with spherical k-means into `nlist` lists. A query only scores the
+    rows in the `nprobe` lists whose centroids are closest to it, so `nprobe` trades recall for
+    latency: `nprobe=nlist` is exact, small values touch only a fraction of the corpus.
+
+    The index stores row ids, not vectors; scoring reads the selected rows straight from the
+    (usually memory-mapped) embedding matrix.
+
+    Args:
+        centroids (np.ndarray): `(nlist, dim)` unit-length cluster centroids
+        order (np.ndarray): Row ids sorted by list
+        offsets (np.ndarray): `nlist + 1` boundaries of each list in `order`
+        norms (np.ndarray): L2 norm of every embedding row
+
+    """
+
+    def __init__(
+        self, centroids: np.ndarray, order: np.ndarray, offsets: np.ndarray, norms: np.ndarray
+    ):
+        self.centroids = centroids
+        self.order = order
+        self.offsets = offsets
+        self.norms = norms
+
+    @property
+    def nlist(self) -> int:
+        return len(self.centroids)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(array.nbytes for array in self.to_arrays().values())
+
+    @classmethod
+    def build(
+        cls,
+        embeddings: np.ndarray,
+        nlist: int | None = None,
+        iterations: int = 10,
+        sample_size: int = 256,
+        seed: int = 0,
+    ) -> "IVFIndex":
+        """Cluster `embeddings` into an index.
+
+        Args:
+            embeddings (np.ndarray): `(n, dim)` corpus embeddings
+            nlist (int, None): Number of lists; defaults to `sqrt(n)`
+            iterations (int): k-means iterations
+            sample_size (int): Training points per list; k-means runs on this sample only
+            seed (int): Random seed, so rebuilding gives the same index
+
+        """
+        rng = np.random.default_rng(seed)
+        norms = np.linalg.norm(embeddings, axis=1).astype(np.float32)
+        norms[norms == 0] = 1
+        num = len(embeddings)
+        nlist = max(1, min(nlist or int(np.sqrt(num)), num))
+
+        sample = np.sort(rng.choice(num, size=min(num, nlist * sample_size), replace=False))
+        train = np.asarray(embeddings[sample], dtype=np.float32) / norms[sample, None]
+        centroids = train[rng.choice(len(train), size=nlist, replace=False)].copy()
+        for _ in range(iterations):
+            assignment = np.argmax(train @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, train)
+            # Empty lists keep their previous centroid
+            filled = np.bincount(assignment, minlength=nlist) > 0
+            centroids[filled] = sums[filled]
+            centroids /= np.maximum(np.linalg.norm(centroids, axis=1, keepdims=True), 1e-12)
+
+        assignment = np.concatenate(
+            [
+                np.argmax(
+                    np.asarray(embeddings[start : start + 65536], dtype=np.float32) @ centroids.T,
+                    axis=1,
+                )
+                for start in range(0, num, 65536)
+            ]
+        )
+        return cls(centroids, *cls._lists(assignment, nlist), norms)
+
+    def update(self, embeddings: np.ndarray, kept: np.ndarray) -> "IVFIndex":
+        """Index for a changed embedding matrix, keeping the existing lists.
+
+        Kept rows stay in their list and new rows join the list of their closest centroid, so
+        only the new rows are read. Rows which aren't kept are dropped.
+
+        Args:
+            embeddings (np.ndarray): `(n, dim)` new corpus embeddings
+            kept (np.ndarray): For each row of `embeddings`, its row id in this index, or -1 if
+                the row is new
+
+        """
+        assignment = np.empty(len(self.norms), dtype=np.int64)
+        assignment[self.order] = np.repeat(np.arange(self.nlist), np.diff(self.offsets))
+        old = kept >= 0
+        new_assignment = np.empty(len(kept), dtype=np.int64)
+        new_assignment[old] = assignment[kept[old]]
+        norms = np.empty(len(kept), dtype=np.float32)
+        norms[old] = self.norms[kept[old]]
+
+        added = np.flatnonzero(~old)
+        if len(added):
+            rows = np.asarray(embeddings[added], dtype=np.float32)
+            norms[added] = np.linalg.norm(rows, axis=1)
+            norms[norms == 0] = 1
+            new_assignment[added] = np.argmax(rows @ self.centroids.T, axis=1)
+        return type(self)(self.centroids, *self._lists(new_assignment, self.nlist), norms)
+
+    @staticmethod
+    def _lists(assignment: np.ndarray, nlist: int) -> tuple[np.ndarray, np.ndarray]:
+        """Row ids sorted by list, and the boundaries of each list."""
+        order = np.argsort(assignment, kind="stable").astype(np.int64)
+        offsets = np.zeros(nlist + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(np.bincount(assignment, minlength=nlist))
+        return order, offsets
+
+    def search(
+        self, embeddings: np.ndarray, query: np.ndarray, k: int, nprobe: int = 8
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Approximate top `k` rows of `embeddings` by cosine similarity to `query`.
+
+        At least `nprobe` lists are scanned, and more if they hold fewer than `k` rows.
+
+        Returns:
+            `(scores, row_ids)`, best first
+
+        """
+        query = np.asarray(query, dtype=np.float32).reshape(-1)
+        query = query / max(float(np.linalg.norm(query)), 1e-12)
+        ranked = np.argsort(-(self.centroids @ query))
+        sizes = np.diff(self.offsets)[ranked]
+        nprobe = max(nprobe, int(np.searchsorted(np.cumsum(sizes), k)) + 1)
+        candidates = np.concatenate(
+            [self.order[self.offsets[lst] : self.offsets[lst + 1]] for lst in ranked[:nprobe]]
+        )
+        candidates.sort()  # Sequential reads from a memory-mapped matrix
+        scores = (np.asarray(embeddings[candidates]) @ query) / self.norms[candidates]
+        k = min(k, len(candidates))
+        top = np.argpartition(-scores, k - 1)[:k] if k < len(candidates) else np.arange(k)
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return scores[top], candidates[top]
+
+    def to_arrays(self) -> dict[str, np.ndarray]:
+        return {
+            "centroids": self.centroids,
+            "order": self.order,
+            "offsets": self.offsets,
+            "norms": self.norms,
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays: dict[str, np.ndarray]) -> "IVFIndex":
+        return cls(arrays["centroids"], arrays["order"], arrays["offsets"], arrays["norms"])
@@ -0,0 +1,173 @@
+import asyncio
+from enum import Enum
+from typing import TYPE_CHECKING
+
+import requests
+
+from sentier_glossary.base import RETRY_STATUSES, BaseGlossaryAPI
+from sentier_glossary.settings import Settings
+
+if TYPE_CHECKING:
+    import httpx
+
+
+class AsyncGlossaryAPI(BaseGlossaryAPI):
+    """asyncio version of the `GlossaryAPI` REST methods.
+
+    All requests share one pooled `httpx.AsyncClient`, and at most `max_concurrency` requests are
+    in flight at once, so thousands of lookups can be fanned out with `asyncio.gather`:
+
+        async with AsyncGlossaryAPI() as api:
+            concepts = await asyncio.gather(*(api.concept(iri) for iri in iris))
+
+    Errors are raised as `requests.exceptions.RequestException`, like `GlossaryAPI`.
+
+    Args:
+        cfg (Settings, None): Client settings
+        language_code (str, None): 2-letter ISO 639 language code
+        max_concurrency (int, None): Maximum concurrent requests; defaults to
+            `Settings.max_workers`
+
+    """
+
+    def __init__(
+        self,
+        cfg: Settings | None = None,
+        language_code: str | None = None,
+        max_concurrency: int | None = None,
+    ):
+        try:
+            import httpx
+        except ImportError as error:  # pragma: no cover
+            raise ImportError(
+                "`AsyncGlossaryAPI` requires `httpx`; "
+                "install with `pip install sentier_glossary[async]`"
+            ) from error
+
+        super().__init__(cfg=cfg, language_code=language_code)
+        self.max_concurrency = max(max_concurrency or self._cfg.max_workers, 1)
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=self.max_concurrency,
+                max_keepalive_connections=self.max_concurrency,
+            ),
+            timeout=self._cfg.timeout,
+        )
+
+    async def __aenter__(self) -> "AsyncGlossaryAPI":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close the underlying HTTP connection pool."""
+        await self._client.aclose()
+
+    async def schemes(self) -> list[dict]:
+        """Get all concept schemes, regardless of type"""
+        return await self._requests_get("schemes")
+
+    async def concepts_for_scheme(self, scheme_iri: str | Enum) -> list[dict]:
+        """Return a list of concepts for a given scheme.
+
+        Args:
+            scheme_iri (str): the scheme IRI
+
+        Returns:
+            A list of dictionaries of concepts in the scheme
+
+        Raises:
+            ValueError: The IRI is not valid
+            requests.exceptionsRequestException: The requested resource was not found
+
+        """
+        if isinstance(scheme_iri, Enum):
+            scheme_iri = scheme_iri.value
+        self._validate_iri(scheme_iri)
+        return await self._requests_get("concepts", {"concept_scheme_iri": scheme_iri})
+
+    async def concept(self, concept_iri: str) -> dict:
+        """Return a single concept resource.
+
+        Args:
+            concept_iri (str): the concept IRI
+
+        Returns:
+            A dictionary of the requested resource
+
+        Raises:
+            ValueError: The IRI is not valid
+            requests.exceptionsRequestException: The requested resource was not found
+
+        """
+        self._validate_iri(concept_iri)
+        return await self._requests_get("concept", {"concept_iri": concept_iri})
+
+    async def search(self, query: str) -> list[dict]:
+        """Search the the concept library using the `/search` endpoint.
+
+        Args:
+            query (str): the search query string
+
+        Returns:
+            list of resources matching the search query.
+        """
+        return await self._requests_get("search", {"search_term": query})
+
+    async def _requests_get(self, url: str, params: dict | None = None) -> dict:
+        """Perform a `GET` on the pooled async client with given parameters.
+
+        Args:
+            url: The API endpoint.
+            params: Any additional parameters to pass.
+
+        Returns:
+            dict: A dictionary containing the parsed JSON response.
+
+        Raises:
+            requests.exceptions.RequestException: If there is an error with the request,
+            such as a connection error or an invalid URL.
+
+        """
+        import httpx
+
+        params = self._params | params if params is not None else self._params
+        async with self._semaphore:
+            try:
+                with self.events.span("http.request", endpoint=url) as attributes:
+                    response = await self._get(url, params)
+                    attributes.update(status=response.status_code, bytes=len(response.content))
+                    response.raise_for_status()
+            except httpx.HTTPStatusError as error:
+                msg = self._error_message(
+                    error, error.response.status_code, error.response.json, error.response.text
+                )
+                raise requests.exceptions.RequestException(msg) from error
+            except httpx.HTTPError as error:
+                msg = self._error_message(error, None, dict, "")
+                raise requests.exceptions.RequestException(msg) from error
+        return response.json()
+
+    async def _get(self, endpoint: str, params: dict) -> "httpx.Response":
+        """`GET` within the rate limit, retrying connection errors and 429 or 5xx responses."""
+        import httpx
+
+        for attempt in range(self._cfg.retries + 1):
+            if self._rate_limiter is not None:
+                await self._rate_limiter.acquire_async()
+            try:
+                response = await self._client.get(
+                    self._url(endpoint), params=params, timeout=self._timeout(endpoint)
+                )
+            except httpx.TransportError:
+                if attempt == self._cfg.retries:
+                    raise
+                delay = self._backoff(attempt)
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt == self._cfg.retries:
+                    return response
+                delay = self._backoff(attempt, response.headers.get("Retry-After"))
+            self.events.count("http.retry", endpoint=endpoint, attempt=attempt + 1)
+            await asyncio.sleep(delay)
@@ -0,0 +1,110 @@
+import locale
+import random
+import time
+import warnings
+from email.utils import parsedate_to_datetime
+from functools import reduce
+from typing import Callable
+from urllib.parse import urljoin
+
+from sentier_glossary.events import Events
+from sentier_glossary.rate_limit import TokenBucket
+from sentier_glossary.settings import Settings
+
+# Responses worth retrying: rate limited, or a temporary server or gateway failure
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class BaseGlossaryAPI:
+    """Configuration, language handling and URL building shared by the glossary clients."""
+
+    def __init__(self, cfg: Settings | None = None, language_code: str | None = None):
+        self._cfg = cfg if cfg is not None else Settings()
+        if not self._cfg.base_url.endswith("/"):
+            self._cfg.base_url += "/"
+        # Timing spans and counters; see `sentier_glossary.events`
+        self.events = Events()
+        self._rate_limiter = (
+            TokenBucket(self._cfg.rate_limit, self._cfg.rate_limit_burst)
+            if self._cfg.rate_limit
+            else None
+        )
+
+        self.language_code = self.get_language_code(language_code)
+        print(f"Using language code '{self.language_code}'; change with `set_language_code()`")
+
+    def get_language_code(self, language_code: str | None = None) -> str:
+        """Get 2-letter (Set 1) ISO 639 language code."""
+        code = language_code or locale.getlocale()[0] or self._cfg.fallback_language
+        if isinstance(code, str) and len(code) >= 2:
+            return code[:2].lower()
+        warnings.warn(f"""
+            Unexpected language code encountered: '{code}'.
+            Switching to fallback: '{self._cfg.fallback_language}'
+        """)
+        return self._cfg.fallback_language
+
+    def set_language_code(self, language_code: str) -> None:
+        """Override language code from system locale or input argument."""
+        if not (isinstance(language_code, str) and len(language_code) >= 2):
+            raise ValueError(
+                f"Invalid language code {language_code} given. Must be `str` of length two."
+            )
+        self.language_code = language_code[:2].lower()
+
+    @property
+    def _params(self) -> dict:
+        """Default parameters for every request."""
+        return {"lang": self.language_code}
+
+    def _url(self, endpoint: str) -> str:
+        """Absolute URL of an API endpoint."""
+        return reduce(urljoin, [self._cfg.base_url, f"{self._cfg.api_version}/", endpoint])
+
+    def _timeout(self, endpoint: str) -> float:
+        return self._cfg.endpoint_timeouts.get(endpoint, self._cfg.timeout)
+
+    def _backoff(self, attempt: int, retry_after: str | None = None) -> float:
+        """Seconds to wait before retry number `attempt` (from 0)."""
+        if retry_after:
+            try:
+                delay = float(retry_after)
+            except ValueError:
+                try:
+                    delay = parsedate_to_datetime(retry_after).timestamp() - time.time()
+                except (TypeError, ValueError):
+                    delay = None
+            if delay is not None:
+                return min(max(delay, 0.0), self._cfg.backoff_max)
+        delay = self._cfg.backoff_factor * 2**attempt + random.uniform(0, self._cfg.backoff_jitter)
+        return min(delay, self._cfg.backoff_max)
+
+    @staticmethod
+    def _error_message(
+        error: Exception, status_code: int | None, json: Callable[[], dict], text: str
+    ) -> str:
+        """Human readable description of a failed request, including the API error payload."""
+        msg = f"Error fetching data: {error}"
+        if status_code is not None:
+            msg += f"\nHTTP {status_code}"
+            if 400 <= status_code < 600:
+                try:
+                    error_data = json()
+                    msg += f"\nResponse: {error_data}"
+                except ValueError:
+                    msg += f"\nResponse: {text}"
+        return msg
+
+    def _validate_iri(self, iri: str) -> None:
+        """Basic IRI validation.
+
+        # TBD
+
+        Args:
+            iri (str): The [IRI](https://en.wikipedia.org/wiki/Internationalized_Resource_Identifier)
+
+        Raises:
+            ValueError: The IRI is not valid
+            KeyError: The requested resource was not found
+
+        """
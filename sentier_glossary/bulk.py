@@ -0,0 +1,378 @@
+import json
+import os
+import shutil
+import time
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from sentier_glossary.main import DATAFRAME_COLUMNS, GlossaryAPI, Scope
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Input rows read, searched and written at a time; bounds memory use
+CHUNK_SIZE = 10_000
+CHECKPOINT_SUFFIX = ".checkpoint.json"
+PARQUET_SUFFIXES = (".parquet", ".pq")
+
+
+def map_file(
+    api: GlossaryAPI,
+    input_path: Path | str,
+    output_path: Path | str,
+    column: str,
+    scope: Scope = None,
+    num_results: int = 1,
+    keep: list[str] | None = None,
+    chunk_size: int = CHUNK_SIZE,
+    batch_size: int = 256,
+    nprobe: int | None = None,
+    hybrid: bool = False,
+    overwrite: bool = False,
+    progress: Callable[[dict], None] | None = None,
+) -> dict:
+    """Map every row of a CSV or Parquet file to concepts with semantic search.
+
+    The input is read `chunk_size` rows at a time. Distinct texts of each chunk are searched
+    with `semantic_search_many`, and the results appended to the output before the next chunk
+    is read, so memory use doesn't grow with the file. After each chunk, the number of rows done
+    is saved in a checkpoint next to the output (`<output>.checkpoint.json`); if the run is
+    interrupted, calling `map_file` again with the same arguments continues after the last
+    complete chunk. The checkpoint is removed once the whole input is mapped.
+
+    The output has one row per result: `row` (0-based position in the input), the `keep`
+    columns, `query`, `rank` (0 is the best match), and the `semantic_search(...,
+    dataframe=True)` columns. Rows with an empty `column` have no results. CSV output is one
+    file; Parquet output is a directory with a file per chunk, which `pandas.read_parquet`
+    reads as one table. Parquet needs `pyarrow` (`pip install sentier_glossary[parquet]`).
+
+    Args:
+        api (GlossaryAPI): Client to search with
+        input_path (Path, str): `.csv`, `.tsv` (optionally compressed) or `.parquet` file
+        output_path (Path, str): `.csv`, `.tsv` or `.parquet` output
+        column (str): Input column with the texts to map
+        scope (str, CommonSchemes, list, None): Concept schemes to search, as in
+            `semantic_search`
+        num_results (int): Results per row
+        keep (list[str], None): Input columns copied to the output, e.g. an identifier
+        chunk_size (int): Input rows per chunk
+        batch_size (int): Queries encoded together
+        nprobe (int, None): Use the approximate nearest neighbour index, as in `semantic_search`
+        hybrid (bool): Fuse semantic and lexical rankings, as in `semantic_search`
+        overwrite (bool): Discard an existing output and checkpoint instead of failing or
+            resuming
+        progress (Callable, None): Called after each chunk with `rows`, `total_rows` (`None`
+            if unknown; estimated from line breaks for CSV), `results`, `rows_per_second` and
+            `eta_s`
+
+    Returns:
+        Dictionary with the number of input `rows` and of `results`, the `seconds` taken by
+        this call, and the number of rows `resumed` from a checkpoint
+
+    """
+    input_path, output_path = Path(input_path).expanduser(), Path(output_path).expanduser()
+    keep = list(keep or [])
+    checkpoint_path = output_path.with_name(output_path.name + CHECKPOINT_SUFFIX)
+    options = {
+        "input": str(input_path.resolve()),
+        "input_size": input_path.stat().st_size,
+        "input_mtime_ns": input_path.stat().st_mtime_ns,
+        "column": column,
+        "keep": keep,
+        "scope": _scope_key(scope),
+        "num_results": num_results,
+        "nprobe": nprobe,
+        "hybrid": hybrid,
+        "language_code": api.language_code,
+        "model_id": api._model_id,
+    }
+    reader, writer = _reader(input_path), _writer(output_path)
+
+    if overwrite:
+        checkpoint_path.unlink(missing_ok=True)
+        writer.remove()
+    if checkpoint_path.exists():
+        checkpoint = json.loads(checkpoint_path.read_text(encoding="utf-8"))
+        changed = sorted(key for key, value in options.items() if checkpoint.get(key) != value)
+        if changed:
+            raise ValueError(
+                f"Checkpoint {checkpoint_path} was made with a different {', '.join(changed)}; "
+                "pass `overwrite=True` to start again"
+            )
+        writer.restore(checkpoint["output"])
+    elif writer.exists():
+        raise FileExistsError(f"Output {output_path} exists; pass `overwrite=True` to replace it")
+    else:
+        checkpoint = options | {"rows": 0, "results": 0, "output": writer.state()}
+
+    resumed = rows = checkpoint["rows"]
+    results = checkpoint["results"]
+    total_rows = reader.count_rows()
+    started = time.perf_counter()
+    for chunk in reader.chunks([column, *keep], chunk_size, skip=rows):
+        with api.events.span("map.chunk", rows=len(chunk)) as span:
+            mapped = _map_chunk(
+                api, chunk, rows, column, keep, scope, num_results, batch_size, nprobe, hybrid
+            )
+            writer.write(mapped)
+            span["results"] = len(mapped)
+        rows += len(chunk)
+        results += len(mapped)
+        checkpoint |= {"rows": rows, "results": results, "output": writer.state()}
+        _write_json(checkpoint_path, checkpoint)
+        if progress is not None:
+            elapsed = time.perf_counter() - started
+            rate = (rows - resumed) / elapsed if elapsed > 0 else None
+            remaining = max(total_rows - rows, 0) if total_rows is not None else None
+            progress(
+                {
+                    "rows": rows,
+                    "total_rows": total_rows,
+                    "results": results,
+                    "rows_per_second": rate,
+                    "eta_s": remaining / rate if rate and remaining is not None else None,
+                }
+            )
+    writer.close()
+    checkpoint_path.unlink(missing_ok=True)
+    return {
+        "rows": rows,
+        "results": results,
+        "seconds": time.perf_counter() - started,
+        "resumed": resumed,
+    }
+
+
+def format_progress(stats: dict) -> str:
+    """One line like `120,000/2,000,000 rows (6%), 1,234 rows/s, ETA 0:25:23`."""
+    rows, total = stats["rows"], stats["total_rows"]
+    line = f"{rows:,}/{total:,} rows ({rows / max(total, 1):.0%})" if total else f"{rows:,} rows"
+    if stats["rows_per_second"]:
+        line += f", {stats['rows_per_second']:,.0f} rows/s"
+    if stats["eta_s"] is not None:
+        eta = round(stats["eta_s"])
+        line += f", ETA {eta // 3600}:{eta // 60 % 60:02d}:{eta % 60:02d}"
+    return line
+
+
+def _map_chunk(
+    api: GlossaryAPI,
+    chunk: "pd.DataFrame",
+    first_row: int,
+    column: str,
+    keep: list[str],
+    scope: Scope,
+    num_results: int,
+    batch_size: int,
+    nprobe: int | None,
+    hybrid: bool,
+) -> "pd.DataFrame":
+    """Search the distinct texts of a chunk once, and give each input row its results."""
+    import pandas as pd
+
+    queries = chunk[column].fillna("").astype(str).str.strip()
+    rows = pd.DataFrame({"row": range(first_row, first_row + len(chunk))})
+    for name in keep:
+        rows[name] = chunk[name].to_numpy()
+    rows["query"] = queries.to_numpy()
+    rows = rows[rows["query"] != ""]
+    codes, uniques = pd.factorize(rows["query"])
+    rows = rows.assign(query_index=codes)
+    columns = ["row", *keep, "query", "rank", *DATAFRAME_COLUMNS]
+    if not len(uniques):
+        return pd.DataFrame(columns=columns)
+
+    results = api.semantic_search_many(
+        list(uniques), scope, num_results, batch_size=batch_size, nprobe=nprobe, hybrid=hybrid
+    )
+    results["rank"] = results.groupby("query_index").cumcount()
+    mapped = rows.merge(results.drop(columns="query"), on="query_index", sort=False)
+    return mapped.sort_values(["row", "rank"], kind="stable")[columns]
+
+
+def _scope_key(scope: Scope) -> list[str] | None:
+    if scope is None:
+        return None
+    scopes = scope if isinstance(scope, list) else [scope]
+    return [getattr(obj, "value", obj) for obj in scopes]
+
+
+def _write_json(path: Path, data: dict) -> None:
+    """Replace `path` atomically, so a checkpoint is never half written."""
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _is_parquet(path: Path) -> bool:
+    return path.suffix.lower() in PARQUET_SUFFIXES
+
+
+def _separator(path: Path) -> str:
+    suffixes = [suffix.lower() for suffix in path.suffixes]
+    return "\t" if ".tsv" in suffixes else ","
+
+
+def _pyarrow_parquet():
+    try:
+        import pyarrow.parquet
+    except ImportError as error:  # pragma: no cover
+        raise ImportError(
+            "Parquet files require `pyarrow`; install with `pip install sentier_glossary[parquet]`"
+        ) from error
+    return pyarrow.parquet
+
+
+def _reader(path: Path) -> "_CSVReader | _ParquetReader":
+    return _ParquetReader(path) if _is_parquet(path) else _CSVReader(path)
+
+
+def _writer(path: Path) -> "_CSVWriter | _ParquetWriter":
+    return _ParquetWriter(path) if _is_parquet(path) else _CSVWriter(path)
+
+
+class _CSVReader:
+    def __init__(self, path: Path):
+        self.path = path
+
+    def count_rows(self) -> int | None:
+        """Lines after the header; quoted line breaks make this an overestimate."""
+        if self.path.suffix.lower() not in (".csv", ".tsv", ".txt"):
+            return None
+        lines, last = 0, b"\n"
+        with open(self.path, "rb") as f:
+            while block := f.read(1 << 20):
+                lines += block.count(b"\n")
+                last = block[-1:]
+        return max(lines + (last != b"\n") - 1, 0)
+
+    def chunks(self, columns: list[str], chunk_size: int, skip: int) -> Iterator["pd.DataFrame"]:
+        import pandas as pd
+
+        with pd.read_csv(
+            self.path,
+            sep=_separator(self.path),
+            usecols=columns,
+            dtype=str,
+            keep_default_na=False,
+            # A callable, as pandas turns a range into a set of every skipped row number
+            skiprows=lambda row: 0 < row <= skip,
+            chunksize=chunk_size,
+        ) as chunks:
+            yield from chunks
+
+
+class _ParquetReader:
+    def __init__(self, path: Path):
+        self.file = _pyarrow_parquet().ParquetFile(path)
+
+    def count_rows(self) -> int:
+        return self.file.metadata.num_rows
+
+    def chunks(self, columns: list[str], chunk_size: int, skip: int) -> Iterator["pd.DataFrame"]:
+        # Whole row groups before `skip` aren't read at all
+        metadata, row_groups = self.file.metadata, []
+        for group in range(metadata.num_row_groups):
+            group_rows = metadata.row_group(group).num_rows
+            if skip >= group_rows and not row_groups:
+                skip -= group_rows
+            else:
+                row_groups.append(group)
+        for batch in self.file.iter_batches(
+            batch_size=chunk_size, row_groups=row_groups, columns=columns
+        ):
+            if skip >= batch.num_rows:
+                skip -= batch.num_rows
+                continue
+            yield batch.slice(skip).to_pandas()
+            skip = 0
+
+
+class _CSVWriter:
+    """Appends chunks to one file; resuming truncates whatever followed the last checkpoint."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._file = None
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def remove(self) -> None:
+        self.path.unlink(missing_ok=True)
+
+    def state(self) -> int:
+        return self._file.tell() if self._file is not None else 0
+
+    def restore(self, size: int) -> None:
+        self._open()
+        self._file.truncate(size)
+        self._file.seek(size)
+
+    def write(self, df: "pd.DataFrame") -> None:
+        if self._file is None:
+            self._open()
+        df.to_csv(
+            self._file,
+            sep=_separator(self.path),
+            index=False,
+            header=self._file.tell() == 0,
+            lineterminator="\n",
+        )
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _open(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "a+b" if self.path.exists() else "w+b")
+
+
+class _ParquetWriter:
+    """Writes each chunk to its own file in a directory; resuming drops unfinished parts."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.parts = 0
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def remove(self) -> None:
+        if self.path.is_dir():
+            shutil.rmtree(self.path)
+        else:
+            self.path.unlink(missing_ok=True)
+
+    def state(self) -> int:
+        return self.parts
+
+    def restore(self, parts: int) -> None:
+        self.parts = parts
+        for path in self.path.glob("part-*.parquet"):
+            if int(path.stem.split("-")[1]) >= parts:
+                path.unlink()
+
+    def write(self, df: "pd.DataFrame") -> None:
+        parquet = _pyarrow_parquet()
+        import pyarrow as pa
+
+        # Text columns are always strings, even if a chunk has only missing values in them
+        types = {name: "string" for name in df.columns if df[name].dtype == object}
+        table = pa.Table.from_pandas(df.astype(types), preserve_index=False)
+        self.path.mkdir(parents=True, exist_ok=True)
+        tmp = self.path / f".part-{self.parts:06d}.parquet"
+        parquet.write_table(table, tmp)
+        os.replace(tmp, self.path / f"part-{self.parts:06d}.parquet")
+        self.parts += 1
+
+    def close(self) -> None:
+        pass
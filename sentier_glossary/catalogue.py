@@ -0,0 +1,102 @@
+import sys
+from collections.abc import Iterable, Iterator, Mapping
+
+import numpy as np
+
+LABEL_FIELDS = ("prefLabel", "altLabel", "scopeNote")
+
+
+class Catalogue(Mapping):
+    """Array-backed store of a concept scheme's labels and concepts.
+
+    Each concept is held once, with an integer id (its position in `iris`). Labels are unique
+    rows, aligned with the rows of the embedding matrix; the concepts which have the label in
+    row `r` are `concept_ids[offsets[r]:offsets[r + 1]]`.
+
+    As a mapping, the catalogue gives the concept dictionary for each IRI.
+
+    Attributes:
+        labels (list[str]): Unique labels, in embedding row order
+        offsets (np.ndarray): `len(labels) + 1` start positions of each row in `concept_ids`
+        concept_ids (np.ndarray): Concept ids of all label rows, concatenated
+        iris (list[str]): Interned concept IRIs, indexed by concept id
+
+    """
+
+    def __init__(
+        self,
+        labels: list[str],
+        offsets: np.ndarray,
+        concept_ids: np.ndarray,
+        records: list[dict],
+    ):
+        self.labels = labels
+        self.offsets = offsets
+        self.concept_ids = concept_ids
+        self.iris = [sys.intern(obj["iri"]) for obj in records]
+        self._records = records
+        self._ids = {iri: idx for idx, iri in enumerate(self.iris)}
+
+    @classmethod
+    def from_concepts(
+        cls, concepts: Iterable[dict], label_fields: tuple[str, ...] = LABEL_FIELDS
+    ) -> "Catalogue":
+        """Build from concept dictionaries, e.g. from `iter_concepts_for_scheme`.
+
+        Labels come from `label_fields`, in that order; concepts repeated in the input are only
+        kept the first time.
+
+        """
+        records, ids, rows = [], {}, {}
+        for concept in concepts:
+            if concept["iri"] in ids:
+                continue
+            idx = ids[concept["iri"]] = len(records)
+            records.append(concept)
+            for field in label_fields:
+                if concept.get(field):
+                    rows.setdefault(concept[field], []).append(idx)
+
+        offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum([len(row) for row in rows.values()], out=offsets[1:])
+        concept_ids = np.fromiter(
+            (idx for row in rows.values() for idx in row), dtype=np.int32, count=offsets[-1]
+        )
+        return cls(list(rows), offsets, concept_ids, records)
+
+    def __getitem__(self, iri: str) -> dict:
+        return self._records[self._ids[iri]]
+
+    def __contains__(self, iri: object) -> bool:
+        return iri in self._ids
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.iris)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def concept_id(self, iri: str) -> int:
+        """Integer id of a concept; raises `KeyError` if it isn't in the catalogue."""
+        return self._ids[iri]
+
+    @property
+    def num_rows(self) -> int:
+        return len(self.labels)
+
+    def row_concept_ids(self, rows) -> np.ndarray:
+        """Ids of the concepts labelled by `rows`, in row order and without duplicates."""
+        rows = np.asarray(rows, dtype=np.int64).ravel()
+        starts, ends = self.offsets[rows], self.offsets[rows + 1]
+        lengths = ends - starts
+        # Position of every selected entry of `concept_ids`, without a Python loop over rows
+        positions = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(
+            lengths.sum()
+        )
+        ids = self.concept_ids[positions]
+        _, first = np.unique(ids, return_index=True)
+        return ids[np.sort(first)]
+
+    def row_iris(self, rows) -> list[str]:
+        """IRIs of the concepts labelled by `rows`, in row order and without duplicates."""
+        return [self.iris[idx] for idx in self.row_concept_ids(rows)]
@@ -0,0 +1,157 @@
+import argparse
+import sys
+
+from sentier_glossary.bulk import CHUNK_SIZE, format_progress, map_file
+from sentier_glossary.main import DEFAULT_MODEL_ID, CommonSchemes, GlossaryAPI
+from sentier_glossary.server import DEFAULT_PORT, MAX_BATCH_SIZE, MAX_WAIT, GlossaryServer
+from sentier_glossary.settings import Settings
+
+
+def scheme_iri(value: str) -> str:
+    """A `CommonSchemes` name like `cn2024`, or a scheme IRI."""
+    return CommonSchemes[value].value if value in CommonSchemes.__members__ else value
+
+
+def make_api(args: argparse.Namespace) -> GlossaryAPI:
+    """Client with the model, language, snapshot and schemes given on the command line."""
+    api = GlossaryAPI(cfg=Settings(), language_code=args.language)
+    if args.snapshot:
+        api.load_snapshot(args.snapshot)
+    else:
+        api.setup_semantic_search(model_id=args.model)
+    if args.scheme:
+        api.setup_semantic_search(model_id=api._model_id, schemes=args.scheme)
+    return api
+
+
+def serve(args: argparse.Namespace) -> int:
+    api = make_api(args)
+    server = GlossaryServer(
+        api,
+        host=args.host,
+        port=args.port,
+        unix_socket=args.unix_socket,
+        max_batch_size=args.max_batch_size,
+        max_wait=args.max_wait_ms / 1000,
+    )
+    print(f"Serving semantic search on {server.url}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+    return 0
+
+
+def map_(args: argparse.Namespace) -> int:
+    api = make_api(args)
+
+    def progress(stats: dict) -> None:
+        print(f"\r{format_progress(stats)}", end="", file=sys.stderr, flush=True)
+
+    summary = map_file(
+        api,
+        args.input,
+        args.output,
+        column=args.column,
+        scope=args.scheme,
+        num_results=args.num_results,
+        keep=args.keep,
+        chunk_size=args.chunk_size,
+        batch_size=args.batch_size,
+        nprobe=args.nprobe,
+        hybrid=args.hybrid,
+        overwrite=args.overwrite,
+        progress=None if args.quiet else progress,
+    )
+    if not args.quiet:
+        resumed = f", resumed after {summary['resumed']:,}" if summary["resumed"] else ""
+        print(
+            f"\nMapped {summary['rows']:,} rows to {summary['results']:,} results "
+            f"in {summary['seconds']:.1f} s{resumed}",
+            file=sys.stderr,
+        )
+    return 0
+
+
+def add_api_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "--scheme",
+        action="append",
+        type=scheme_iri,
+        help="Concept scheme to load, as a CommonSchemes name (e.g. cn2024) or IRI; repeatable",
+    )
+    parser.add_argument("--model", default=DEFAULT_MODEL_ID, help="SentenceTransformer model")
+    parser.add_argument("--language", default=None, help="Language code of the labels")
+    parser.add_argument(
+        "--snapshot", default=None, help="Load indexes from this snapshot instead of the API"
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="sentier-glossary", description="Semantic search in the sentier.dev glossary"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    parser_serve = commands.add_parser(
+        "serve",
+        help="Keep the model and indexes warm and serve semantic search to local clients",
+        description="Serve semantic search over local HTTP or a Unix socket; query it with "
+        "`sentier_glossary.GlossaryClient`.",
+    )
+    add_api_arguments(parser_serve)
+    parser_serve.add_argument("--host", default="127.0.0.1")
+    parser_serve.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser_serve.add_argument("--unix-socket", default=None, help="Listen on this socket path")
+    parser_serve.add_argument(
+        "--max-batch-size", type=int, default=MAX_BATCH_SIZE, help="Most queries encoded together"
+    )
+    parser_serve.add_argument(
+        "--max-wait-ms",
+        type=float,
+        default=MAX_WAIT * 1000,
+        help="Milliseconds a query waits for others to batch it with",
+    )
+    parser_serve.set_defaults(function=serve)
+
+    parser_map = commands.add_parser(
+        "map",
+        help="Map a column of free text in a CSV or Parquet file to concepts",
+        description="Stream a CSV, TSV or Parquet file through semantic search in chunks, "
+        "appending the top results of each row to the output. If interrupted, run the same "
+        "command again to resume from the last checkpoint.",
+    )
+    parser_map.add_argument("input", help="Input .csv, .tsv or .parquet file")
+    parser_map.add_argument("output", help="Output .csv, .tsv or .parquet file")
+    parser_map.add_argument("--column", required=True, help="Input column with the texts")
+    add_api_arguments(parser_map)
+    parser_map.add_argument(
+        "--num-results", type=int, default=1, help="Results per row (default: 1)"
+    )
+    parser_map.add_argument(
+        "--keep", action="append", default=[], help="Input column to copy; repeatable"
+    )
+    parser_map.add_argument(
+        "--chunk-size", type=int, default=CHUNK_SIZE, help="Input rows read at a time"
+    )
+    parser_map.add_argument("--batch-size", type=int, default=256, help="Queries encoded together")
+    parser_map.add_argument(
+        "--nprobe", type=int, default=None, help="Search the approximate index with this nprobe"
+    )
+    parser_map.add_argument(
+        "--hybrid", action="store_true", help="Fuse semantic and lexical rankings"
+    )
+    parser_map.add_argument(
+        "--overwrite", action="store_true", help="Replace the output instead of resuming"
+    )
+    parser_map.add_argument("--quiet", action="store_true", help="Don't report progress")
+    parser_map.set_defaults(function=map_)
+
+    args = parser.parse_args(argv)
+    return args.function(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import BinaryIO, Callable
+
+import numpy as np
+
+
+class EmbeddingCache:
+    """Content-addressed on-disk store for corpus embeddings.
+
+    Entries are keyed on the model id, scheme IRI, language code and a hash of the corpus labels,
+    so a changed catalogue produces a new entry instead of returning stale vectors. Arrays are
+    stored as `.npy` files and opened memory-mapped, so cold starts don't re-encode and forked
+    workers share the same pages.
+
+    Args:
+        directory (Path, str): Where to keep the cache files; created on the first save.
+
+    """
+
+    def __init__(self, directory: Path | str):
+        self.directory = Path(directory).expanduser()
+
+    @staticmethod
+    def corpus_hash(corpus: list[str]) -> str:
+        """Stable hash of an ordered list of labels."""
+        digest = hashlib.sha256()
+        for label in corpus:
+            digest.update(label.encode("utf-8"))
+            digest.update(b"\x00")
+        return digest.hexdigest()
+
+    @classmethod
+    def key(cls, model_id: str, scheme_iri: str, language_code: str, corpus: list[str]) -> str:
+        """Cache key for the embeddings of `corpus` built with `model_id`."""
+        header = json.dumps(
+            {
+                "model_id": model_id,
+                "scheme_iri": scheme_iri,
+                "language_code": language_code,
+                "corpus": cls.corpus_hash(corpus),
+            },
+            sort_keys=True,
+        )
+        return hashlib.sha256(header.encode("utf-8")).hexdigest()
+
+    def path(self, key: str) -> Path:
+        return self.directory / f"{key}.npy"
+
+    def load(self, key: str) -> np.ndarray | None:
+        """Memory-map the embeddings stored under `key`, or return `None` if not present.
+
+        The array is opened copy-on-write, so it can be handed to `torch.from_numpy` while the
+        pages stay shared with every other process reading the same file.
+
+        """
+        path = self.path(key)
+        if not path.is_file():
+            return None
+        try:
+            return np.load(path, mmap_mode="c")
+        except (OSError, ValueError):
+            # Truncated or otherwise unreadable file; treat as a miss so it is rebuilt
+            return None
+
+    def save(self, key: str, embeddings: np.ndarray) -> Path:
+        """Write `embeddings` under `key`."""
+        path = self.path(key)
+        self._write(path, lambda f: np.save(f, np.ascontiguousarray(embeddings, dtype=np.float32)))
+        return path
+
+    def load_arrays(self, key: str, name: str) -> dict[str, np.ndarray] | None:
+        """Load the named group of auxiliary arrays (e.g. a search index) stored for `key`."""
+        path = self.directory / f"{key}.{name}.npz"
+        if not path.is_file():
+            return None
+        try:
+            with np.load(path) as data:
+                return {label: data[label] for label in data.files}
+        except (OSError, ValueError):
+            return None
+
+    def save_arrays(self, key: str, name: str, arrays: dict[str, np.ndarray]) -> Path:
+        """Store a named group of auxiliary arrays next to the embeddings for `key`."""
+        path = self.directory / f"{key}.{name}.npz"
+        self._write(path, lambda f: np.savez(f, **arrays))
+        return path
+
+    def remove(self, key: str) -> None:
+        """Delete the embeddings and auxiliary arrays stored under `key`, as far as possible.
+
+        Arrays already memory-mapped from these files stay valid on POSIX systems, and the space
+        is freed once they are closed. Windows doesn't delete files which are still mapped, so
+        those are left in place.
+
+        """
+        for path in [self.path(key), *self.directory.glob(f"{key}.*.npz")]:
+            try:
+                path.unlink(missing_ok=True)
+            except OSError:
+                pass
+
+    def _write(self, path: Path, write: Callable[[BinaryIO], None]) -> None:
+        """Write to a temporary file and move it into place, so readers never see partial data."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                write(f)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
@@ -0,0 +1,192 @@
+import threading
+import time
+import warnings
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator
+
+# Numeric event attributes which `StatsCollector` adds up, besides durations
+SUMMED_ATTRIBUTES = ("bytes", "rows", "queries", "concepts")
+
+
+@dataclass(frozen=True)
+class Event:
+    """Something that happened inside a glossary client.
+
+    Attributes:
+        name (str): What happened, e.g. `http.request`, `encode` or `cache.hit`
+        start (float): Wall clock time (`time.time()`) when it started
+        duration (float): Seconds it took; `0.0` for instantaneous events like cache hits
+        attributes (dict): Details such as the endpoint, status code or number of bytes
+
+    """
+
+    name: str
+    start: float
+    duration: float = 0.0
+    attributes: dict[str, Any] = field(default_factory=dict)
+
+
+Subscriber = Callable[[Event], None]
+
+
+class Events:
+    """Publishes timing spans and counters to subscribers.
+
+    Every glossary client has one, as `api.events`. Subscribers are called with each `Event`, in
+    whichever thread produced it, so they must be thread-safe. Without subscribers, spans don't
+    even read the clock.
+
+        stats = StatsCollector()
+        api.events.subscribe(stats)
+        api.semantic_search("wheat", CommonSchemes.cn2024)
+        stats.summary()
+
+    """
+
+    def __init__(self):
+        self._subscribers: list[Subscriber] = []
+
+    @property
+    def active(self) -> bool:
+        """Whether anyone is listening; skip expensive measurements otherwise."""
+        return bool(self._subscribers)
+
+    def subscribe(self, subscriber: Subscriber) -> Subscriber:
+        """Call `subscriber` with every future event. Returns `subscriber`."""
+        # Copy on write, so publishing never needs a lock
+        self._subscribers = [*self._subscribers, subscriber]
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        self._subscribers = [obj for obj in self._subscribers if obj != subscriber]
+
+    def emit(self, event: Event) -> None:
+        for subscriber in self._subscribers:
+            try:
+                subscriber(event)
+            except Exception as error:
+                # Broken instrumentation must never break the request being instrumented
+                warnings.warn(f"Event subscriber {subscriber!r} failed: {error!r}")
+
+    def count(self, name: str, **attributes) -> None:
+        """Emit an instantaneous event, e.g. a cache hit."""
+        if self._subscribers:
+            self.emit(Event(name=name, start=time.time(), attributes=attributes))
+
+    @contextmanager
+    def span(self, name: str, **attributes) -> Iterator[dict[str, Any]]:
+        """Time the enclosed block and emit it as one event.
+
+        Yields the attribute dictionary, so details only known at the end (like a response size)
+        can be added. If the block raises, the exception type is recorded as `error`.
+
+        """
+        if not self._subscribers:
+            yield attributes
+            return
+        start, counter = time.time(), time.perf_counter()
+        try:
+            yield attributes
+        except BaseException as error:
+            attributes["error"] = type(error).__name__
+            raise
+        finally:
+            self.emit(
+                Event(
+                    name=name,
+                    start=start,
+                    duration=time.perf_counter() - counter,
+                    attributes=attributes,
+                )
+            )
+
+
+class StatsCollector:
+    """Subscriber which aggregates events in memory.
+
+    Spans are summarised per name as count, total, mean and maximum duration; numeric attributes
+    listed in `SUMMED_ATTRIBUTES` (like `bytes`) are added up, and `cache.hit`/`cache.miss`
+    style events are simply counted.
+
+    Args:
+        keep_events (int): Also keep this many of the most recent raw events in `events`
+
+    """
+
+    def __init__(self, keep_events: int = 0):
+        self.keep_events = keep_events
+        self.events: list[Event] = []
+        self._stats: dict[str, dict[str, float]] = defaultdict(dict)
+        self._lock = threading.Lock()
+
+    def __call__(self, event: Event) -> None:
+        with self._lock:
+            stats = self._stats[event.name]
+            stats["count"] = stats.get("count", 0) + 1
+            stats["total_s"] = stats.get("total_s", 0.0) + event.duration
+            stats["max_s"] = max(stats.get("max_s", 0.0), event.duration)
+            for key in SUMMED_ATTRIBUTES:
+                value = event.attributes.get(key)
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    stats[key] = stats.get(key, 0) + value
+            if "error" in event.attributes:
+                stats["errors"] = stats.get("errors", 0) + 1
+            if self.keep_events:
+                self.events.append(event)
+                del self.events[: -self.keep_events]
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """Statistics per event name, with `mean_s` and throughput (`rows_per_second`) filled in."""
+        summary = {}
+        with self._lock:
+            for name, stats in sorted(self._stats.items()):
+                summary[name] = stats | {"mean_s": stats["total_s"] / stats["count"]}
+                if "rows" in stats and stats["total_s"] > 0:
+                    summary[name]["rows_per_second"] = stats["rows"] / stats["total_s"]
+        return summary
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self.events.clear()
+
+
+class OpenTelemetryExporter:
+    """Subscriber which records every event as an OpenTelemetry span.
+
+    Spans are created after the fact with the measured start and end times. Install
+    `opentelemetry-api` (e.g. with `pip install sentier_glossary[otel]`) and configure an SDK
+    exporter as usual.
+
+    Args:
+        tracer (opentelemetry.trace.Tracer, None): Defaults to the `sentier_glossary` tracer of
+            the global tracer provider
+
+    """
+
+    def __init__(self, tracer=None):
+        if tracer is None:
+            try:
+                from opentelemetry import trace
+            except ImportError as error:  # pragma: no cover
+                raise ImportError(
+                    "`OpenTelemetryExporter` requires `opentelemetry-api`; "
+                    "install with `pip install sentier_glossary[otel]`"
+                ) from error
+            tracer = trace.get_tracer("sentier_glossary")
+        self.tracer = tracer
+
+    def __call__(self, event: Event) -> None:
+        start = int(event.start * 1e9)
+        span = self.tracer.start_span(
+            f"sentier_glossary.{event.name}",
+            start_time=start,
+            attributes={
+                key: value
+                for key, value in event.attributes.items()
+                if isinstance(value, (str, bool, int, float))
+            },
+        )
+        span.end(end_time=start + int(event.duration * 1e9))
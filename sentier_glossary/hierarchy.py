@@ -0,0 +1,135 @@
+from collections.abc import Mapping
+
+import numpy as np
+
+from sentier_glossary.catalogue import Catalogue
+
+
+class Hierarchy:
+    """Broader/narrower tree of a concept scheme, stored as arrays over catalogue concept ids.
+
+    Concepts are numbered in depth-first order, so the descendants of a concept are one
+    contiguous slice of `order`: listing them costs their number, and checking whether one
+    concept is under another is a comparison. Ancestors are found by following `parents`, which
+    takes as many steps as the concept is deep.
+
+    Classifications are trees; if a concept has several broader concepts, the first one is used.
+
+    Args:
+        catalogue (Catalogue): Concepts of the scheme
+        parents (np.ndarray): Concept id of the broader concept of each concept, or -1 for top
+            level concepts
+
+    Attributes:
+        order (np.ndarray): Concept ids in depth-first order
+        start (np.ndarray): Position of each concept in `order`
+        end (np.ndarray): Position in `order` just after the last descendant of each concept
+
+    """
+
+    def __init__(self, catalogue: Catalogue, parents: np.ndarray):
+        self.catalogue = catalogue
+        self.parents = np.array(parents, dtype=np.int32)
+        num = len(self.parents)
+        self._index_children()
+
+        self.order = np.empty(num, dtype=np.int32)
+        self.start = np.full(num, -1, dtype=np.int64)
+        self.end = np.empty(num, dtype=np.int64)
+        position, cycles = 0, False
+        for root in [*np.flatnonzero(self.parents < 0), *range(num)]:
+            if self.start[root] >= 0:
+                continue
+            if self.parents[root] >= 0:
+                # Only reachable through a cycle of broader relations; make it top level
+                self.parents[root], cycles = -1, True
+            stack = [(int(root), False)]
+            while stack:
+                node, done = stack.pop()
+                if done:
+                    self.end[node] = position
+                    continue
+                self.start[node] = position
+                self.order[position] = node
+                position += 1
+                stack.append((node, True))
+                stack.extend(
+                    (int(child), False)
+                    for child in self._children[self._offsets[node] : self._offsets[node + 1]][::-1]
+                    if self.start[child] < 0
+                )
+        if cycles:
+            self._index_children()
+
+    def _index_children(self) -> None:
+        """Children of every concept, in catalogue order, as `_children[_offsets[id]:...]`."""
+        children = np.argsort(self.parents, kind="stable")
+        self._children = children[self.parents[children] >= 0].astype(np.int32)
+        self._offsets = np.zeros(len(self.parents) + 1, dtype=np.int64)
+        np.cumsum(
+            np.bincount(self.parents[self._children], minlength=len(self.parents)),
+            out=self._offsets[1:],
+        )
+
+    @classmethod
+    def build(cls, catalogue: Catalogue, concepts: Mapping[str, dict]) -> "Hierarchy":
+        """Build from the `relations` of `concepts` (as returned by `concept()`), keyed by IRI.
+
+        Concepts missing from `concepts`, and broader concepts outside the catalogue, are
+        treated as top level.
+
+        """
+        parents = np.full(len(catalogue), -1, dtype=np.int32)
+        for idx, iri in enumerate(catalogue.iris):
+            for relation in concepts.get(iri, {}).get("relations", []):
+                if (
+                    relation["type"] == "broader"
+                    and relation["source_concept_iri"] == iri
+                    and relation["target_concept_iri"] in catalogue
+                ):
+                    parents[idx] = catalogue.concept_id(relation["target_concept_iri"])
+                    break
+        return cls(catalogue, parents)
+
+    def parent(self, iri: str) -> str | None:
+        """The broader concept of `iri`, or `None` at the top level."""
+        parent = self.parents[self.catalogue.concept_id(iri)]
+        return self.catalogue.iris[parent] if parent >= 0 else None
+
+    def children(self, iri: str) -> list[str]:
+        """The direct narrower concepts of `iri`."""
+        idx = self.catalogue.concept_id(iri)
+        ids = self._children[self._offsets[idx] : self._offsets[idx + 1]]
+        return [self.catalogue.iris[child] for child in ids]
+
+    def ancestors(self, iri: str) -> list[str]:
+        """Broader concepts of `iri` up to the top level, nearest first."""
+        ancestors = []
+        parent = self.parents[self.catalogue.concept_id(iri)]
+        while parent >= 0:
+            ancestors.append(self.catalogue.iris[parent])
+            parent = self.parents[parent]
+        return ancestors
+
+    def path(self, iri: str) -> list[str]:
+        """IRIs from the top level concept down to, and including, `iri`."""
+        return [*reversed(self.ancestors(iri)), iri]
+
+    def depth(self, iri: str) -> int:
+        """Number of ancestors; 0 for top level concepts."""
+        return len(self.ancestors(iri))
+
+    def descendants(self, iri: str) -> list[str]:
+        """All concepts under `iri`, at any depth, in depth-first order."""
+        idx = self.catalogue.concept_id(iri)
+        ids = self.order[self.start[idx] + 1 : self.end[idx]]
+        return [self.catalogue.iris[child] for child in ids]
+
+    def is_descendant(self, iri: str, ancestor: str) -> bool:
+        """Whether `iri` is under `ancestor`, at any depth."""
+        idx, top = self.catalogue.concept_id(iri), self.catalogue.concept_id(ancestor)
+        return bool(self.start[top] < self.start[idx] < self.end[top])
+
+    def roots(self) -> list[str]:
+        """Top level concepts."""
+        return [self.catalogue.iris[idx] for idx in np.flatnonzero(self.parents < 0)]
@@ -0,0 +1,55 @@
+import json
+from typing import Any, Iterable, Iterator
+
+_WHITESPACE = " \t\n\r"
+
+
+def iter_json_array(chunks: Iterable[str]) -> Iterator[Any]:
+    """Incrementally parse a JSON array, yielding each element as soon as it is complete.
+
+    Only one element (plus one chunk) is held in memory at a time, so arbitrarily large
+    responses can be consumed with bounded memory.
+
+    Args:
+        chunks (Iterable[str]): Consecutive pieces of the JSON document
+
+    Raises:
+        ValueError: The document is not a JSON array
+
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    started = expect_comma = False
+    for chunk in chunks:
+        buffer += chunk
+        pos = 0
+        while True:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos == len(buffer):
+                break
+            char = buffer[pos]
+            if not started:
+                if char != "[":
+                    raise ValueError(f"Expected a JSON array, got {buffer[pos:pos + 20]!r}")
+                started = True
+                pos += 1
+            elif char == "]":
+                return
+            elif expect_comma:
+                if char != ",":
+                    raise ValueError(f"Expected ',' or ']', got {buffer[pos:pos + 20]!r}")
+                expect_comma = False
+                pos += 1
+            else:
+                try:
+                    obj, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    break  # Element continues in the next chunk
+                if end == len(buffer):
+                    break  # Could be a number cut in half; wait for the next chunk
+                yield obj
+                expect_comma = True
+                pos = end
+        buffer = buffer[pos:]
+    raise ValueError("Unexpected end of JSON array")
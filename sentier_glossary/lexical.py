@@ -0,0 +1,153 @@
+import re
+from collections.abc import Iterable
+
+import numpy as np
+
+LEXICAL_FIELDS = ("prefLabel", "altLabel", "scopeNote", "notation")
+
+_WORD = re.compile(r"\w+")
+
+
+def words(text: str) -> list[str]:
+    """Lowercase word tokens of `text`.
+
+    Codes like "5702 20 00" or "A.01.1" (every token has a digit or is at most two characters
+    long) also get a token of the whole code without separators, so "57022000" matches too.
+
+    """
+    tokens = _WORD.findall(text.lower())
+    if (
+        len(tokens) > 1
+        and all(len(token) <= 2 or any(char.isdigit() for char in token) for token in tokens)
+        and any(char.isdigit() for char in text)
+    ):
+        tokens.append("".join(tokens))
+    return tokens
+
+
+def trigrams(tokens: Iterable[str]) -> list[str]:
+    """Character trigrams of each token, so misspelt or partial words still match."""
+    grams = []
+    for token in tokens:
+        padded = f" {token} "
+        grams.extend("#" + padded[idx : idx + 3] for idx in range(len(padded) - 2))
+    return grams
+
+
+class LexicalIndex:
+    """BM25 inverted index over the words and character trigrams of concept labels.
+
+    Documents are concepts, with the text of all their `LEXICAL_FIELDS`; postings are stored as
+    arrays, so a query costs one vectorised accumulation per query term.
+
+    Args:
+        terms (dict[str, int]): Term ids
+        offsets (np.ndarray): `len(terms) + 1` start positions of each term in `documents`
+        documents (np.ndarray): Document ids of all postings, concatenated
+        frequencies (np.ndarray): Term frequency of each posting
+        lengths (np.ndarray): Number of terms in each document
+
+    """
+
+    def __init__(
+        self,
+        terms: dict[str, int],
+        offsets: np.ndarray,
+        documents: np.ndarray,
+        frequencies: np.ndarray,
+        lengths: np.ndarray,
+        k1: float = 1.5,
+        b: float = 0.75,
+    ):
+        self.terms = terms
+        self.offsets = offsets
+        self.documents = documents
+        self.frequencies = frequencies
+        self.lengths = lengths
+        self.k1 = k1
+        self.b = b
+        frequency = np.diff(offsets)
+        self.idf = np.log1p((len(lengths) - frequency + 0.5) / (frequency + 0.5)).astype(np.float32)
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the postings arrays; the `terms` dictionary isn't counted."""
+        arrays = (self.offsets, self.documents, self.frequencies, self.lengths, self.idf)
+        return sum(array.nbytes for array in arrays)
+
+    @classmethod
+    def build(
+        cls, concepts: Iterable[dict], fields: tuple[str, ...] = LEXICAL_FIELDS
+    ) -> "LexicalIndex":
+        """Index concepts; document ids are positions in `concepts`."""
+        terms: dict[str, int] = {}
+        postings: list[dict[int, int]] = []
+        lengths = []
+        for document, concept in enumerate(concepts):
+            tokens = [
+                token for field in fields if concept.get(field) for token in words(concept[field])
+            ]
+            tokens += trigrams(tokens)
+            lengths.append(len(tokens))
+            counts: dict[int, int] = {}
+            for token in tokens:
+                term = terms.setdefault(token, len(terms))
+                if term == len(postings):
+                    postings.append({})
+                counts[term] = counts.get(term, 0) + 1
+            for term, count in counts.items():
+                postings[term][document] = count
+
+        offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+        np.cumsum([len(posting) for posting in postings], out=offsets[1:])
+        documents = np.fromiter(
+            (doc for posting in postings for doc in posting), dtype=np.int32, count=offsets[-1]
+        )
+        frequencies = np.fromiter(
+            (tf for posting in postings for tf in posting.values()),
+            dtype=np.float32,
+            count=offsets[-1],
+        )
+        return cls(terms, offsets, documents, frequencies, np.asarray(lengths, dtype=np.float32))
+
+    def scores(self, query: str, trigram_weight: float = 0.5) -> np.ndarray:
+        """BM25 score of every document; trigram matches count `trigram_weight` times as much."""
+        scores = np.zeros(len(self.lengths), dtype=np.float32)
+        tokens = words(query)
+        average = max(float(self.lengths.mean()), 1.0) if len(self.lengths) else 1.0
+        for weight, query_terms in ((1.0, tokens), (trigram_weight, trigrams(tokens))):
+            for token in dict.fromkeys(query_terms):
+                term = self.terms.get(token)
+                if term is None or not weight:
+                    continue
+                start, end = self.offsets[term], self.offsets[term + 1]
+                documents, tf = self.documents[start:end], self.frequencies[start:end]
+                norm = self.k1 * (1 - self.b + self.b * self.lengths[documents] / average)
+                scores[documents] += weight * self.idf[term] * tf * (self.k1 + 1) / (tf + norm)
+        return scores
+
+    def search(
+        self, query: str, k: int, trigram_weight: float = 0.5, return_scores: bool = False
+    ) -> np.ndarray | tuple[np.ndarray, np.ndarray]:
+        """Ids of the (at most) `k` best matching documents, best first; no match, no result.
+
+        With `return_scores`, also returns their BM25 scores.
+
+        """
+        scores = self.scores(query, trigram_weight)
+        matches = np.flatnonzero(scores)
+        if k <= 0:
+            matches = matches[:0]
+        elif len(matches) > k:
+            matches = matches[np.argpartition(-scores[matches], k - 1)[:k]]
+        matches = matches[np.argsort(-scores[matches], kind="stable")]
+        return (matches, scores[matches]) if return_scores else matches
+
+
+def reciprocal_rank_fusion(rankings: Iterable[list[str]], k: int = 60) -> list[str]:
+    """Merge ranked lists, scoring each item by the sum of `1 / (k + rank)` over the lists."""
+    scores: dict[str, float] = {}
+    for ranking in rankings:
+        for rank, item in enumerate(ranking, start=1):
+            scores[item] = scores.get(item, 0.0) + 1 / (k + rank)
+    return sorted(scores, key=scores.__getitem__, reverse=True)
@@ -1,17 +1,56 @@
-import locale
+import inspect
+import json
+import threading
+import time
+import unicodedata
 import warnings
-from collections import defaultdict
+from collections import ChainMap, OrderedDict
+from collections.abc import Mapping
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import replace
 from enum import Enum
-from functools import reduce
-from urllib.parse import urljoin
-import warnings
+from itertools import repeat
+from operator import itemgetter
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator
 
-import pandas as pd
+import numpy as np
 import requests
-import torch
-from sentence_transformers import SentenceTransformer, util  # type: ignore
+from requests.adapters import HTTPAdapter
 
+from sentier_glossary.ann import IVFIndex
+from sentier_glossary.base import RETRY_STATUSES, BaseGlossaryAPI
+from sentier_glossary.catalogue import LABEL_FIELDS, Catalogue
+from sentier_glossary.embedding_cache import EmbeddingCache
+from sentier_glossary.hierarchy import Hierarchy
+from sentier_glossary.json_stream import iter_json_array
+from sentier_glossary.lexical import LexicalIndex, reciprocal_rank_fusion
+from sentier_glossary.quantization import QuantizedEmbeddings
+from sentier_glossary.response_cache import MemoryCache, ResponseCache
+from sentier_glossary.scheme_index import SchemeIndex
 from sentier_glossary.settings import Settings
+from sentier_glossary.snapshot import read_snapshot, write_snapshot
+
+# torch, sentence_transformers and pandas are slow to import and use a lot of memory, so they are
+# only imported once semantic search or dataframe output is actually used
+if TYPE_CHECKING:
+    import pandas as pd
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+DEFAULT_MODEL_ID = "all-mpnet-base-v2"
+DATAFRAME_COLUMNS = [
+    "prefLabel",
+    "completeLabel",
+    "broader_iri",
+    "broader_prefLabel",
+    "iri",
+    "scheme_iri",
+]
+# Results taken from both the semantic and the lexical ranking before fusing them
+HYBRID_CANDIDATES = 50
+# Smaller corpora are encoded in-process, as starting a process pool loads the model again
+MULTIPROCESS_MIN_LABELS = 4096
 
 
 class CommonSchemes(Enum):
@@ -25,60 +64,95 @@ class CommonSchemes(Enum):
     wca2020 = "https://stats.fao.org/classifications/WCA2020/crops/scheme"
 
 
-class GlossaryAPI:
-    def __init__(self, cfg: Settings | None = None, language_code: str | None = None):
-        self._cfg = cfg if cfg is not None else Settings()
-        if not self._cfg.base_url.endswith("/"):
-            self._cfg.base_url += "/"
-
-        self._semantic_search = False
-        self.language_code = self.get_language_code(language_code)
-        print(f"Using language code '{self.language_code}'; change with `set_language_code()`")
-
-    def get_language_code(self, language_code: str | None = None) -> str:
-        """Get 2-letter (Set 1) ISO 639 language code."""
-        code = language_code or locale.getlocale()[0] or self._cfg.fallback_language
-        if isinstance(code, str) and len(code) >= 2:
-            return code[:2].lower()
-        warnings.warn(f"""
-            Unexpected language code encountered: '{code}'.
-            Switching to fallback: '{self._cfg.fallback_language}'
-        """)
-        return self._cfg.fallback_language
-
-    def set_language_code(self, language_code: str) -> None:
-        """Override language code from system locale or input argument."""
-        if not (isinstance(language_code, str) and len(language_code) >= 2):
-            raise ValueError(
-                f"Invalid language code {language_code} given. Must be `str` of length two."
-            )
-        self.language_code = language_code[:2].lower()
-        if self._semantic_search:
-            warnings.warn(
-                f"""Semantic search cache is stale and disabled. Please reenable with
-                `setup_semantic_search()` to use semantic search with {self.language_code}."""
-            )
-            self._semantic_search = False
+# One concept scheme, several, or `None` for every loaded scheme
+Scope = str | CommonSchemes | list[str | CommonSchemes] | None
+
+
+class GlossaryAPI(BaseGlossaryAPI):
+    def __init__(
+        self,
+        cfg: Settings | None = None,
+        language_code: str | None = None,
+        cache: ResponseCache | None = None,
+    ):
+        super().__init__(cfg=cfg, language_code=language_code)
+        self._cache = cache if cache is not None else ResponseCache.from_settings(self._cfg)
+
+        # One pooled keep-alive session, sized so every download worker can hold a connection
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=max(self._cfg.max_workers, 1))
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+        # Semantic search state; the model and each scheme index are loaded on first use
+        self._model_id = DEFAULT_MODEL_ID
+        self._embedder: "SentenceTransformer | None" = None
+        self._embedding_cache = (
+            EmbeddingCache(self._cfg.embedding_cache_dir)
+            if self._cfg.embedding_cache_dir is not None
+            else None
+        )
+        # Keyed by `(language_code, scheme_iri)`, least recently used first
+        self._indexes: OrderedDict[tuple[str, str], Future[SchemeIndex]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._model_lock = threading.Lock()
+        self._pool_lock = threading.Lock()
+        # Recurring queries skip encoding, and with the result cache also ranking and hydration;
+        # cached results are only valid for the index generation they were computed with
+        self._query_cache = (
+            MemoryCache(maxsize=self._cfg.query_cache_maxsize)
+            if self._cfg.query_cache_maxsize > 0
+            else None
+        )
+        self._result_cache = (
+            MemoryCache(maxsize=self._cfg.result_cache_maxsize)
+            if self._cfg.result_cache_maxsize > 0
+            else None
+        )
+        self._index_generation = 0
 
     def setup_semantic_search(
         self,
-        model_id: str = "all-mpnet-base-v2",
+        model_id: str = DEFAULT_MODEL_ID,
+        schemes: list[str | CommonSchemes] | None = None,
+        max_workers: int | None = None,
+        background: bool = False,
     ) -> None:
-        """Download data and metadata to perform semantic search queries"""
-        with warnings.catch_warnings():
-            warnings.filterwarnings("ignore", category=FutureWarning)
-            self._embedder = SentenceTransformer(model_id)
-
-        self._catalogues: dict[str, str] = {}
-        self._embeddings: dict[str, torch.Tensor] = {}
-        self._semantic_search = True
-
-        for cs in CommonSchemes:
-            self._catalogues[cs.value] = defaultdict(list)
-            for concept in self.concepts_for_scheme(cs):
-                for label in ("prefLabel", "altLabel", "scopeNote"):
-                    if concept.get(label):
-                        self._catalogues[cs.value][concept[label]].append(concept)
+        """Configure semantic search, and optionally prewarm some concept schemes.
+
+        Catalogues and embeddings are otherwise downloaded and built per scheme, the first time
+        that scheme is searched.
+
+        Args:
+            model_id (str): SentenceTransformer model used to create embeddings
+            schemes (list, None): Concept schemes to download and embed now
+            max_workers (int, None): Number of schemes prepared concurrently; defaults to
+                `Settings.max_workers`
+            background (bool): Return immediately and prepare `schemes` in background threads.
+                Searches in a scheme which is still being prepared wait for it to finish.
+
+        """
+        with self._lock:
+            if model_id != self._model_id:
+                self._model_id = model_id
+                self._embedder = None
+                self._indexes.clear()
+                self._invalidate_results()
+        if not schemes:
+            return
+
+        scheme_iris = [cs.value if isinstance(cs, Enum) else cs for cs in schemes]
+        # The current language, even if it is changed before a background build starts
+        language_code = self.language_code
+        executor = ThreadPoolExecutor(max_workers=max_workers or self._cfg.max_workers)
+        futures = [
+            executor.submit(self._scheme_index, scheme_iri, language_code)
+            for scheme_iri in scheme_iris
+        ]
+        executor.shutdown(wait=not background)
+        if not background:
+            for future in futures:
+                future.result()
 
     def schemes(self) -> list[dict]:
         """Get all concept schemes, regardless of type"""
@@ -101,7 +175,37 @@ class GlossaryAPI:
         if isinstance(scheme_iri, Enum):
             scheme_iri = scheme_iri.value
         self._validate_iri(scheme_iri)
-        return self._requests_get("concepts", {"concept_scheme_iri": scheme_iri})
+        # Whole catalogues are too big for the response cache
+        return self._requests_get("concepts", {"concept_scheme_iri": scheme_iri}, cache=False)
+
+    def iter_concepts_for_scheme(
+        self, scheme_iri: str | Enum, language_code: str | None = None
+    ) -> Iterator[dict]:
+        """Iterate over the concepts of a scheme as they are downloaded.
+
+        Unlike `concepts_for_scheme`, the response is parsed incrementally, so memory use doesn't
+        grow with the size of the scheme, and the timeout applies to each read instead of the
+        whole download.
+
+        Args:
+            scheme_iri (str): the scheme IRI
+            language_code (str, None): Language of the labels; defaults to the client language
+
+        Returns:
+            An iterator of dictionaries of concepts in the scheme
+
+        Raises:
+            ValueError: The IRI is not valid
+            requests.exceptionsRequestException: The requested resource was not found
+
+        """
+        if isinstance(scheme_iri, Enum):
+            scheme_iri = scheme_iri.value
+        self._validate_iri(scheme_iri)
+        params = {"concept_scheme_iri": scheme_iri}
+        if language_code is not None:
+            params["lang"] = language_code
+        return self._requests_stream("concepts", params)
 
     def concept(self, concept_iri: str) -> dict:
         """Return a single concept resource.
@@ -134,9 +238,11 @@ class GlossaryAPI:
     def semantic_search(
         self,
         query: str,
-        scope: str | CommonSchemes | None = None,
+        scope: Scope = None,
         dataframe: bool = False,
         min_num_results: int = 10,
+        nprobe: int | None = None,
+        hybrid: bool = False,
     ) -> list[dict]:
         """Perform semantic search query.
 
@@ -144,64 +250,845 @@ class GlossaryAPI:
 
         Args:
             query (str): the search query string
-            scope (str, CommonSchemes, None): If given, limit the search to one concept scheme
+            scope (str, CommonSchemes, list, None): The concept scheme to search, a list of
+                schemes, or `None` for every scheme loaded in the current language. Several
+                schemes are ranked together, by similarity to their best matching labels.
             min_num_results (int): Minimum number of results to return.
+            nprobe (int, None): Use the approximate nearest neighbour index, scanning `nprobe`
+                of its lists; higher is slower but more accurate. `None` for exact search.
+            hybrid (bool): Fuse the semantic ranking with `lexical_search` by reciprocal rank
+                fusion, and return the `min_num_results` best concepts. Helps with exact codes
+                and rare words.
+
+        Returns:
+            list of results, each with the `scheme_iri` it was found in
+
+        """
+        with self.events.span("semantic_search", scope=str(scope), queries=1):
+            generation = self._index_generation
+            indexes = self._prepare_scopes(scope)
+            key = self._result_key(query, indexes, min_num_results, nprobe, hybrid)
+            results = self._result_cache.get(key) if key is not None else None
+            if key is not None:
+                self.events.count("result_cache.miss" if results is None else "result_cache.hit")
+            if results is None:
+                query_embeddings = self._encode_queries([query])
+                [iris] = self._ranked_iris(
+                    indexes, [query], query_embeddings, min_num_results, nprobe, hybrid
+                )
+                results = self._hydrate_results(iris, indexes)
+                if key is not None:
+                    with self._lock:
+                        # A refresh meanwhile may have made these results stale
+                        if generation == self._index_generation:
+                            self._result_cache.set(key, results)
+        if dataframe:
+            import pandas as pd
+
+            return pd.DataFrame([self._dataframe_row(obj) for obj in results])
+        return results
+
+    def semantic_search_many(
+        self,
+        queries: list[str],
+        scope: Scope = None,
+        min_num_results: int = 10,
+        batch_size: int = 256,
+        nprobe: int | None = None,
+        hybrid: bool = False,
+    ) -> "pd.DataFrame":
+        """Perform many semantic search queries at once.
+
+        Queries are encoded `batch_size` at a time and scored with one matrix product per batch,
+        and every concept is fetched only once across all queries.
+
+        Args:
+            queries (list[str]): the search query strings
+            scope (str, CommonSchemes, list, None): Concept schemes to search, as in
+                `semantic_search`
+            min_num_results (int): Minimum number of results to return per query.
+            batch_size (int): Number of queries encoded and scored together
+            nprobe (int, None): Use the approximate nearest neighbour index, scanning `nprobe`
+                of its lists; higher is slower but more accurate. `None` for exact search.
+            hybrid (bool): Fuse semantic and lexical rankings, as in `semantic_search`
+
+        Returns:
+            DataFrame with the `semantic_search(..., dataframe=True)` columns, plus `query_index`
+            (position in `queries`) and `query`
+
+        """
+        with self.events.span("semantic_search_many", scope=str(scope), queries=len(queries)):
+            indexes = self._prepare_scopes(scope)
+            iris_per_query = []
+            for start in range(0, len(queries), batch_size):
+                batch = queries[start : start + batch_size]
+                query_embeddings = self._encode_queries(batch, batch_size)
+                iris_per_query.extend(
+                    self._ranked_iris(
+                        indexes, batch, query_embeddings, min_num_results, nprobe, hybrid
+                    )
+                )
+
+            concepts = {
+                obj["iri"]: obj
+                for obj in self._hydrate_results(
+                    [iri for iris in iris_per_query for iri in iris], indexes
+                )
+            }
+        import pandas as pd
+
+        return pd.DataFrame(
+            [
+                {"query_index": index, "query": queries[index]} | self._dataframe_row(concepts[iri])
+                for index, iris in enumerate(iris_per_query)
+                for iri in iris
+            ],
+            columns=["query_index", "query", *DATAFRAME_COLUMNS],
+        )
+
+    def refresh_scheme(self, scheme_iri: str | CommonSchemes) -> dict[str, int]:
+        """Download a concept scheme again and update its semantic search index.
+
+        The new concepts are compared with the loaded index by IRI and labels. Only labels which
+        weren't there before are encoded; rows of removed labels are dropped from the
+        embeddings and the approximate nearest neighbour index. If the scheme isn't loaded in
+        the current language, it is loaded as usual. Searches running meanwhile use the old
+        index. The old index's files in the embedding cache are deleted, so regular refreshes
+        don't accumulate superseded embeddings.
+
+        Args:
+            scheme_iri (str, CommonSchemes): The concept scheme
 
         Returns:
-            list of results
+            Number of `added`, `changed` and `removed` concepts, and of `encoded` labels
+
+        """
+        if isinstance(scheme_iri, Enum):
+            scheme_iri = scheme_iri.value
+        self._validate_iri(scheme_iri)
+        key = (self.language_code, scheme_iri)
+        with self._lock:
+            future = self._indexes.get(key)
+        try:
+            previous = future.result() if future is not None else None
+        except Exception:
+            previous = None
+
+        with self.events.span("scheme_index.refresh", scheme=scheme_iri, language=key[0]):
+            index = self._build_scheme_index(scheme_iri, key[0], previous)
+        future = Future()
+        future.set_result(index)
+        with self._lock:
+            self._indexes[key] = future
+            self._indexes.move_to_end(key)
+            self._invalidate_results()
+        self._evict_scheme_indexes()
+        if previous is not None and previous.key not in (None, index.key):
+            # Content-addressed, so every refresh which changes labels writes new files
+            self._embedding_cache.remove(previous.key)
+
+        old = previous.catalogue if previous is not None else {}
+        old_labels = set(previous.catalogue.labels) if previous is not None else set()
+        return {
+            "added": sum(iri not in old for iri in index.catalogue),
+            "changed": sum(
+                iri in old and self._labels(old[iri]) != self._labels(index.catalogue[iri])
+                for iri in index.catalogue
+            ),
+            "removed": sum(iri not in index.catalogue for iri in old),
+            "encoded": sum(label not in old_labels for label in index.catalogue.labels),
+        }
+
+    def lexical_search(self, query: str, scope: Scope = None, num_results: int = 10) -> list[dict]:
+        """Keyword search in the labels, scope notes and notations of a concept scheme.
+
+        Uses a local BM25 index over words and character trigrams, so exact codes like
+        "5702 20 00" and misspellings both match. Apart from preparing the scheme on first use,
+        as for `semantic_search`, no requests are made; results are the concepts as listed in
+        the scheme, without `broader` relations.
+
+        Args:
+            query (str): the search query string
+            scope (str, CommonSchemes, list, None): Concept schemes to search, as in
+                `semantic_search`
+            num_results (int): Maximum number of results to return.
+
+        Returns:
+            list of concepts, best match first, each with the `scheme_iri` it was found in
+
+        """
+        indexes = self._prepare_scopes(scope)
+        with self.events.span("lexical_search", scope=str(scope), queries=1):
+            return [
+                dict(index.catalogue[iri], scheme_iri=index.scheme_iri)
+                for iri in self._lexical_iris(indexes, query, num_results)
+                for index in [self._owner(indexes, iri)]
+            ]
+
+    def export_snapshot(
+        self,
+        path: Path | str,
+        schemes: list[str | CommonSchemes] | None = None,
+        languages: list[str] | None = None,
+        include_model: bool = False,
+        include_relations: bool = False,
+    ) -> Path:
+        """Write semantic search indexes to a snapshot, for offline use with `load_snapshot`.
+
+        The snapshot is a directory holding a versioned `manifest.json` (format, model id,
+        package version and the scheme and language of each index), and for each index the
+        catalogue, embeddings, approximate nearest neighbour index and lexical index. Missing
+        indexes are built first, so exporting needs network access; loading doesn't.
+
+        Args:
+            path (Path, str): Snapshot directory; must not exist yet, or be empty
+            schemes (list, None): Concept schemes to export; by default every loaded index
+            languages (list[str], None): Languages to export `schemes` in; defaults to the
+                current language, or with `schemes=None` filters the loaded indexes
+            include_model (bool): Also save the SentenceTransformer model, so loading the
+                snapshot doesn't need the model hub either
+            include_relations (bool): Fetch every concept with `concept()` and store it with its
+                relations, and the scheme `hierarchy`, so semantic search results in the loaded
+                snapshot are complete `concept()` payloads with their `broader` concepts. This
+                makes one request per concept; hierarchies built earlier are exported in any
+                case. Without it, results are the `/concepts` listing records. Searching a
+                loaded snapshot never makes requests either way.
+
+        Returns:
+            The snapshot directory
+
+        """
+        if schemes is None:
+            with self._lock:
+                keys = [key for key, future in self._indexes.items() if future.done()]
+            keys = [key for key in keys if languages is None or key[0] in languages]
+        else:
+            keys = [
+                (language_code, cs.value if isinstance(cs, Enum) else cs)
+                for language_code in languages or [self.language_code]
+                for cs in schemes
+            ]
+
+        indexes = []
+        for language_code, scheme_iri in keys:
+            index = self._scheme_index(scheme_iri, language_code)
+            self._ann_index(index)
+            self._lexical_index(index)
+            if include_relations:
+                catalogue = self._catalogue_with_relations(index.catalogue, language_code)
+                index = replace(
+                    index, catalogue=catalogue, hierarchy=Hierarchy.build(catalogue, catalogue)
+                )
+            indexes.append(index)
+        with self.events.span("snapshot.export", indexes=len(indexes)):
+            return write_snapshot(
+                path, indexes, self._model_id, model=self._model() if include_model else None
+            )
+
+    def load_snapshot(self, path: Path | str) -> list[tuple[str, str]]:
+        """Load the semantic search indexes of a snapshot made with `export_snapshot`.
+
+        No requests are made: catalogues, embeddings and search indexes come from the snapshot,
+        memory-mapped so that several processes loading it share the same pages. The model is
+        switched to the one the snapshot was made with (as `setup_semantic_search` would),
+        loaded from the snapshot if it was exported with `include_model=True`. Loaded indexes
+        replace any of the same scheme and language, and count towards
+        `Settings.max_scheme_indexes`.
+
+        Args:
+            path (Path, str): Snapshot directory
+
+        Returns:
+            `(language_code, scheme_iri)` of every loaded index
+
+        Raises:
+            ValueError: The snapshot has an unsupported format version
+
+        """
+        path = Path(path).expanduser()
+        with self.events.span("snapshot.load") as attributes:
+            manifest, indexes = read_snapshot(path)
+            model_id = str(path / manifest["model"]) if manifest["model"] else manifest["model_id"]
+            self.setup_semantic_search(model_id=model_id)
+            device = self._model().device
+            keys = []
+            for index in indexes:
+                index.quantized = self._quantize(index.host_embeddings)
+                if index.quantized is None:
+                    index.embeddings = index.embeddings.to(device)
+                future = Future()
+                future.set_result(index)
+                key = (index.language_code, index.scheme_iri)
+                with self._lock:
+                    self._indexes[key] = future
+                    self._indexes.move_to_end(key)
+                    self._invalidate_results()
+                keys.append(key)
+            attributes.update(indexes=len(indexes))
+        self._evict_scheme_indexes()
+        return keys
+
+    def hierarchy(self, scheme_iri: str | CommonSchemes) -> Hierarchy:
+        """Broader/narrower hierarchy of a concept scheme, for ancestor and subtree queries.
+
+        The `/concepts` listing of a scheme has no relations, so the first call fetches every
+        concept of the scheme once with `concept()`, concurrently and through the response
+        cache, unless the catalogue already has them (from a snapshot exported with
+        `include_relations=True`). The hierarchy is then kept with the scheme index and saved
+        in snapshots. The fetched concepts replace the catalogue's `/concepts` records, so
+        semantic search results in the scheme are the same `concept()` payloads, with their
+        `broader` concepts and `completeLabel`, but need no requests. `refresh_scheme` discards
+        both.
+
+        Args:
+            scheme_iri (str, CommonSchemes): The concept scheme, loaded if needed
+
+        Returns:
+            The scheme's `Hierarchy`, e.g. `api.hierarchy(scheme).descendants(chapter_iri)`
+
+        """
+        index = self._prepare_scope(scheme_iri)
+        if index.hierarchy is None:
+            catalogue = index.catalogue
+            missing = [iri for iri in catalogue if "relations" not in catalogue[iri]]
+            with self.events.span(
+                "hierarchy.build", scheme=index.scheme_iri, concepts=len(missing)
+            ):
+                concepts = self._fetch_concepts_in(missing, index.language_code)
+                catalogue = Catalogue(
+                    catalogue.labels,
+                    catalogue.offsets,
+                    catalogue.concept_ids,
+                    [catalogue[iri] | concepts.get(iri, {}) for iri in catalogue.iris],
+                )
+                index.hierarchy = Hierarchy.build(catalogue, catalogue)
+                index.catalogue = catalogue
+            with self._lock:
+                self._invalidate_results()
+        return index.hierarchy
+
+    def _catalogue_with_relations(self, catalogue: Catalogue, language_code: str) -> Catalogue:
+        """Copy of `catalogue` with each concept as returned by `concept()`, including relations."""
+        concepts = self._fetch_concepts_in(catalogue.iris, language_code)
+        records = [catalogue[iri] | concepts[iri] for iri in catalogue.iris]
+        return Catalogue(catalogue.labels, catalogue.offsets, catalogue.concept_ids, records)
+
+    def _fetch_concepts_in(self, iris: list[str], language_code: str) -> dict[str, dict]:
+        """Fetch many concepts concurrently in `language_code`, keyed by IRI."""
+
+        def fetch(iri: str) -> dict:
+            return self._requests_get("concept", {"concept_iri": iri, "lang": language_code})
+
+        with ThreadPoolExecutor(max_workers=self._cfg.max_workers) as executor:
+            return dict(zip(iris, executor.map(fetch, iris)))
+
+    def _prepare_scopes(self, scope: Scope) -> list[SchemeIndex]:
+        """Resolve `scope` to one or more indexes, building them concurrently if needed.
+
+        `None` means every scheme loaded (or being loaded) in the current language.
 
         """
-        if not self._semantic_search:
-            self.setup_semantic_search()
+        if scope is None:
+            with self._lock:
+                scheme_iris = [iri for lang, iri in self._indexes if lang == self.language_code]
+            if not scheme_iris:
+                raise KeyError(
+                    f"No concept schemes are loaded in language {self.language_code}; "
+                    "give a scope or prepare schemes with `setup_semantic_search`"
+                )
+        elif isinstance(scope, (list, tuple)):
+            scheme_iris = list(
+                dict.fromkeys(cs.value if isinstance(cs, Enum) else cs for cs in scope)
+            )
+            if not scheme_iris:
+                raise KeyError("Given scope is an empty list of concept schemes.")
+        else:
+            return [self._prepare_scope(scope)]
+        if len(scheme_iris) == 1:
+            return [self._prepare_scope(scheme_iris[0])]
+        with ThreadPoolExecutor(
+            max_workers=min(self._cfg.max_workers, len(scheme_iris))
+        ) as executor:
+            return list(executor.map(self._prepare_scope, scheme_iris))
+
+    def _prepare_scope(self, scope: str | CommonSchemes | None) -> SchemeIndex:
+        """Resolve `scope` and get its index, building it if needed."""
         if isinstance(scope, CommonSchemes):
             scope = scope.value
-        if scope not in self._catalogues:
-            raise KeyError(f"Given scope {scope} not present in semantic search cache.")
-        # Later code wants a list, not a dict keys view
-        corpus = list(self._catalogues[scope])
-        num_results = min(min_num_results, len(corpus))
+        if not scope:
+            raise KeyError(f"Given scope {scope} is not a concept scheme.")
+        return self._scheme_index(scope)
+
+    def _scheme_index(self, scheme_iri: str, language_code: str | None = None) -> SchemeIndex:
+        """Index for `scheme_iri` in `language_code`, by default the current language.
+
+        Each index is built only once; concurrent callers wait for the thread building it. Indexes
+        are kept per language, so switching back and forth between languages is free, but only
+        the `Settings.max_scheme_indexes` most recently used ones are kept.
+
+        """
+        key = (language_code or self.language_code, scheme_iri)
+        with self._lock:
+            future = self._indexes.get(key)
+            owner = future is None
+            if owner:
+                future = self._indexes[key] = Future()
+            self._indexes.move_to_end(key)
+        if owner:
+            try:
+                with self.events.span("scheme_index.build", scheme=scheme_iri, language=key[0]):
+                    future.set_result(self._build_scheme_index(scheme_iri, key[0]))
+            except BaseException as error:
+                with self._lock:
+                    if self._indexes.get(key) is future:
+                        del self._indexes[key]
+                future.set_exception(error)
+            self._evict_scheme_indexes()
+        return future.result()
+
+    def _evict_scheme_indexes(self) -> None:
+        """Drop least recently used indexes beyond the `Settings.max_scheme_index*` limits."""
+        budget = self._cfg.max_scheme_index_bytes
+        with self._lock:
+            # Indexes still being built are never evicted
+            ready = [key for key, future in self._indexes.items() if future.done()]
+            excess = len(self._indexes) - self._cfg.max_scheme_indexes
+            nbytes = {key: self._indexes[key].result().nbytes for key in ready} if budget else {}
+            total = sum(nbytes.values())
+            for key in ready:
+                if excess <= 0 and (not budget or total <= budget or key == ready[-1]):
+                    break
+                del self._indexes[key]
+                excess -= 1
+                total -= nbytes.get(key, 0)
+
+    def _build_scheme_index(
+        self, scheme_iri: str, language_code: str, previous: SchemeIndex | None = None
+    ) -> SchemeIndex:
+        """Download a scheme and embed its labels.
+
+        Labels which are already in the `previous` index of the scheme are not encoded again,
+        and its approximate nearest neighbour index is updated instead of rebuilt.
+
+        """
+        import torch
+
+        catalogue = Catalogue.from_concepts(
+            self.iter_concepts_for_scheme(scheme_iri, language_code=language_code)
+        )
+        reuse = None
+        if previous is not None:
+            rows = {label: row for row, label in enumerate(previous.catalogue.labels)}
+            kept = np.fromiter(
+                (rows.get(label, -1) for label in catalogue.labels),
+                dtype=np.int64,
+                count=catalogue.num_rows,
+            )
+            reuse = (previous.host_embeddings, kept)
         # Creating embeddings is relatively expensive
-        if scope not in self._embeddings:
-            self._embeddings[scope] = self._embedder.encode(corpus, convert_to_tensor=True)
-        query_embedding = self._embedder.encode(query, convert_to_tensor=True)
-
-        cos_scores = util.cos_sim(query_embedding, self._embeddings[scope])[0]
-        object_lists = [
-            self._catalogues[scope][corpus[idx.item()]]
-            for idx in torch.topk(cos_scores, k=num_results)[1]
-        ]
-        results = list(
-            {
-                obj["iri"]: self._fill_out_concept_broader_relationships(self.concept(obj["iri"]))
-                for lst in object_lists
-                for obj in lst
-            }.values()
+        embeddings, key = self._encode_corpus(scheme_iri, catalogue.labels, language_code, reuse)
+        ann = None
+        if previous is not None and previous.ann is not None:
+            ann = previous.ann.update(embeddings, kept)
+            if key is not None:
+                self._embedding_cache.save_arrays(key, "ivf", ann.to_arrays())
+        quantized = self._quantize(embeddings)
+        tensor = torch.from_numpy(embeddings)
+        if quantized is None:
+            # Only exact float32 search uses the tensor; quantized search scores on the host
+            tensor = tensor.to(self._model().device)
+        return SchemeIndex(
+            scheme_iri=scheme_iri,
+            language_code=language_code,
+            catalogue=catalogue,
+            embeddings=tensor,
+            host_embeddings=embeddings,
+            key=key,
+            ann=ann,
+            quantized=quantized,
         )
-        if dataframe:
-            return pd.DataFrame(
-                [
-                    {
-                        "prefLabel": obj.get("prefLabel"),
-                        "completeLabel": self._complete_label(obj),
-                        "broader_iri": (
-                            obj["broader"][0].get("iri", None) if obj.get("broader") else None
-                        ),
-                        "broader_prefLabel": (
-                            obj["broader"][0].get("prefLabel", None) if obj.get("broader") else None
-                        ),
-                        "iri": obj["iri"],
-                    }
-                    for obj in results
-                ]
+
+    def _quantize(self, embeddings: np.ndarray) -> QuantizedEmbeddings | None:
+        """Reduced precision copy of `embeddings`, or `None` for float32 precision."""
+        if self._cfg.embedding_precision == "float32":
+            return None
+        return QuantizedEmbeddings.quantize(embeddings, self._cfg.embedding_precision)
+
+    def _model(self) -> "SentenceTransformer":
+        """The sentence embedding model, loaded on first use."""
+        with self._model_lock:
+            if self._embedder is None:
+                from sentence_transformers import SentenceTransformer
+
+                with warnings.catch_warnings():
+                    warnings.filterwarnings("ignore", category=FutureWarning)
+                    self._embedder = SentenceTransformer(self._model_id)
+            return self._embedder
+
+    def _top_k(
+        self,
+        index: SchemeIndex,
+        query_embeddings: "torch.Tensor",
+        k: int,
+        nprobe: int | None = None,
+    ) -> list[list[int]]:
+        """Corpus row ids of the `k` best matches for each row of `query_embeddings`."""
+        if nprobe is None and index.quantized is not None:
+            with self.events.span(
+                "topk",
+                k=k,
+                rows=index.catalogue.num_rows,
+                queries=len(query_embeddings),
+                precision=index.quantized.precision,
+            ):
+                return index.quantized.search(
+                    index.host_embeddings,
+                    query_embeddings.cpu().numpy(),
+                    k=k,
+                    rescore=self._cfg.rescore_factor,
+                ).tolist()
+        if nprobe is None:
+            import torch
+            from sentence_transformers import util
+
+            with self.events.span(
+                "topk", k=k, rows=index.catalogue.num_rows, queries=len(query_embeddings)
+            ):
+                cos_scores = util.cos_sim(query_embeddings, index.embeddings)
+                return torch.topk(cos_scores, k=k, dim=1)[1].tolist()
+        ann = self._ann_index(index)
+        embeddings = index.host_embeddings
+        with self.events.span("topk", k=k, nprobe=nprobe, queries=len(query_embeddings)):
+            return [
+                ann.search(embeddings, query, k=k, nprobe=nprobe)[1].tolist()
+                for query in query_embeddings.cpu().numpy()
+            ]
+
+    def _ranked_iris(
+        self,
+        indexes: list[SchemeIndex],
+        queries: list[str],
+        query_embeddings: "torch.Tensor",
+        min_num_results: int,
+        nprobe: int | None,
+        hybrid: bool,
+    ) -> list[list[str]]:
+        """Result IRIs for each query, best first, across all `indexes`."""
+        if not hybrid:
+            return self._semantic_iris(indexes, query_embeddings, min_num_results, nprobe)
+        depth = max(min_num_results, HYBRID_CANDIDATES)
+        semantic = self._semantic_iris(indexes, query_embeddings, depth, nprobe)
+        return [
+            reciprocal_rank_fusion([iris, self._lexical_iris(indexes, query, depth)])[
+                :min_num_results
+            ]
+            for query, iris in zip(queries, semantic)
+        ]
+
+    def _semantic_iris(
+        self,
+        indexes: list[SchemeIndex],
+        query_embeddings: "torch.Tensor",
+        k: int,
+        nprobe: int | None,
+    ) -> list[list[str]]:
+        """IRIs of the concepts labelled by the `k` best matching labels of each query.
+
+        Each index is searched for its own top `k` labels, with whichever of exact, quantized or
+        approximate search applies, and the candidates of all indexes are merged by cosine
+        similarity into one global top `k`.
+
+        """
+        if len(indexes) == 1:
+            [index] = indexes
+            top_k = self._top_k(index, query_embeddings, min(k, index.catalogue.num_rows), nprobe)
+            return [index.catalogue.row_iris(rows) for rows in top_k]
+
+        queries = query_embeddings.cpu().numpy()
+        queries = queries / np.maximum(np.linalg.norm(queries, axis=1, keepdims=True), 1e-12)
+        candidates: list[list[tuple[float, SchemeIndex, int]]] = [[] for _ in queries]
+        for index in indexes:
+            num = min(k, index.catalogue.num_rows)
+            if not num:
+                continue
+            embeddings = index.host_embeddings
+            top_k = self._top_k(index, query_embeddings, num, nprobe)
+            for query, found, rows in zip(queries, candidates, top_k):
+                vectors = np.asarray(embeddings[rows], dtype=np.float32)
+                norms = np.maximum(np.linalg.norm(vectors, axis=1), 1e-12)
+                found.extend(zip((vectors @ query / norms).tolist(), repeat(index), rows))
+        results = []
+        for found in candidates:
+            found.sort(key=itemgetter(0), reverse=True)
+            results.append(
+                list(
+                    dict.fromkeys(
+                        iri for _, index, row in found[:k] for iri in index.catalogue.row_iris(row)
+                    )
+                )
             )
         return results
 
-    def _requests_get(self, url: str, params: dict | None = None) -> dict:
-        """Perform a `requests.get(api_url, …)` with given parameters.
+    def _lexical_iris(self, indexes: list[SchemeIndex], query: str, k: int) -> list[str]:
+        """IRIs of the `k` best lexical matches for `query`, merged across `indexes` by score."""
+        found = []
+        for index in indexes:
+            ids, scores = self._lexical_index(index).search(query, k, return_scores=True)
+            found.extend(zip(scores.tolist(), (index.catalogue.iris[idx] for idx in ids)))
+        found.sort(key=itemgetter(0), reverse=True)
+        return list(dict.fromkeys(iri for _, iri in found[:k]))
+
+    def _lexical_index(self, index: SchemeIndex) -> LexicalIndex:
+        """Keyword index for a scheme, built once."""
+        if index.lexical is None:
+            with self.events.span("lexical_index.build", scheme=index.scheme_iri):
+                index.lexical = LexicalIndex.build(index.catalogue.values())
+            self._evict_scheme_indexes()
+        return index.lexical
+
+    def _hydrate_results(self, iris: list[str], indexes: list[SchemeIndex]) -> list[dict]:
+        """`_hydrate` results found in `indexes`, recording the scheme of each as `scheme_iri`.
+
+        Catalogues of schemes with a `hierarchy` hold `concept()` payloads, so their results
+        need no requests. Results in `offline` indexes never make requests: they are their
+        catalogue records, with `broader` concepts only if the records have relations.
+
+        """
+        iris = list(dict.fromkeys(iris))
+        known = (
+            indexes[0].catalogue
+            if len(indexes) == 1
+            else ChainMap(*(index.catalogue for index in indexes))
+        )
+        owners = {iri: self._owner(indexes, iri) for iri in iris}
+        online = [iri for iri in iris if not owners[iri].offline]
+        concepts = dict(zip(online, self._hydrate(online, known))) if online else {}
+        for iri in iris:
+            if owners[iri].offline:
+                concept = dict(known[iri])
+                # Broader concepts outside the searched schemes get no labels
+                broader = {
+                    obj: known.get(obj, {"iri": obj}) for obj in self._broader_iris([concept])
+                }
+                concepts[iri] = self._fill_out_concept_broader_relationships(
+                    concept, concepts=broader
+                )
+        results = [concepts[iri] for iri in iris]
+        for obj in results:
+            obj["scheme_iri"] = owners[obj["iri"]].scheme_iri
+        return results
+
+    @staticmethod
+    def _owner(indexes: list[SchemeIndex], iri: str) -> SchemeIndex:
+        """The first of `indexes` whose catalogue has `iri`."""
+        return next(index for index in indexes if iri in index.catalogue)
+
+    def _encode_queries(self, queries: list[str], batch_size: int = 256) -> "torch.Tensor":
+        """Embeddings of search queries, one row per query.
+
+        Queries are normalised first, and with the query cache, each distinct query not in the
+        cache is encoded once; the span's `cached` attribute counts queries served from it.
+
+        """
+        texts = [self._normalise_query(query) for query in queries]
+        with self.events.span("encode", queries=len(queries)) as attributes:
+            if self._query_cache is None:
+                return self._model().encode(texts, batch_size=batch_size, convert_to_tensor=True)
+            import torch
+
+            keys = [json.dumps([self._model_id, text], ensure_ascii=False) for text in texts]
+            embeddings = {key: self._query_cache.get(key) for key in keys}
+            missing = {key: text for key, text in zip(keys, texts) if embeddings[key] is None}
+            if missing:
+                encoded = self._model().encode(
+                    list(missing.values()), batch_size=batch_size, convert_to_tensor=True
+                )
+                for key, embedding in zip(missing, encoded):
+                    embeddings[key] = embedding
+                    # A copy, so the cache doesn't keep the whole batch alive
+                    self._query_cache.set(key, embedding.clone())
+            attributes["cached"] = sum(key not in missing for key in keys)
+            return torch.stack([embeddings[key] for key in keys])
+
+    @staticmethod
+    def _normalise_query(query: str) -> str:
+        """Query with Unicode composed and runs of whitespace collapsed, as it is encoded."""
+        return unicodedata.normalize("NFC", " ".join(query.split()))
+
+    def _result_key(
+        self,
+        query: str,
+        indexes: list[SchemeIndex],
+        min_num_results: int,
+        nprobe: int | None,
+        hybrid: bool,
+    ) -> str | None:
+        """Result cache key, or `None` without a result cache."""
+        if self._result_cache is None:
+            return None
+        return json.dumps(
+            [
+                self._model_id,
+                self._normalise_query(query),
+                [[index.language_code, index.scheme_iri] for index in indexes],
+                min_num_results,
+                nprobe,
+                hybrid,
+            ],
+            ensure_ascii=False,
+        )
+
+    def _invalidate_results(self) -> None:
+        """Drop cached results after an index changed; call with `self._lock` held."""
+        self._index_generation += 1
+        if self._result_cache is not None:
+            self._result_cache.clear()
+
+    def _search_encoded(
+        self,
+        queries: list[str],
+        query_embeddings: "torch.Tensor",
+        scope: Scope,
+        min_num_results: int,
+        nprobe: int | None = None,
+        hybrid: bool = False,
+    ) -> list[list[dict]]:
+        """Results of already encoded queries, hydrating every concept once."""
+        indexes = self._prepare_scopes(scope)
+        iris_per_query = self._ranked_iris(
+            indexes, queries, query_embeddings, min_num_results, nprobe, hybrid
+        )
+        concepts = {
+            obj["iri"]: obj
+            for obj in self._hydrate_results(
+                [iri for iris in iris_per_query for iri in iris], indexes
+            )
+        }
+        return [[concepts[iri] for iri in iris] for iris in iris_per_query]
+
+    @staticmethod
+    def _dataframe_row(obj: dict) -> dict:
+        return {
+            "prefLabel": obj.get("prefLabel"),
+            "completeLabel": GlossaryAPI._complete_label(obj),
+            "broader_iri": obj["broader"][0].get("iri", None) if obj.get("broader") else None,
+            "broader_prefLabel": (
+                obj["broader"][0].get("prefLabel", None) if obj.get("broader") else None
+            ),
+            "iri": obj["iri"],
+            "scheme_iri": obj.get("scheme_iri"),
+        }
+
+    def _encode_corpus(
+        self,
+        scope: str,
+        corpus: list[str],
+        language_code: str,
+        reuse: tuple[np.ndarray, np.ndarray] | None = None,
+    ) -> tuple[np.ndarray, str | None]:
+        """Get corpus embeddings from the on-disk cache, encoding and storing them on a miss.
+
+        Args:
+            reuse (tuple, None): Earlier embeddings, and for each row of `corpus` its row in them
+                (-1 if it has to be encoded)
+
+        Returns:
+            The embeddings in host memory, memory-mapped if they are cached, and their cache key
+            (`None` without an embedding cache)
+
+        """
+        if self._embedding_cache is None:
+            return self._encode_labels(corpus, reuse), None
+        key = EmbeddingCache.key(self._model_id, scope, language_code, corpus)
+        embeddings = self._embedding_cache.load(key)
+        self.events.count(
+            "embedding_cache.miss" if embeddings is None else "embedding_cache.hit", scheme=scope
+        )
+        if embeddings is None:
+            self._embedding_cache.save(key, self._encode_labels(corpus, reuse))
+            # Reload so the array is backed by the shared file pages instead of private memory
+            embeddings = self._embedding_cache.load(key)
+        return embeddings, key
+
+    def _encode_labels(
+        self, corpus: list[str], reuse: tuple[np.ndarray, np.ndarray] | None = None
+    ) -> np.ndarray:
+        """Embeddings of `corpus`, copying the rows given in `reuse` instead of encoding them."""
+        if reuse is None:
+            with self.events.span("encode_corpus", rows=len(corpus)):
+                return self._encode_sentences(corpus)
+        previous, kept = reuse
+        old, missing = kept >= 0, np.flatnonzero(kept < 0)
+        embeddings = np.empty((len(corpus), previous.shape[1]), dtype=np.float32)
+        embeddings[old] = previous[kept[old]]
+        if len(missing):
+            with self.events.span("encode_corpus", rows=len(missing)):
+                embeddings[missing] = self._encode_sentences([corpus[row] for row in missing])
+        return embeddings
+
+    def _encode_sentences(self, sentences: list[str]) -> np.ndarray:
+        """Encode many sentences, sharded over a process pool if configured.
+
+        The sentences are sorted by length first, so each shard and batch holds sentences of
+        similar length and little padding is computed; rows are returned in input order.
+
+        """
+        model = self._model()
+        devices = self._cfg.encode_devices or ["cpu"] * self._cfg.encode_processes
+        if len(devices) <= 1 or len(sentences) < MULTIPROCESS_MIN_LABELS:
+            return model.encode(
+                sentences, batch_size=self._cfg.encode_batch_size, convert_to_numpy=True
+            )
+
+        order = np.argsort([len(sentence) for sentence in sentences], kind="stable")
+        # One pool at a time; concurrently prewarmed schemes would otherwise oversubscribe
+        with self._pool_lock:
+            pool = model.start_multi_process_pool(target_devices=devices)
+            try:
+                sorted_sentences = [sentences[idx] for idx in order]
+                chunk_size = -(-len(sentences) // (len(devices) * 4))
+                if "pool" in inspect.signature(model.encode).parameters:
+                    encoded = model.encode(
+                        sorted_sentences,
+                        pool=pool,
+                        batch_size=self._cfg.encode_batch_size,
+                        chunk_size=chunk_size,
+                        convert_to_numpy=True,
+                    )
+                else:  # sentence_transformers < 5
+                    encoded = model.encode_multi_process(
+                        sorted_sentences,
+                        pool,
+                        batch_size=self._cfg.encode_batch_size,
+                        chunk_size=chunk_size,
+                    )
+            finally:
+                model.stop_multi_process_pool(pool)
+        embeddings = np.empty_like(encoded)
+        embeddings[order] = encoded
+        return embeddings
+
+    def _ann_index(self, index: SchemeIndex) -> IVFIndex:
+        """Approximate nearest neighbour index for a scheme, loaded from disk or built once."""
+        if index.ann is None:
+            cache = self._embedding_cache if index.key is not None else None
+            arrays = cache.load_arrays(index.key, "ivf") if cache is not None else None
+            if arrays is not None:
+                index.ann = IVFIndex.from_arrays(arrays)
+            else:
+                index.ann = IVFIndex.build(index.host_embeddings)
+                if cache is not None:
+                    cache.save_arrays(index.key, "ivf", index.ann.to_arrays())
+            self._evict_scheme_indexes()
+        return index.ann
+
+    def _requests_get(self, url: str, params: dict | None = None, cache: bool = True) -> dict:
+        """Perform a `GET` on the pooled session with given parameters.
 
         Args:
             url: The API endpoint.
             params: Any additional parameters to pass.
+            cache: Whether to use the response cache.
 
         Returns:
             dict: A dictionary containing the parsed JSON response.
@@ -212,28 +1099,89 @@ class GlossaryAPI:
 
         """
         params = self._params | params if params is not None else self._params
-        response = requests.get(
-            reduce(urljoin, [self._cfg.base_url, f"{self._cfg.api_version}/", url]),
-            params=params,
-            timeout=10,
-        )
+        endpoint, url = url, self._url(url)
+        key = ResponseCache.key(url, params) if cache and self._cache is not None else None
+        if key is not None:
+            data = self._cache.get(key)
+            self.events.count("cache.miss" if data is None else "cache.hit", endpoint=endpoint)
+            if data is not None:
+                return data
+
+        with self.events.span("http.request", endpoint=endpoint) as attributes:
+            response = self._get(endpoint, url, params)
+            if self.events.active:
+                attributes.update(status=response.status_code, bytes=len(response.content))
+            self._raise_for_status(response)
+            data = response.json()
+        if key is not None:
+            self._cache.set(key, data)
+        return data
+
+    def _requests_stream(
+        self, url: str, params: dict | None = None, chunk_size: int = 2**16
+    ) -> Iterator:
+        """Perform a streaming `GET` and yield the elements of the JSON array it returns.
+
+        Args:
+            url: The API endpoint.
+            params: Any additional parameters to pass.
+            chunk_size: Number of bytes read at a time.
+
+        Raises:
+            requests.exceptions.RequestException: If there is an error with the request,
+            such as a connection error or an invalid URL.
+
+        """
+        params = self._params | params if params is not None else self._params
+        # The span lasts until the caller has consumed the whole stream
+        with (
+            self.events.span("http.stream", endpoint=url) as attributes,
+            self._get(url, self._url(url), params, stream=True) as response,
+        ):
+            self._raise_for_status(response)
+            response.encoding = response.encoding or "utf-8"
+            yield from iter_json_array(
+                response.iter_content(chunk_size=chunk_size, decode_unicode=True)
+            )
+            if self.events.active:
+                attributes.update(status=response.status_code, bytes=response.raw.tell())
+
+    def _get(
+        self, endpoint: str, url: str, params: dict, stream: bool = False
+    ) -> requests.Response:
+        """`GET` within the rate limit, retrying connection errors and 429 or 5xx responses.
+
+        Returns the last response, whatever its status, after `Settings.retries` retries.
+
+        """
+        for attempt in range(self._cfg.retries + 1):
+            if self._rate_limiter is not None:
+                self._rate_limiter.acquire()
+            try:
+                response = self._session.get(
+                    url, params=params, timeout=self._timeout(endpoint), stream=stream
+                )
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if attempt == self._cfg.retries:
+                    raise
+                delay = self._backoff(attempt)
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt == self._cfg.retries:
+                    return response
+                delay = self._backoff(attempt, response.headers.get("Retry-After"))
+                response.close()
+            self.events.count("http.retry", endpoint=endpoint, attempt=attempt + 1)
+            time.sleep(delay)
+
+    def _raise_for_status(self, response: requests.Response) -> None:
         try:
             response.raise_for_status()
         except requests.exceptions.RequestException as error:
-            msg = f"Error fetching data: {error}"
-            if response is not None:
-                status_code = response.status_code
-                msg += f"\nHTTP {status_code}"
-                if 400 <= status_code < 600:
-                    try:
-                        error_data = response.json()
-                        msg += f"\nResponse: {error_data}"
-                    except ValueError:
-                        msg += f"\nResponse: {response.text}"
+            msg = self._error_message(error, response.status_code, response.json, response.text)
             raise requests.exceptions.RequestException(msg) from error
-        return response.json()
 
-    def _complete_label(self, data: dict) -> str:
+    @staticmethod
+    def _complete_label(data: dict) -> str:
         if len(data.get("broader", [])):
             return (
                 " ⧺ ".join([obj["prefLabel"] for obj in data["broader"]])
@@ -242,36 +1190,74 @@ class GlossaryAPI:
             )
         return data["prefLabel"]
 
-    @property
-    def _params(self) -> dict:
-        """Default parameters for every request."""
-        return {"lang": self.language_code}
+    def _hydrate(self, iris: list[str], known: Mapping[str, dict] | None = None) -> list[dict]:
+        """Full concepts for `iris`, in order and without duplicates, with broader relations.
 
-    def _validate_iri(self, iri: str) -> None:
-        """Basic IRI validation.
+        Concepts in `known` (usually the catalogue of the searched scheme) are reused, and
+        everything else is fetched concurrently, once per IRI across the whole result set.
 
-        # TBD
+        """
+        iris = list(dict.fromkeys(iris))
+        index = known if known is not None else {}
+        with self.events.span("hydrate", concepts=len(iris)):
+            # Catalogue entries only replace `concept()` if they carry the relations we need
+            concepts = self._fetch_concepts(
+                [iri for iri in iris if "relations" not in index.get(iri, {})]
+            )
+            concepts.update({iri: dict(index[iri]) for iri in iris if iri not in concepts})
 
-        Args:
-            iri (str): The [IRI](https://en.wikipedia.org/wiki/Internationalized_Resource_Identifier)
+            broader_iris = self._broader_iris(concepts.values())
+            broader = self._fetch_concepts([iri for iri in broader_iris if iri not in index])
+            broader.update({iri: index[iri] for iri in broader_iris if iri in index})
 
-        Raises:
-            ValueError: The IRI is not valid
-            KeyError: The requested resource was not found
+        return [
+            self._fill_out_concept_broader_relationships(concepts[iri], concepts=broader)
+            for iri in iris
+        ]
 
-        """
+    def _fetch_concepts(self, iris: list[str]) -> dict[str, dict]:
+        """Fetch several concepts concurrently, keyed by IRI."""
+        iris = list(dict.fromkeys(iris))
+        if len(iris) <= 1:
+            return {iri: self.concept(iri) for iri in iris}
+        with ThreadPoolExecutor(max_workers=min(self._cfg.max_workers, len(iris))) as executor:
+            return dict(zip(iris, executor.map(self.concept, iris)))
+
+    @staticmethod
+    def _labels(concept: dict) -> tuple:
+        return tuple(concept.get(field) for field in LABEL_FIELDS)
+
+    @staticmethod
+    def _broader_iris(concepts) -> list[str]:
+        """IRIs of the direct broader concepts of `concepts`, without duplicates."""
+        return list(
+            dict.fromkeys(
+                obj["target_concept_iri"]
+                for data in concepts
+                for obj in data.get("relations", [])
+                if obj["type"] == "broader" and obj["source_concept_iri"] == data["iri"]
+            )
+        )
 
     def _fill_out_concept_broader_relationships(
-        self, data: dict, attributes: list[str] | None = None
+        self,
+        data: dict,
+        attributes: list[str] | None = None,
+        concepts: dict[str, dict] | None = None,
     ) -> dict:
-        """Add some additional information about broader relations of a concept"""
+        """Add some additional information about broader relations of a concept
+
+        `concepts` maps IRIs to already known concepts; others are fetched with `concept()`.
+
+        """
         if attributes is None:
             attributes = ["iri", "prefLabel"]
+        if concepts is None:
+            concepts = {}
         if "relations" in data:
             broader = [
-                self.concept(obj["target_concept_iri"])
-                for obj in data["relations"]
-                if obj["type"] == "broader" and obj["source_concept_iri"] == data["iri"]
+                concepts[iri] if iri in concepts else self.concept(iri)
+                for iri in self._broader_iris([data])
             ]
             data["broader"] = [{key: obj.get(key) for key in attributes} for obj in broader]
         return data
@@ -0,0 +1,148 @@
+import numpy as np
+
+PRECISIONS = ("float32", "float16", "int8", "binary")
+# Bytes per dimension, relative to float32
+COMPRESSION = {"float16": 2, "int8": 4, "binary": 32}
+
+# Number of set bits in every possible byte, for numpy < 2.0 without `np.bitwise_count`
+_POPCOUNT = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(axis=1)
+# Rows converted at a time; small enough that each block stays in the CPU cache
+_CHUNK = 4096
+
+
+class QuantizedEmbeddings:
+    """Reduced precision copy of an embedding matrix, for shortlisting semantic search candidates.
+
+    Rows are normalised to unit length and stored as:
+
+    * `float16`: half precision floats (2x smaller)
+    * `int8`: signed bytes, with one scale factor per dimension (4x smaller)
+    * `binary`: one sign bit per dimension, compared by Hamming distance (32x smaller)
+
+    `search` scores every row with the quantized copy, then rescores the `rescore * k` best with
+    the full precision (usually memory-mapped) embeddings, so only those rows are read.
+
+    Args:
+        precision (str): One of `float16`, `int8` or `binary`
+        data (np.ndarray): Quantized rows
+        scale (np.ndarray): Per-dimension scale factors of `int8` data; empty otherwise
+        norms (np.ndarray): L2 norm of every full precision row
+
+    """
+
+    def __init__(self, precision: str, data: np.ndarray, scale: np.ndarray, norms: np.ndarray):
+        if precision not in COMPRESSION:
+            raise ValueError(f"Unknown embedding precision {precision}")
+        self.precision = precision
+        self.data = data
+        self.scale = scale
+        self.norms = norms
+
+    @property
+    def nbytes(self) -> int:
+        return self.data.nbytes + self.scale.nbytes + self.norms.nbytes
+
+    @classmethod
+    def quantize(cls, embeddings: np.ndarray, precision: str) -> "QuantizedEmbeddings":
+        """Quantize `(n, dim)` float embeddings, reading them in chunks."""
+        if precision not in COMPRESSION:
+            raise ValueError(f"Unknown embedding precision {precision}")
+        num, dim = embeddings.shape
+        norms = np.linalg.norm(embeddings, axis=1).astype(np.float32)
+        norms[norms == 0] = 1
+
+        def unit(start: int) -> np.ndarray:
+            chunk = np.asarray(embeddings[start : start + _CHUNK], dtype=np.float32)
+            return chunk / norms[start : start + _CHUNK, None]
+
+        scale = np.empty(0, dtype=np.float32)
+        if precision == "int8":
+            maximum = np.zeros(dim, dtype=np.float32)
+            for start in range(0, num, _CHUNK):
+                np.maximum(maximum, np.abs(unit(start)).max(axis=0), out=maximum)
+            scale = np.where(maximum > 0, maximum / 127, 1).astype(np.float32)
+
+        if precision == "float16":
+            data = np.empty((num, dim), dtype=np.float16)
+        elif precision == "int8":
+            data = np.empty((num, dim), dtype=np.int8)
+        else:
+            # Padded to whole 64-bit words, so bits can be counted a word at a time
+            data = np.zeros((num, (dim + 63) // 64 * 8), dtype=np.uint8)
+        for start in range(0, num, _CHUNK):
+            chunk = unit(start)
+            if precision == "float16":
+                data[start : start + _CHUNK] = chunk
+            elif precision == "int8":
+                data[start : start + _CHUNK] = np.rint(chunk / scale)
+            else:
+                packed = np.packbits(chunk > 0, axis=1)
+                data[start : start + _CHUNK, : packed.shape[1]] = packed
+        return cls(precision, data, scale, norms)
+
+    def scores(self, queries: np.ndarray) -> np.ndarray:
+        """Approximate similarity of each query to every row, as a `(queries, rows)` array.
+
+        For `float16` and `int8` this approximates cosine similarity; for `binary` it is the
+        number of matching sign bits, which ranks rows in nearly the same order.
+
+        """
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        queries = queries / np.maximum(np.linalg.norm(queries, axis=1, keepdims=True), 1e-12)
+        scores = np.empty((len(queries), len(self.data)), dtype=np.float32)
+        if self.precision == "binary":
+            bits = np.zeros((len(queries), self.data.shape[1]), dtype=np.uint8)
+            packed = np.packbits(queries > 0, axis=1)
+            bits[:, : packed.shape[1]] = packed
+            total = self.data.shape[1] * 8
+            if hasattr(np, "bitwise_count"):
+                data, bits = self.data.view(np.uint64), bits.view(np.uint64)
+                popcount = np.bitwise_count
+            else:
+                data, popcount = self.data, _POPCOUNT.__getitem__
+            for row, query in enumerate(bits):
+                scores[row] = total - popcount(data ^ query).sum(axis=1, dtype=np.int32)
+            return scores
+        if self.precision == "int8":
+            # Fold the per-dimension scale into the query instead of dequantizing every row
+            queries = queries * self.scale
+        for start in range(0, len(self.data), _CHUNK):
+            block = self.data[start : start + _CHUNK].astype(np.float32)
+            scores[:, start : start + _CHUNK] = queries @ block.T
+        return scores
+
+    def search(
+        self, embeddings: np.ndarray, queries: np.ndarray, k: int, rescore: int = 4
+    ) -> np.ndarray:
+        """Top `k` rows of `embeddings` by cosine similarity for each query.
+
+        Args:
+            embeddings (np.ndarray): The full precision embeddings this was built from
+            queries (np.ndarray): `(queries, dim)` query embeddings
+            k (int): Number of rows per query
+            rescore (int): Shortlist `rescore * k` rows with the quantized scores, and rank
+                those by exact cosine similarity; higher is slower but more accurate
+
+        Returns:
+            `(queries, k)` row ids, best first
+
+        """
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        approximate = self.scores(queries)
+        num = approximate.shape[1]
+        k = min(k, num)
+        shortlist = min(max(rescore, 1) * k, num)
+        if shortlist < num:
+            candidates = np.argpartition(-approximate, shortlist - 1, axis=1)[:, :shortlist]
+        else:
+            candidates = np.broadcast_to(np.arange(num), approximate.shape)
+
+        rows = np.empty((len(queries), k), dtype=np.int64)
+        for idx, (query, candidate) in enumerate(zip(queries, candidates)):
+            candidate = np.sort(candidate)  # Sequential reads from a memory-mapped matrix
+            exact = (np.asarray(embeddings[candidate], dtype=np.float32) @ query) / self.norms[
+                candidate
+            ]
+            top = np.argsort(-exact, kind="stable")[:k]
+            rows[idx] = candidate[top]
+        return rows
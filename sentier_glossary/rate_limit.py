@@ -0,0 +1,46 @@
+import asyncio
+import threading
+import time
+
+
+class TokenBucket:
+    """Client-side rate limiter shared by all threads (or tasks) of a client.
+
+    Tokens are added at `rate` per second, up to `burst`; every request takes one. When the
+    bucket is empty, callers are queued in arrival order: each reserves the next token and
+    sleeps until it is due, instead of polling.
+
+    Args:
+        rate (float): Sustained requests per second
+        burst (int, None): Requests which can be made at once after an idle period; defaults
+            to one second's worth
+
+    """
+
+    def __init__(self, rate: float, burst: int | None = None):
+        if rate <= 0:
+            raise ValueError(f"Rate must be positive, got {rate}")
+        self.rate = rate
+        self.burst = max(burst if burst is not None else int(rate), 1)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token, and return the seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._tokens + (now - self._updated) * self.rate, self.burst)
+            self._updated = now
+            self._tokens -= 1
+            return max(-self._tokens / self.rate, 0.0)
+
+    def acquire(self) -> None:
+        delay = self.reserve()
+        if delay:
+            time.sleep(delay)
+
+    async def acquire_async(self) -> None:
+        delay = self.reserve()
+        if delay:
+            await asyncio.sleep(delay)
@@ -0,0 +1,184 @@
+import copy
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+from sentier_glossary.settings import Settings
+
+
+class ResponseCache(ABC):
+    """Interface for caches of parsed API responses.
+
+    Keys are built with `ResponseCache.key` from the endpoint URL and the request parameters
+    (including `lang`). Implementations must hand out values the caller is free to mutate.
+
+    """
+
+    @staticmethod
+    def key(url: str, params: dict) -> str:
+        return json.dumps([url, sorted(params.items())], ensure_ascii=False)
+
+    @classmethod
+    def from_settings(cls, cfg: Settings) -> "ResponseCache | None":
+        """Cache configured by `cfg`, or `None` if response caching is disabled."""
+        if cfg.cache_maxsize <= 0:
+            return None
+        if cfg.cache_path is not None:
+            return SQLiteCache(cfg.cache_path, maxsize=cfg.cache_maxsize, ttl=cfg.cache_ttl)
+        return MemoryCache(maxsize=cfg.cache_maxsize, ttl=cfg.cache_ttl)
+
+    @abstractmethod
+    def get(self, key: str) -> Any | None:
+        """Cached value for `key`, or `None` if missing or expired."""
+
+    @abstractmethod
+    def set(self, key: str, value: Any) -> None:
+        """Store `value` under `key`."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove all entries."""
+
+
+class MemoryCache(ResponseCache):
+    """Thread-safe in-process cache with LRU eviction and TTL expiry.
+
+    Args:
+        maxsize (int): Maximum number of entries
+        ttl (float, None): Seconds before an entry expires; `None` to never expire
+
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float | None = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[str, tuple[float | None, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            try:
+                expires, value = self._data[key]
+            except KeyError:
+                return None
+            if expires is not None and expires < time.time():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+        return copy.deepcopy(value)
+
+    def set(self, key: str, value: Any) -> None:
+        expires = time.time() + self.ttl if self.ttl is not None else None
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+class SQLiteCache(ResponseCache):
+    """Persistent cache in a SQLite file, shared between runs and processes.
+
+    Entries are evicted least recently used first once there are more than `maxsize`; recency is
+    a counter kept in the database, so it is consistent across processes and coarse clocks.
+    Eviction removes a tenth of `maxsize` at a time, and the number of entries is tracked per
+    process, so with several processes writing the table can briefly exceed `maxsize`.
+
+    Args:
+        path (Path, str): SQLite database file; created if missing
+        maxsize (int): Maximum number of entries
+        ttl (float, None): Seconds before an entry expires; `None` to never expire
+
+    """
+
+    _TICK = "SELECT COALESCE(MAX(accessed), 0) + 1 FROM responses"
+
+    def __init__(self, path: Path | str, maxsize: int = 100_000, ttl: float | None = None):
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    expires REAL,
+                    accessed INTEGER NOT NULL,
+                    value TEXT NOT NULL
+                )
+            """)
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)"
+            )
+            # An upper bound, as replaced entries are counted again; recounted before evicting
+            self._count = self._connection.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def get(self, key: str) -> Any | None:
+        now = time.time()
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                "SELECT expires, value FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            expires, value = row
+            if expires is not None and expires < now:
+                self._connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+            self._connection.execute(
+                f"UPDATE responses SET accessed = ({self._TICK}) WHERE key = ?", (key,)
+            )
+        return json.loads(value)
+
+    def set(self, key: str, value: Any) -> None:
+        now = time.time()
+        expires = now + self.ttl if self.ttl is not None else None
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses (key, expires, accessed, value) "
+                f"VALUES (?, ?, ({self._TICK}), ?)",
+                (key, expires, json.dumps(value, ensure_ascii=False)),
+            )
+            self._count += 1
+            if self._count > self.maxsize:
+                self._evict()
+
+    def _evict(self) -> None:
+        """Delete the least recently used entries beyond `maxsize`, and a batch more."""
+        count = self._connection.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        excess = count - self.maxsize + self.maxsize // 10 if count > self.maxsize else 0
+        if excess:
+            # Walks the `accessed` index from the oldest entry, instead of sorting the table
+            self._connection.execute(
+                "DELETE FROM responses WHERE key IN "
+                "(SELECT key FROM responses ORDER BY accessed LIMIT ?)",
+                (excess,),
+            )
+        self._count = count - excess
+
+    def clear(self) -> None:
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM responses")
+            self._count = 0
+
+    def close(self) -> None:
+        self._connection.close()
@@ -0,0 +1,64 @@
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from sentier_glossary.ann import IVFIndex
+from sentier_glossary.catalogue import Catalogue
+from sentier_glossary.hierarchy import Hierarchy
+from sentier_glossary.lexical import LexicalIndex
+from sentier_glossary.quantization import QuantizedEmbeddings
+
+if TYPE_CHECKING:
+    import torch
+
+
+@dataclass
+class SchemeIndex:
+    """Everything semantic search needs for one concept scheme in one language.
+
+    Attributes:
+        scheme_iri (str): The concept scheme
+        language_code (str): Language of the labels
+        catalogue (Catalogue): Labels and concepts of the scheme
+        embeddings (torch.Tensor): One row per label in `catalogue.labels`, on the model device
+            unless the embeddings are quantized
+        host_embeddings (np.ndarray): The same rows in host memory, memory-mapped from the
+            embedding cache or snapshot if there is one; defaults to `embeddings` copied to the host
+        key (str, None): Embedding cache key, if the embeddings are cached on disk
+        ann (IVFIndex, None): Approximate nearest neighbour index, built on first use
+        lexical (LexicalIndex, None): Keyword index, built on first use
+        quantized (QuantizedEmbeddings, None): Reduced precision copy of `embeddings` used for
+            exact search, if `Settings.embedding_precision` isn't `float32`
+        hierarchy (Hierarchy, None): Broader/narrower tree, built by `GlossaryAPI.hierarchy`
+        offline (bool): Loaded from a snapshot; search results are made from the catalogue
+            records as they are, without requests
+
+    """
+
+    scheme_iri: str
+    language_code: str
+    catalogue: Catalogue
+    embeddings: "torch.Tensor"
+    host_embeddings: np.ndarray | None = field(default=None, repr=False)
+    key: str | None = None
+    ann: IVFIndex | None = field(default=None, repr=False)
+    lexical: LexicalIndex | None = field(default=None, repr=False)
+    quantized: QuantizedEmbeddings | None = field(default=None, repr=False)
+    hierarchy: Hierarchy | None = field(default=None, repr=False)
+    offline: bool = False
+
+    def __post_init__(self):
+        if self.host_embeddings is None:
+            self.host_embeddings = self.embeddings.cpu().numpy()
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the embeddings and search indexes, counting memory-mapped arrays in full."""
+        nbytes = self.host_embeddings.nbytes
+        if self.embeddings.device.type != "cpu":
+            nbytes += self.embeddings.element_size() * self.embeddings.nelement()
+        for part in (self.quantized, self.ann, self.lexical):
+            if part is not None:
+                nbytes += part.nbytes
+        return nbytes
@@ -0,0 +1,418 @@
+import http.client
+import json
+import os
+import queue
+import socket
+import socketserver
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future
+from enum import Enum
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING, Any
+
+import requests
+
+from sentier_glossary.main import DATAFRAME_COLUMNS, CommonSchemes, GlossaryAPI
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+DEFAULT_PORT = 8765
+# Most queries waited for before encoding them together, and the longest wait for more
+MAX_BATCH_SIZE = 64
+MAX_WAIT = 0.005
+
+
+class MicroBatcher:
+    """Collects items submitted by many threads and processes them in batches.
+
+    A worker thread takes the first waiting item, then whatever else arrives within `max_wait`
+    seconds, up to `max_batch_size` items, and calls `function` once with all of them. Under
+    load, batches fill up without waiting; a lone item waits at most `max_wait`.
+
+    Args:
+        function (Callable): Called with a list of items; returns one result per item, or an
+            exception instance to raise for that item only
+        max_batch_size (int): Most items per call
+        max_wait (float): Seconds to wait for more items after the first
+
+    """
+
+    def __init__(
+        self,
+        function: Callable[[list], list],
+        max_batch_size: int = MAX_BATCH_SIZE,
+        max_wait: float = MAX_WAIT,
+    ):
+        self.function = function
+        self.max_batch_size = max(max_batch_size, 1)
+        self.max_wait = max_wait
+        self._queue: queue.SimpleQueue[tuple[Any, Future] | None] = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, name="MicroBatcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, item) -> Future:
+        """Queue `item`; the returned future gets its result."""
+        future = Future()
+        self._queue.put((item, future))
+        return future
+
+    def close(self) -> None:
+        """Finish the queued items and stop the worker thread."""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch, closing = [first], False
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                try:
+                    entry = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                if entry is None:
+                    closing = True
+                    break
+                batch.append(entry)
+            self._process(batch)
+            if closing:
+                return
+
+    def _process(self, batch: list[tuple[Any, Future]]) -> None:
+        try:
+            results = self.function([item for item, _ in batch])
+        except Exception as error:
+            results = [error] * len(batch)
+        for (_, future), result in zip(batch, results):
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+
+class GlossaryServer:
+    """Serves semantic search of one warm `GlossaryAPI` over local HTTP or a Unix socket.
+
+    Every worker process of a web application can then share one model and one set of scheme
+    indexes through `GlossaryClient`, instead of loading its own. Queries arriving concurrently
+    are micro-batched: encoded with one model call, then ranked and hydrated per scope.
+
+    Endpoints take and return JSON:
+
+    * `POST /semantic_search`: `{"query": ..., "scope": ..., "min_num_results": ..., "nprobe":
+      ..., "hybrid": ...}`, returns the list of results
+    * `POST /semantic_search_many`: the same with `"queries"`, returns one list per query
+    * `GET /health`: model id and loaded schemes
+
+    Errors are returned as `{"detail": ...}` with status 404 for unknown scopes, 400 for invalid
+    requests and 500 otherwise.
+
+    Args:
+        api (GlossaryAPI): Client doing the work; prewarm its schemes before serving
+        host (str): Interface to listen on, for TCP
+        port (int): TCP port; 0 picks a free one
+        unix_socket (str, None): Listen on this Unix socket path instead of TCP
+        max_batch_size (int): Most queries encoded together
+        max_wait (float): Seconds a query waits for others to batch it with
+
+    """
+
+    def __init__(
+        self,
+        api: GlossaryAPI,
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_PORT,
+        unix_socket: str | None = None,
+        max_batch_size: int = MAX_BATCH_SIZE,
+        max_wait: float = MAX_WAIT,
+    ):
+        self.api = api
+        self.unix_socket = unix_socket
+        self.batcher = MicroBatcher(self._search_batch, max_batch_size, max_wait)
+        handler = type("Handler", (_Handler,), {"glossary": self})
+        if unix_socket is not None:
+            _check_unix_sockets()
+            if os.path.exists(unix_socket):
+                os.remove(unix_socket)
+            self.httpd = _unix_http_server(unix_socket, handler)
+        else:
+            self.httpd = ThreadingHTTPServer((host, port), handler)
+
+    @property
+    def url(self) -> str:
+        if self.unix_socket is not None:
+            return f"unix://{self.unix_socket}"
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def serve_forever(self) -> None:
+        self.httpd.serve_forever()
+
+    def shutdown(self) -> None:
+        """Stop `serve_forever` (from another thread) and release the socket."""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        self.batcher.close()
+        if self.unix_socket is not None and os.path.exists(self.unix_socket):
+            os.remove(self.unix_socket)
+
+    def search(self, query: str, **options) -> list[dict]:
+        """One query, batched with whatever else is being searched."""
+        options = self._options(options)
+        self._prepare(options)
+        return self.batcher.submit((query, options)).result()
+
+    def search_many(self, queries: list[str], **options) -> list[list[dict]]:
+        options = self._options(options)
+        self._prepare(options)
+        futures = [self.batcher.submit((query, options)) for query in queries]
+        return [future.result() for future in futures]
+
+    @staticmethod
+    def _options(options: dict) -> tuple:
+        """Hashable search options; queries with equal options are ranked together."""
+        scope = options.get("scope")
+        if isinstance(scope, list):
+            scope = tuple(scope)
+        elif scope is not None and not isinstance(scope, str):
+            raise ValueError(f"Invalid scope {scope!r}")
+        return (
+            scope,
+            int(options.get("min_num_results", 10)),
+            None if options.get("nprobe") is None else int(options["nprobe"]),
+            bool(options.get("hybrid", False)),
+        )
+
+    def _prepare(self, options: tuple) -> None:
+        """Load or build the scope in the calling thread, not in the batcher.
+
+        Building a scheme index downloads and encodes its whole catalogue; done by the batcher,
+        it would hold up every other query waiting there, whatever their scope.
+
+        """
+        scope = options[0]
+        self.api._prepare_scopes(list(scope) if isinstance(scope, tuple) else scope)
+
+    def _search_batch(self, items: list[tuple[str, tuple]]) -> list:
+        """Encode all queries at once, then rank them per distinct set of options."""
+        queries = [query for query, _ in items]
+        with self.api.events.span("server.batch", queries=len(queries)):
+            embeddings = self.api._encode_queries(queries)
+            groups: dict[tuple, list[int]] = {}
+            for position, (_, options) in enumerate(items):
+                groups.setdefault(options, []).append(position)
+            results: list = [None] * len(items)
+            for (scope, min_num_results, nprobe, hybrid), positions in groups.items():
+                try:
+                    found = self.api._search_encoded(
+                        [queries[position] for position in positions],
+                        embeddings[positions],
+                        list(scope) if isinstance(scope, tuple) else scope,
+                        min_num_results,
+                        nprobe,
+                        hybrid,
+                    )
+                except Exception as error:
+                    found = [error] * len(positions)
+                for position, result in zip(positions, found):
+                    results[position] = result
+        return results
+
+
+def _check_unix_sockets() -> None:
+    if not hasattr(socket, "AF_UNIX"):
+        raise OSError("Unix sockets aren't supported on this platform; use TCP instead")
+
+
+def _unix_http_server(path: str, handler: type) -> socketserver.BaseServer:
+    """Threading HTTP server on a Unix socket.
+
+    `socketserver.UnixStreamServer` only exists where `socket.AF_UNIX` does (not on Windows), so
+    the class is defined on first use instead of at import time.
+
+    """
+
+    class ThreadingUnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+    return ThreadingUnixHTTPServer(path, handler)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    glossary: GlossaryServer
+    protocol_version = "HTTP/1.1"
+
+    def address_string(self) -> str:
+        # Unix socket peers have no address
+        return self.client_address[0] if self.client_address else "unix"
+
+    def log_message(self, format: str, *args) -> None:
+        # Per-request logging would dominate the cost of serving a search
+        pass
+
+    def do_GET(self) -> None:
+        if self.path != "/health":
+            return self._send(404, {"detail": f"Unknown endpoint {self.path}"})
+        api = self.glossary.api
+        with api._lock:
+            schemes = [list(key) for key, future in api._indexes.items() if future.done()]
+        self._send(200, {"status": "ok", "model_id": api._model_id, "schemes": schemes})
+
+    def do_POST(self) -> None:
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(length) or b"{}")
+            if self.path == "/semantic_search":
+                query = body.pop("query", None)
+                if not isinstance(query, str):
+                    raise ValueError("`query` must be a string")
+                result = self.glossary.search(query, **body)
+            elif self.path == "/semantic_search_many":
+                queries = body.pop("queries", None)
+                if not isinstance(queries, list) or not all(isinstance(q, str) for q in queries):
+                    raise ValueError("`queries` must be a list of strings")
+                result = self.glossary.search_many(queries, **body)
+            else:
+                return self._send(404, {"detail": f"Unknown endpoint {self.path}"})
+        except KeyError as error:
+            return self._send(404, {"detail": str(error.args[0] if error.args else error)})
+        except (ValueError, TypeError) as error:
+            return self._send(400, {"detail": str(error)})
+        except Exception as error:
+            return self._send(500, {"detail": f"{type(error).__name__}: {error}"})
+        self._send(200, result)
+
+    def _send(self, status: int, data) -> None:
+        payload = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path: str, timeout: float | None = None):
+        super().__init__("localhost", timeout=timeout)
+        self.unix_socket = path
+
+    def connect(self) -> None:
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.unix_socket)
+
+
+class GlossaryClient:
+    """Thin client of a `GlossaryServer`, with the semantic search methods of `GlossaryAPI`.
+
+    Doesn't import or load any model, so it is cheap to create in every worker process.
+
+    Args:
+        url (str): `http://host:port` of the server, or `unix:///path/to/socket`
+        timeout (float): Seconds to wait for each response
+
+    """
+
+    def __init__(self, url: str = f"http://127.0.0.1:{DEFAULT_PORT}", timeout: float = 60):
+        if url.startswith("unix://"):
+            _check_unix_sockets()
+        self.url = url
+        self.timeout = timeout
+
+    def semantic_search(
+        self,
+        query: str,
+        scope: str | CommonSchemes | list | None = None,
+        dataframe: bool = False,
+        min_num_results: int = 10,
+        nprobe: int | None = None,
+        hybrid: bool = False,
+    ) -> "list[dict] | pd.DataFrame":
+        """Perform semantic search query on the server; see `GlossaryAPI.semantic_search`."""
+        results = self._post(
+            "/semantic_search",
+            {"query": query, **self._options(scope, min_num_results, nprobe, hybrid)},
+        )
+        if dataframe:
+            import pandas as pd
+
+            return pd.DataFrame([GlossaryAPI._dataframe_row(obj) for obj in results])
+        return results
+
+    def semantic_search_many(
+        self,
+        queries: list[str],
+        scope: str | CommonSchemes | list | None = None,
+        min_num_results: int = 10,
+        nprobe: int | None = None,
+        hybrid: bool = False,
+    ) -> "pd.DataFrame":
+        """Perform many queries on the server; see `GlossaryAPI.semantic_search_many`."""
+        import pandas as pd
+
+        results = self._post(
+            "/semantic_search_many",
+            {"queries": list(queries), **self._options(scope, min_num_results, nprobe, hybrid)},
+        )
+        return pd.DataFrame(
+            [
+                {"query_index": index, "query": queries[index]} | GlossaryAPI._dataframe_row(obj)
+                for index, objs in enumerate(results)
+                for obj in objs
+            ],
+            columns=["query_index", "query", *DATAFRAME_COLUMNS],
+        )
+
+    def health(self) -> dict:
+        return self._request("GET", "/health")
+
+    @staticmethod
+    def _options(scope, min_num_results: int, nprobe: int | None, hybrid: bool) -> dict:
+        if isinstance(scope, Enum):
+            scope = scope.value
+        elif isinstance(scope, (list, tuple)):
+            scope = [cs.value if isinstance(cs, Enum) else cs for cs in scope]
+        return {
+            "scope": scope,
+            "min_num_results": min_num_results,
+            "nprobe": nprobe,
+            "hybrid": hybrid,
+        }
+
+    def _post(self, path: str, data: dict):
+        return self._request("POST", path, data)
+
+    def _request(self, method: str, path: str, data: dict | None = None):
+        if self.url.startswith("unix://"):
+            connection = _UnixHTTPConnection(self.url[len("unix://") :], timeout=self.timeout)
+        else:
+            host = self.url.split("://", 1)[-1].rstrip("/")
+            connection = http.client.HTTPConnection(host, timeout=self.timeout)
+        try:
+            body = json.dumps(data).encode("utf-8") if data is not None else None
+            connection.request(
+                method, path, body=body, headers={"Content-Type": "application/json"}
+            )
+            response = connection.getresponse()
+            payload = json.loads(response.read() or b"null")
+        except (OSError, http.client.HTTPException) as error:
+            raise requests.exceptions.ConnectionError(
+                f"Glossary server at {self.url} is unreachable: {error}"
+            ) from error
+        finally:
+            connection.close()
+        if response.status == 404:
+            raise KeyError(payload.get("detail"))
+        if response.status == 400:
+            raise ValueError(payload.get("detail"))
+        if response.status >= 400:
+            raise requests.exceptions.RequestException(
+                f"Glossary server error\nHTTP {response.status}\nResponse: {payload}"
+            )
+        return payload
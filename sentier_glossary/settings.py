@@ -1,3 +1,6 @@
+from pathlib import Path
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -5,5 +8,49 @@ class Settings(BaseSettings):
     base_url: str = "https://api.g.sentier.dev/"
     api_version: str = "latest"
     fallback_language: str = "en"
+    # Concurrent HTTP requests, also the size of the connection pool
+    max_workers: int = 8
+    # Seconds to wait for the server, per endpoint (e.g. `{"concepts": 60}`) or by default
+    timeout: float = 10
+    endpoint_timeouts: dict[str, float] = {}
+    # Retry failed connections and 429/5xx responses with exponential backoff and random jitter,
+    # waiting `backoff_factor * 2 ** attempt + uniform(0, backoff_jitter)` seconds, or as long as
+    # a `Retry-After` header says, but never more than `backoff_max`
+    retries: int = 3
+    backoff_factor: float = 0.5
+    backoff_jitter: float = 0.5
+    backoff_max: float = 30
+    # Client-side limit on requests per second, and on requests sent at once after idling
+    rate_limit: float | None = None
+    rate_limit_burst: int | None = None
+    # Response cache for `concept()`, `search()` and `schemes()`; `cache_maxsize = 0` disables it
+    # and `cache_path` switches to a persistent SQLite cache
+    cache_maxsize: int = 4096
+    cache_ttl: float | None = 24 * 60 * 60
+    cache_path: Path | None = None
+    # Set to `None` to disable the on-disk semantic search embedding cache
+    embedding_cache_dir: Path | None = Path.home() / ".cache" / "sentier_glossary"
+    # Semantic search indexes kept in memory, each for one concept scheme in one language, and
+    # optionally a limit on their combined size in bytes (see `SchemeIndex.nbytes`). The most
+    # recently used index is kept even if it alone exceeds `max_scheme_index_bytes`.
+    max_scheme_indexes: int = 16
+    max_scheme_index_bytes: int | None = None
+    # Score exact semantic searches with reduced precision embeddings, then rescore the best
+    # `rescore_factor * min_num_results` labels in float32. The float32 embeddings stay memory
+    # mapped, so this only saves memory with the embedding cache enabled.
+    embedding_precision: Literal["float32", "float16", "int8", "binary"] = "float32"
+    rescore_factor: int = 4
+    # In-memory LRU caches for semantic search: query embeddings keyed by model and normalised
+    # query text, and whole `semantic_search` results keyed by query, schemes, language and
+    # options. Results are dropped whenever a scheme index is refreshed or replaced. `0` disables
+    # either cache.
+    query_cache_maxsize: int = 4096
+    result_cache_maxsize: int = 0
+    # Batch size for encoding semantic search labels. Large catalogues are sharded across
+    # `encode_processes` CPU worker processes, or across `encode_devices` such as
+    # `["cuda:0", "cuda:1"]`
+    encode_batch_size: int = 64
+    encode_processes: int = 1
+    encode_devices: list[str] | None = None
 
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
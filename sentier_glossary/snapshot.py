@@ -0,0 +1,180 @@
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from sentier_glossary.ann import IVFIndex
+from sentier_glossary.catalogue import Catalogue
+from sentier_glossary.hierarchy import Hierarchy
+from sentier_glossary.lexical import LexicalIndex
+from sentier_glossary.scheme_index import SchemeIndex
+
+# Bumped whenever the layout changes in a way older readers can't load
+SNAPSHOT_FORMAT = 1
+MANIFEST = "manifest.json"
+
+
+def write_snapshot(
+    directory: Path | str,
+    indexes: list[SchemeIndex],
+    model_id: str,
+    model=None,
+) -> Path:
+    """Write scheme indexes to a new snapshot directory.
+
+    The layout is a `manifest.json`, and one subdirectory per index with the catalogue as JSON
+    and every array (embeddings, catalogue rows, ANN, lexical and hierarchy indexes) as its own
+    `.npy` file, so `read_snapshot` can memory-map them. Everything is written to a temporary
+    directory first, so a snapshot is either complete or absent.
+
+    Args:
+        directory (Path, str): Where to write; must not exist yet, or be empty
+        indexes (list[SchemeIndex]): Indexes to store
+        model_id (str): SentenceTransformer model the embeddings were made with
+        model (SentenceTransformer, None): If given, also save the model in the snapshot
+
+    Returns:
+        The snapshot directory
+
+    """
+    from sentier_glossary import __version__
+
+    directory = Path(directory).expanduser()
+    if directory.exists() and any(directory.iterdir()):
+        raise FileExistsError(f"Snapshot directory {directory} is not empty")
+    directory.parent.mkdir(parents=True, exist_ok=True)
+    tmp = Path(tempfile.mkdtemp(dir=directory.parent, prefix=f".{directory.name}."))
+    try:
+        entries = []
+        for number, index in enumerate(indexes):
+            name = f"{number:03d}"
+            (tmp / name).mkdir()
+            entries.append({"path": name} | _write_index(tmp / name, index))
+        if model is not None:
+            model.save(str(tmp / "model"))
+        manifest = {
+            "format": SNAPSHOT_FORMAT,
+            "sentier_glossary": __version__,
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "model_id": model_id,
+            "model": "model" if model is not None else None,
+            "indexes": entries,
+        }
+        (tmp / MANIFEST).write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+        if directory.exists():
+            directory.rmdir()
+        os.replace(tmp, directory)
+    except BaseException:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+    return directory
+
+
+def read_manifest(directory: Path | str) -> dict:
+    """Parse and check the manifest of a snapshot."""
+    path = Path(directory).expanduser() / MANIFEST
+    manifest = json.loads(path.read_text(encoding="utf-8"))
+    if manifest.get("format") != SNAPSHOT_FORMAT:
+        raise ValueError(
+            f"Snapshot {directory} has format {manifest.get('format')}, "
+            f"but only format {SNAPSHOT_FORMAT} is supported"
+        )
+    return manifest
+
+
+def read_snapshot(directory: Path | str) -> tuple[dict, list[SchemeIndex]]:
+    """Load the manifest and every index of a snapshot, without copying the arrays.
+
+    Arrays are memory-mapped copy-on-write, so processes loading the same snapshot share the
+    page cache instead of each holding a private copy; embeddings are CPU tensors over them.
+
+    """
+    import torch
+
+    directory = Path(directory).expanduser()
+    manifest = read_manifest(directory)
+    indexes = []
+    for entry in manifest["indexes"]:
+        path = directory / entry["path"]
+        with open(path / "catalogue.json", encoding="utf-8") as f:
+            catalogue = json.load(f)
+        embeddings = _load(path / "embeddings.npy")
+        index = SchemeIndex(
+            scheme_iri=entry["scheme_iri"],
+            language_code=entry["language_code"],
+            catalogue=Catalogue(
+                catalogue["labels"],
+                _load(path / "offsets.npy"),
+                _load(path / "concept_ids.npy"),
+                catalogue["concepts"],
+            ),
+            embeddings=torch.from_numpy(embeddings),
+            host_embeddings=embeddings,
+            offline=True,
+        )
+        if index.embeddings.shape[0] != index.catalogue.num_rows:
+            raise ValueError(f"Snapshot index {path} has embeddings of the wrong shape")
+        if entry["ann"]:
+            index.ann = IVFIndex.from_arrays(
+                {name: _load(path / f"ivf.{name}.npy") for name in entry["ann"]}
+            )
+        if entry["lexical"]:
+            with open(path / "lexical.json", encoding="utf-8") as f:
+                lexical = json.load(f)
+            index.lexical = LexicalIndex(
+                {term: idx for idx, term in enumerate(lexical["terms"])},
+                *(_load(path / f"lexical.{name}.npy") for name in entry["lexical"]),
+                k1=lexical["k1"],
+                b=lexical["b"],
+            )
+        if entry.get("hierarchy"):
+            index.hierarchy = Hierarchy(index.catalogue, _load(path / "hierarchy.parents.npy"))
+        indexes.append(index)
+    return manifest, indexes
+
+
+def _write_index(path: Path, index: SchemeIndex) -> dict:
+    """Write one index, returning its manifest entry."""
+    catalogue = index.catalogue
+    with open(path / "catalogue.json", "w", encoding="utf-8") as f:
+        json.dump({"labels": catalogue.labels, "concepts": list(catalogue.values())}, f)
+    np.save(path / "offsets.npy", catalogue.offsets)
+    np.save(path / "concept_ids.npy", catalogue.concept_ids)
+    embeddings = np.ascontiguousarray(index.host_embeddings, dtype=np.float32)
+    np.save(path / "embeddings.npy", embeddings)
+
+    ann = []
+    if index.ann is not None:
+        for name, array in index.ann.to_arrays().items():
+            np.save(path / f"ivf.{name}.npy", array)
+            ann.append(name)
+    lexical = []
+    if index.lexical is not None:
+        with open(path / "lexical.json", "w", encoding="utf-8") as f:
+            json.dump(
+                {"terms": list(index.lexical.terms), "k1": index.lexical.k1, "b": index.lexical.b},
+                f,
+            )
+        for name in ("offsets", "documents", "frequencies", "lengths"):
+            np.save(path / f"lexical.{name}.npy", getattr(index.lexical, name))
+            lexical.append(name)
+    if index.hierarchy is not None:
+        np.save(path / "hierarchy.parents.npy", index.hierarchy.parents)
+    return {
+        "scheme_iri": index.scheme_iri,
+        "language_code": index.language_code,
+        "concepts": len(catalogue),
+        "rows": catalogue.num_rows,
+        "dimensions": int(embeddings.shape[1]),
+        "ann": ann,
+        "lexical": lexical,
+        "hierarchy": index.hierarchy is not None,
+    }
+
+
+def _load(path: Path) -> np.ndarray:
+    return np.load(path, mmap_mode="c")
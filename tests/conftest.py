@@ -1,9 +1,15 @@
 """Fixtures for sentier_glossary"""
 
 import locale
+import zlib
+from unittest.mock import patch
 
+import numpy as np
 import pytest
 
+import sentier_glossary as g
+from sentier_glossary.settings import Settings
+
 
 @pytest.fixture(scope="session", autouse=True)
 def set_locale():
@@ -11,3 +17,88 @@ def set_locale():
         locale.setlocale(locale.LC_ALL, "en_US.UTF-8")
     except locale.Error:
         pytest.skip("locale not available")
+
+
+class FakeEmbedder:
+    """Deterministic bag-of-words embeddings, standing in for `SentenceTransformer`.
+
+    The number of sentences of every `encode` call is appended to `calls`.
+
+    """
+
+    device = "cpu"
+    calls: list[int] = []
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def encode(self, sentences, convert_to_tensor=False, **kwargs):
+        import torch
+
+        single = isinstance(sentences, str)
+        FakeEmbedder.calls.append(1 if single else len(sentences))
+        vectors = np.zeros((1 if single else len(sentences), 32), dtype=np.float32)
+        for row, sentence in enumerate([sentences] if single else sentences):
+            for word in sentence.lower().split():
+                vectors[row, zlib.crc32(word.encode()) % 32] += 1
+        if single:
+            vectors = vectors[0]
+        return torch.from_numpy(vectors) if convert_to_tensor else vectors
+
+
+def _concepts(scheme_iri, language_code=None):
+    return [
+        {"iri": f"{scheme_iri}/1", "prefLabel": "Wheat", "altLabel": "Common wheat"},
+        {"iri": f"{scheme_iri}/2", "prefLabel": "Maize", "scopeNote": "Corn"},
+    ]
+
+
+def _concept(iri):
+    return {"iri": iri, "prefLabel": iri.rsplit("/", 1)[-1], "relations": []}
+
+
+@pytest.fixture
+def fake_concepts():
+    """The same two concepts for any scheme, as `iter_concepts_for_scheme` would list them."""
+    return _concepts
+
+
+@pytest.fixture
+def fake_concept():
+    """A concept without relations, as `concept()` would return it."""
+    return _concept
+
+
+@pytest.fixture
+def fake_embedder():
+    """Patch `SentenceTransformer` with `FakeEmbedder`, starting with no recorded calls."""
+    FakeEmbedder.calls = []
+    with patch("sentence_transformers.SentenceTransformer", FakeEmbedder):
+        yield FakeEmbedder
+
+
+@pytest.fixture
+def fake_glossary():
+    """Patch scheme listings and `concept()` with the fakes; yields both mocks."""
+    with (
+        patch(
+            "sentier_glossary.GlossaryAPI.iter_concepts_for_scheme", side_effect=_concepts
+        ) as concepts,
+        patch("sentier_glossary.GlossaryAPI.concept", side_effect=_concept) as concept,
+    ):
+        yield concepts, concept
+
+
+@pytest.fixture
+def api_settings(tmp_path):
+    """Settings of the `api` fixture; override in a test module to change them."""
+    return Settings(embedding_cache_dir=tmp_path)
+
+
+@pytest.fixture
+def api(fake_embedder, fake_glossary, api_settings):
+    """Client with the fakes, and the nace21 scheme loaded."""
+    api = g.GlossaryAPI(cfg=api_settings, language_code="en")
+    api.setup_semantic_search(schemes=[g.CommonSchemes.nace21])
+    FakeEmbedder.calls = []
+    return api
@@ -36,6 +36,11 @@ def test_semantic_search(api):
     df = api.semantic_search("corn", CommonSchemes.cn2024, dataframe=True)
     assert isinstance(df, pd.DataFrame)
     assert len(df)
-    assert all(
-        df.columns == ["prefLabel", "completeLabel", "broader_iri", "broader_prefLabel", "iri"]
-    )
+    assert df.columns.tolist() == [
+        "prefLabel",
+        "completeLabel",
+        "broader_iri",
+        "broader_prefLabel",
+        "iri",
+        "scheme_iri",
+    ]
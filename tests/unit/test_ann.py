@@ -0,0 +1,71 @@
+import numpy as np
+
+from sentier_glossary.ann import IVFIndex
+
+
+def clustered(num=2000, dim=16, clusters=20, seed=1):
+    rng = np.random.default_rng(seed)
+    centres = rng.normal(size=(clusters, dim))
+    points = centres[rng.integers(clusters, size=num)] + 0.1 * rng.normal(size=(num, dim))
+    return (points * rng.uniform(0.5, 2, size=(num, 1))).astype(np.float32)
+
+
+def exact(embeddings, query, k):
+    scores = embeddings @ query / np.linalg.norm(embeddings, axis=1) / np.linalg.norm(query)
+    return np.argsort(-scores)[:k]
+
+
+def test_all_lists_is_exact():
+    embeddings = clustered()
+    index = IVFIndex.build(embeddings)
+    query = embeddings[7] + 0.05
+    _, rows = index.search(embeddings, query, k=10, nprobe=index.nlist)
+    assert rows.tolist() == exact(embeddings, query, 10).tolist()
+
+
+def test_recall_with_few_lists():
+    embeddings = clustered()
+    index = IVFIndex.build(embeddings)
+    queries = embeddings[:50] + 0.05
+    recall = np.mean(
+        [
+            len(set(index.search(embeddings, q, k=10, nprobe=4)[1]) & set(exact(embeddings, q, 10)))
+            / 10
+            for q in queries
+        ]
+    )
+    assert recall > 0.9
+
+
+def test_returns_k_results_and_scores_sorted():
+    embeddings = clustered(num=100)
+    index = IVFIndex.build(embeddings, nlist=50)
+    scores, rows = index.search(embeddings, embeddings[0], k=30, nprobe=1)
+    assert len(rows) == len(set(rows)) == 30
+    assert np.all(np.diff(scores) <= 0)
+
+
+def test_arrays_roundtrip():
+    embeddings = clustered(num=200)
+    index = IVFIndex.build(embeddings)
+    copy = IVFIndex.from_arrays(index.to_arrays())
+    assert np.array_equal(
+        index.search(embeddings, embeddings[3], k=5, nprobe=2)[1],
+        copy.search(embeddings, embeddings[3], k=5, nprobe=2)[1],
+    )
+
+
+def test_update():
+    embeddings = clustered()
+    index = IVFIndex.build(embeddings)
+    # Drop the first 100 rows and add 50 new ones at the end
+    new = np.concatenate([embeddings[100:], clustered(num=50, seed=2)])
+    kept = np.concatenate([np.arange(100, len(embeddings)), np.full(50, -1)])
+    updated = index.update(new, kept)
+
+    assert updated.offsets[-1] == len(new)
+    assert sorted(updated.order.tolist()) == list(range(len(new)))
+    assert np.allclose(updated.norms, np.linalg.norm(new, axis=1))
+    query = new[-1] + 0.05
+    _, rows = updated.search(new, query, k=10, nprobe=updated.nlist)
+    assert rows.tolist() == exact(new, query, 10).tolist()
@@ -0,0 +1,64 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+import requests
+
+import sentier_glossary as g
+
+
+def make_api(handler) -> g.AsyncGlossaryAPI:
+    api = g.AsyncGlossaryAPI(language_code="pt", max_concurrency=2)
+    api._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return api
+
+
+def test_async_concepts_gather():
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        return httpx.Response(200, json={"iri": request.url.params["concept_iri"]})
+
+    async def run():
+        async with make_api(handler) as api:
+            return await asyncio.gather(*(api.concept(f"http://example.com/{i}") for i in range(5)))
+
+    results = asyncio.run(run())
+    assert [obj["iri"] for obj in results] == [f"http://example.com/{i}" for i in range(5)]
+    assert all(request.url.params["lang"] == "pt" for request in seen)
+    assert all(request.url.path == "/latest/concept" for request in seen)
+
+
+def test_async_concepts_for_scheme_enum():
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json=[{"iri": request.url.params["concept_scheme_iri"]}])
+
+    async def run():
+        async with make_api(handler) as api:
+            return await api.concepts_for_scheme(g.CommonSchemes.nace21)
+
+    assert asyncio.run(run()) == [{"iri": g.CommonSchemes.nace21.value}]
+
+
+@patch("asyncio.sleep", new_callable=AsyncMock)
+def test_async_requests_exception(sleep: AsyncMock):
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        return httpx.Response(500, json={"detail": "boom"})
+
+    async def run():
+        async with make_api(handler) as api:
+            await api.search("coconut")
+
+    with pytest.raises(requests.exceptions.RequestException) as e:
+        asyncio.run(run())
+    assert len(seen) == 4
+    assert sleep.await_count == 3
+
+    assert "Error fetching data" in str(e.value)
+    assert "HTTP 500" in str(e.value)
+    assert "boom" in str(e.value)
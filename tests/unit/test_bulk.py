@@ -0,0 +1,98 @@
+import json
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+import sentier_glossary as g
+from sentier_glossary.cli import main
+
+SCHEME = g.CommonSchemes.nace21.value
+TEXTS = ["corn", "wheat", "", "common wheat", "corn", "maize", "wheat"]
+
+
+@pytest.fixture
+def input_csv(tmp_path):
+    path = tmp_path / "input.csv"
+    pd.DataFrame({"id": [f"x{i}" for i in range(len(TEXTS))], "text": TEXTS}).to_csv(
+        path, index=False
+    )
+    return path
+
+
+def test_map_file(api, input_csv, tmp_path, fake_embedder):
+    output = tmp_path / "output.csv"
+    summary = g.map_file(api, input_csv, output, "text", SCHEME, keep=["id"], chunk_size=5)
+    assert summary["rows"] == len(TEXTS)
+    df = pd.read_csv(output, keep_default_na=False)
+    assert df.columns.tolist() == ["row", "id", "query", "rank", *g.main.DATAFRAME_COLUMNS]
+    # The empty text has no result
+    assert df["row"].tolist() == [0, 1, 3, 4, 5, 6]
+    assert df["id"].tolist() == ["x0", "x1", "x3", "x4", "x5", "x6"]
+    assert df["iri"].tolist()[:2] == [f"{SCHEME}/2", f"{SCHEME}/1"]
+    assert (df["rank"] == 0).all()
+    # Repeated texts are encoded once, within a chunk and across chunks with the query cache
+    assert sum(fake_embedder.calls) == 4
+    assert not (tmp_path / "output.csv.checkpoint.json").exists()
+    with pytest.raises(FileExistsError):
+        g.map_file(api, input_csv, output, "text", SCHEME)
+
+
+def test_map_file_resume(api, input_csv, tmp_path):
+    expected = tmp_path / "expected.csv"
+    g.map_file(api, input_csv, expected, "text", SCHEME, num_results=2, chunk_size=2)
+
+    def interrupt(stats):
+        if stats["rows"] == 4:
+            raise KeyboardInterrupt
+
+    output = tmp_path / "output.csv"
+    with pytest.raises(KeyboardInterrupt):
+        g.map_file(
+            api, input_csv, output, "text", SCHEME, num_results=2, chunk_size=2, progress=interrupt
+        )
+    checkpoint = json.loads((tmp_path / "output.csv.checkpoint.json").read_text())
+    assert checkpoint["rows"] == 4
+    # A chunk written after the last checkpoint is discarded on resume
+    with open(output, "a") as f:
+        f.write("partial,row\n")
+    with pytest.raises(ValueError):
+        g.map_file(api, input_csv, output, "text", SCHEME, num_results=3, chunk_size=2)
+
+    stats = []
+    summary = g.map_file(
+        api, input_csv, output, "text", SCHEME, num_results=2, chunk_size=3, progress=stats.append
+    )
+    assert summary["resumed"] == 4
+    assert [obj["rows"] for obj in stats] == [7]
+    assert stats[0]["total_rows"] == len(TEXTS)
+    assert output.read_text() == expected.read_text()
+
+
+def test_map_file_parquet(api, input_csv, tmp_path):
+    pytest.importorskip("pyarrow")
+    input_parquet = tmp_path / "input.parquet"
+    pd.read_csv(input_csv, keep_default_na=False).to_parquet(input_parquet, row_group_size=2)
+    g.map_file(api, input_csv, tmp_path / "expected.csv", "text", SCHEME)
+    output = tmp_path / "output.parquet"
+    g.map_file(api, input_parquet, output, "text", SCHEME, chunk_size=3)
+    expected = pd.read_csv(tmp_path / "expected.csv", keep_default_na=False)
+    assert pd.read_parquet(output)["iri"].tolist() == expected["iri"].tolist()
+
+
+def test_format_progress():
+    stats = {"rows": 120_000, "total_rows": 2_000_000, "rows_per_second": 1234.4, "eta_s": 1523}
+    assert g.bulk.format_progress(stats) == (
+        "120,000/2,000,000 rows (6%), 1,234 rows/s, ETA 0:25:23"
+    )
+
+
+def test_cli_map(api, input_csv, tmp_path, capsys):
+    output = tmp_path / "output.tsv"
+    with patch("sentier_glossary.cli.make_api", return_value=api):
+        assert (
+            main(["map", str(input_csv), str(output), "--column", "text", "--scheme", "nace21"])
+            == 0
+        )
+    assert "Mapped 7 rows to 6 results" in capsys.readouterr().err
+    assert pd.read_csv(output, sep="\t")["iri"].tolist()[0] == f"{SCHEME}/2"
@@ -0,0 +1,52 @@
+import numpy as np
+
+from sentier_glossary.catalogue import Catalogue
+
+
+def make_catalogue() -> Catalogue:
+    return Catalogue.from_concepts(
+        [
+            {"iri": "http://example.com/1", "prefLabel": "Wheat", "altLabel": "Cereal"},
+            {"iri": "http://example.com/2", "prefLabel": "Maize", "altLabel": "Cereal"},
+            {"iri": "http://example.com/3", "prefLabel": "Wheat", "scopeNote": "Durum"},
+            {"iri": "http://example.com/1", "prefLabel": "Duplicate"},
+        ]
+    )
+
+
+def test_rows():
+    catalogue = make_catalogue()
+    assert catalogue.labels == ["Wheat", "Cereal", "Maize", "Durum"]
+    assert catalogue.offsets.tolist() == [0, 2, 4, 5, 6]
+    assert catalogue.concept_ids.tolist() == [0, 2, 0, 1, 1, 2]
+    assert catalogue.num_rows == 4
+
+
+def test_mapping():
+    catalogue = make_catalogue()
+    assert len(catalogue) == 3
+    assert list(catalogue) == [f"http://example.com/{i}" for i in (1, 2, 3)]
+    assert catalogue["http://example.com/1"]["prefLabel"] == "Wheat"
+    assert "http://example.com/4" not in catalogue
+    assert catalogue.get("http://example.com/4", {}) == {}
+
+
+def test_row_iris():
+    catalogue = make_catalogue()
+    assert catalogue.row_iris([2, 0]) == [
+        "http://example.com/2",
+        "http://example.com/1",
+        "http://example.com/3",
+    ]
+    assert catalogue.row_iris(np.array([1, 3, 0])) == [
+        "http://example.com/1",
+        "http://example.com/2",
+        "http://example.com/3",
+    ]
+    assert catalogue.row_iris([]) == []
+
+
+def test_empty():
+    catalogue = Catalogue.from_concepts([])
+    assert catalogue.num_rows == 0 and len(catalogue) == 0
+    assert catalogue.offsets.tolist() == [0]
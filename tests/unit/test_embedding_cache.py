@@ -0,0 +1,56 @@
+from unittest.mock import Mock, patch
+
+import numpy as np
+
+import sentier_glossary as g
+from sentier_glossary.embedding_cache import EmbeddingCache
+from sentier_glossary.settings import Settings
+
+
+def test_key_depends_on_inputs():
+    base = EmbeddingCache.key("model", "http://example.com/scheme", "en", ["a", "b"])
+    assert base == EmbeddingCache.key("model", "http://example.com/scheme", "en", ["a", "b"])
+    assert base != EmbeddingCache.key("other", "http://example.com/scheme", "en", ["a", "b"])
+    assert base != EmbeddingCache.key("model", "http://example.com/other", "en", ["a", "b"])
+    assert base != EmbeddingCache.key("model", "http://example.com/scheme", "fr", ["a", "b"])
+    assert base != EmbeddingCache.key("model", "http://example.com/scheme", "en", ["ab"])
+
+
+def test_save_load_roundtrip(tmp_path):
+    cache = EmbeddingCache(tmp_path / "cache")
+    assert not cache.directory.exists()
+    assert cache.load("missing") is None
+
+    array = np.arange(12, dtype=np.float32).reshape(3, 4)
+    cache.save("key", array)
+    loaded = cache.load("key")
+    assert isinstance(loaded, np.memmap)
+    assert np.array_equal(loaded, array)
+    assert not list(cache.directory.glob("*.tmp"))
+
+
+def test_remove(tmp_path):
+    cache = EmbeddingCache(tmp_path)
+    cache.save("key", np.ones((2, 3), dtype=np.float32))
+    cache.save_arrays("key", "ivf", {"centroids": np.zeros(3)})
+    cache.save("other", np.ones((2, 3), dtype=np.float32))
+    cache.remove("key")
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["other.npy"]
+
+    # Files which can't be deleted yet, like mapped files on Windows, are left alone
+    with patch("pathlib.Path.unlink", side_effect=PermissionError):
+        cache.remove("other")
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["other.npy"]
+
+
+def test_encode_corpus_uses_cache(tmp_path):
+    api = g.GlossaryAPI(cfg=Settings(embedding_cache_dir=tmp_path), language_code="en")
+    api._model_id = "model"
+    api._embedder = Mock(device="cpu")
+    api._embedder.encode.return_value = np.ones((2, 3), dtype=np.float32)
+
+    first, key = api._encode_corpus("http://example.com/scheme", ["a", "b"], "en")
+    second, _ = api._encode_corpus("http://example.com/scheme", ["a", "b"], "en")
+    assert api._embedder.encode.call_count == 1
+    assert first.shape == second.shape == (2, 3)
+    assert key == EmbeddingCache.key("model", "http://example.com/scheme", "en", ["a", "b"])
@@ -0,0 +1,109 @@
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+
+import sentier_glossary as g
+from sentier_glossary.events import Event, Events, OpenTelemetryExporter, StatsCollector
+
+
+def test_span_and_count():
+    events, seen = Events(), []
+    events.subscribe(seen.append)
+    with events.span("encode", queries=2) as attributes:
+        attributes["rows"] = 10
+    events.count("cache.hit", endpoint="concept")
+
+    assert [event.name for event in seen] == ["encode", "cache.hit"]
+    assert seen[0].attributes == {"queries": 2, "rows": 10}
+    assert seen[0].duration >= 0
+    assert seen[1].duration == 0.0
+
+
+def test_span_records_errors():
+    events, seen = Events(), []
+    events.subscribe(seen.append)
+    with pytest.raises(KeyError):
+        with events.span("topk"):
+            raise KeyError
+    assert seen[0].attributes == {"error": "KeyError"}
+
+
+def test_unsubscribe_and_broken_subscriber():
+    events, seen = Events(), []
+    broken = events.subscribe(Mock(side_effect=RuntimeError))
+    events.subscribe(seen.append)
+    with pytest.warns(UserWarning, match="RuntimeError"):
+        events.count("a")
+    assert len(seen) == 1
+
+    events.unsubscribe(seen.append)
+    events.unsubscribe(broken)
+    assert not events.active
+    with events.span("b"):
+        pass
+    assert len(seen) == 1
+
+
+def test_stats_collector():
+    stats = StatsCollector(keep_events=2)
+    stats(Event("http.request", start=0, duration=0.5, attributes={"bytes": 100, "status": 200}))
+    stats(Event("http.request", start=1, duration=1.5, attributes={"bytes": 50, "error": "X"}))
+    stats(Event("cache.hit", start=2))
+
+    summary = stats.summary()
+    assert summary["http.request"] == {
+        "count": 2,
+        "total_s": 2.0,
+        "max_s": 1.5,
+        "mean_s": 1.0,
+        "bytes": 150,
+        "errors": 1,
+    }
+    assert summary["cache.hit"]["count"] == 1
+    assert [event.start for event in stats.events] == [1, 2]
+
+    stats.reset()
+    assert stats.summary() == {} and stats.events == []
+
+
+def test_opentelemetry_exporter():
+    tracer = Mock()
+    OpenTelemetryExporter(tracer)(
+        Event("encode", start=1.0, duration=0.25, attributes={"queries": 1, "obj": object()})
+    )
+    tracer.start_span.assert_called_once_with(
+        "sentier_glossary.encode", start_time=1_000_000_000, attributes={"queries": 1}
+    )
+    tracer.start_span.return_value.end.assert_called_once_with(end_time=1_250_000_000)
+
+
+@patch("requests.Session.get")
+def test_api_request_events(r: Mock):
+    r.return_value.status_code = 200
+    r.return_value.content = b'{"iri": "http://example.com/1"}'
+    r.return_value.json.side_effect = lambda: {"iri": "http://example.com/1"}
+    api = g.GlossaryAPI(language_code="en")
+    stats = api.events.subscribe(StatsCollector())
+
+    api.concept("http://example.com/1")
+    api.concept("http://example.com/1")
+
+    summary = stats.summary()
+    assert summary["http.request"]["count"] == 1
+    assert summary["http.request"]["bytes"] == len(r.return_value.content)
+    assert summary["cache.miss"]["count"] == 1
+    assert summary["cache.hit"]["count"] == 1
+
+
+@patch("requests.Session.get")
+def test_api_request_error_event(r: Mock):
+    r.return_value.status_code = 404
+    r.return_value.content = b"{}"
+    r.return_value.raise_for_status.side_effect = requests.exceptions.HTTPError
+    api = g.GlossaryAPI(language_code="en")
+    stats = api.events.subscribe(StatsCollector())
+
+    with pytest.raises(requests.exceptions.RequestException):
+        api.schemes()
+    assert stats.summary()["http.request"]["errors"] == 1
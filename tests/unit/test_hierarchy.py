@@ -0,0 +1,63 @@
+from sentier_glossary.catalogue import Catalogue
+from sentier_glossary.hierarchy import Hierarchy
+
+BASE = "http://example.com/"
+
+
+def concept(code: str, parent: str | None = None, children: tuple[str, ...] = ()) -> dict:
+    """A concept as returned by `concept()`, listing its broader and narrower relations."""
+    edges = ([(code, parent)] if parent else []) + [(child, code) for child in children]
+    return {
+        "iri": BASE + code,
+        "prefLabel": code,
+        "relations": [
+            {"type": "broader", "source_concept_iri": BASE + a, "target_concept_iri": BASE + b}
+            for a, b in edges
+        ],
+    }
+
+
+def make_hierarchy() -> Hierarchy:
+    # 57 > 5701 > 570110, 570190; 57 > 5702; 58 (top level, broader outside the scheme)
+    concepts = [
+        concept("5701", "57", ("570110", "570190")),
+        concept("57", None, ("5701", "5702")),
+        concept("570110", "5701"),
+        concept("5702", "57"),
+        concept("570190", "5701"),
+        concept("58", "elsewhere"),
+    ]
+    catalogue = Catalogue.from_concepts(concepts)
+    return Hierarchy.build(catalogue, {obj["iri"]: obj for obj in concepts})
+
+
+def test_ancestors():
+    hierarchy = make_hierarchy()
+    assert hierarchy.parent(BASE + "570110") == BASE + "5701"
+    assert hierarchy.parent(BASE + "57") is None
+    assert hierarchy.ancestors(BASE + "570110") == [BASE + "5701", BASE + "57"]
+    assert hierarchy.path(BASE + "570110") == [BASE + c for c in ("57", "5701", "570110")]
+    assert hierarchy.depth(BASE + "570110") == 2
+    assert hierarchy.roots() == [BASE + "57", BASE + "58"]
+
+
+def test_subtree():
+    hierarchy = make_hierarchy()
+    assert hierarchy.children(BASE + "57") == [BASE + "5701", BASE + "5702"]
+    assert hierarchy.descendants(BASE + "57") == [
+        BASE + c for c in ("5701", "570110", "570190", "5702")
+    ]
+    assert hierarchy.descendants(BASE + "5702") == []
+    assert hierarchy.is_descendant(BASE + "570190", BASE + "57")
+    assert not hierarchy.is_descendant(BASE + "57", BASE + "57")
+    assert not hierarchy.is_descendant(BASE + "5702", BASE + "5701")
+
+
+def test_cycle():
+    catalogue = Catalogue.from_concepts([{"iri": BASE + str(i)} for i in range(3)])
+    hierarchy = Hierarchy(catalogue, [1, 0, 1])
+    # The first concept of the cycle becomes top level, so ancestors terminate
+    assert hierarchy.roots() == [BASE + "0"]
+    assert hierarchy.ancestors(BASE + "2") == [BASE + "1", BASE + "0"]
+    assert hierarchy.descendants(BASE + "0") == [BASE + "1", BASE + "2"]
+    assert hierarchy.children(BASE + "1") == [BASE + "2"]
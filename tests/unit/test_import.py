@@ -0,0 +1,30 @@
+import json
+import subprocess
+import sys
+
+HEAVY_MODULES = ["pandas", "sentence_transformers", "torch"]
+
+SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import sentier_glossary
+api = sentier_glossary.GlossaryAPI(language_code="en")
+elapsed = time.perf_counter() - start
+print(json.dumps({"seconds": elapsed, "modules": sorted(sys.modules)}))
+"""
+
+
+def test_import_is_lightweight():
+    output = subprocess.run(
+        [sys.executable, "-c", SCRIPT], capture_output=True, text=True, check=True
+    ).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    assert not set(HEAVY_MODULES).intersection(result["modules"])
+    # Generous bound for slow CI runners; the module check above is the main guard
+    assert result["seconds"] < 5
+
+
+def test_import_without_unix_sockets():
+    # As on Windows
+    script = "import socket; del socket.AF_UNIX; import sentier_glossary as g; g.GlossaryServer"
+    subprocess.run([sys.executable, "-c", script], check=True)
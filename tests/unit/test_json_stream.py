@@ -0,0 +1,55 @@
+import io
+import json
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+
+import sentier_glossary as g
+from sentier_glossary.json_stream import iter_json_array
+
+DATA = [
+    {"iri": "http://example.com/1", "prefLabel": 'Blé ⧺ "tendre"', "relations": []},
+    {"iri": "http://example.com/2", "notation": 12.5, "altLabel": None},
+    123,
+    "]",
+    [],
+]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 1000])
+def test_iter_json_array_chunked(size):
+    text = json.dumps(DATA, ensure_ascii=False, indent=1)
+    chunks = (text[i : i + size] for i in range(0, len(text), size))
+    assert list(iter_json_array(chunks)) == DATA
+
+
+def test_iter_json_array_empty():
+    assert list(iter_json_array([" [ ", " ] "])) == []
+
+
+def test_iter_json_array_invalid():
+    with pytest.raises(ValueError):
+        list(iter_json_array(['{"iri": 1}']))
+    with pytest.raises(ValueError):
+        list(iter_json_array(["[1, 2"]))
+    with pytest.raises(ValueError):
+        list(iter_json_array(["[1 2]"]))
+
+
+@patch("requests.Session.get")
+def test_iter_concepts_for_scheme(r: Mock):
+    response = requests.Response()
+    response.status_code = 200
+    response.encoding = "utf-8"
+    response.raw = io.BytesIO(json.dumps(DATA[:2], ensure_ascii=False).encode("utf-8"))
+    r.return_value = response
+
+    api = g.GlossaryAPI(language_code="en")
+    concepts = api.iter_concepts_for_scheme(g.CommonSchemes.isic4)
+    assert list(concepts) == DATA[:2]
+    assert r.call_args.kwargs["stream"]
+    assert r.call_args.kwargs["params"] == {
+        "lang": "en",
+        "concept_scheme_iri": g.CommonSchemes.isic4.value,
+    }
@@ -0,0 +1,47 @@
+from sentier_glossary.lexical import LexicalIndex, reciprocal_rank_fusion, trigrams, words
+
+CONCEPTS = [
+    {"notation": "5702 20 00", "prefLabel": "Floor coverings of coconut fibres (coir)"},
+    {"notation": "5702 31 80", "prefLabel": "Carpets of wool, woven"},
+    {"notation": "A.01.1", "prefLabel": "Growing of non-perennial crops"},
+    {"notation": "A.01.2", "prefLabel": "Growing of perennial crops", "altLabel": "Orchards"},
+]
+
+
+def test_words():
+    assert words("Carpets of wool") == ["carpets", "of", "wool"]
+    assert words("5702 20 00") == ["5702", "20", "00", "57022000"]
+    assert words("A.01.1") == ["a", "01", "1", "a011"]
+    assert words("Growing of rice 01") == ["growing", "of", "rice", "01"]
+
+
+def test_trigrams():
+    assert trigrams(["wool"]) == ["# wo", "#woo", "#ool", "#ol "]
+
+
+def test_search_codes():
+    index = LexicalIndex.build(CONCEPTS)
+    assert index.search("5702 20 00", k=1).tolist() == [0]
+    assert index.search("57022000", k=1).tolist() == [0]
+    assert index.search("a.01.2", k=1).tolist() == [3]
+
+
+def test_search_words():
+    index = LexicalIndex.build(CONCEPTS)
+    assert index.search("orchards", k=10).tolist() == [3]
+    assert index.search("coconut", k=10).tolist() == [0]
+    # Misspelt, only the trigrams match
+    assert index.search("carpts", k=1).tolist() == [1]
+    assert set(index.search("perennial crops", k=2).tolist()) == {2, 3}
+
+
+def test_search_no_match():
+    index = LexicalIndex.build(CONCEPTS)
+    assert index.search("zzzz", k=10).tolist() == []
+    assert index.search("wool", k=0).tolist() == []
+    assert LexicalIndex.build([]).search("wool", k=10).tolist() == []
+
+
+def test_reciprocal_rank_fusion():
+    assert reciprocal_rank_fusion([["a", "b", "c"], ["c", "b"]]) == ["c", "b", "a"]
+    assert reciprocal_rank_fusion([["a", "b"], []]) == ["a", "b"]
@@ -6,14 +6,14 @@ import pytest
 import sentier_glossary as g
 
 
-@patch("requests.get")
+@patch("requests.Session.get")
 @patch("locale.getlocale")
 def test_lang(loc: Mock, r: Mock):
     loc.return_value = ("pt_PT", "UTF-8")
     api = g.GlossaryAPI()
     assert api.language_code == "pt"
     api.schemes()
-    r.assert_has_calls([call(ANY, params={"lang": "pt"}, timeout=10)])
+    r.assert_has_calls([call(ANY, params={"lang": "pt"}, timeout=10, stream=False)])
 
 
 @patch("locale.getlocale")
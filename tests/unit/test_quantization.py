@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from sentier_glossary.quantization import QuantizedEmbeddings
+
+
+def clustered(num=2000, dim=64, clusters=20, seed=1):
+    rng = np.random.default_rng(seed)
+    centres = rng.normal(size=(clusters, dim))
+    points = centres[rng.integers(clusters, size=num)] + 0.3 * rng.normal(size=(num, dim))
+    return (points * rng.uniform(0.5, 2, size=(num, 1))).astype(np.float32)
+
+
+def exact(embeddings, queries, k):
+    scores = (queries @ embeddings.T) / np.linalg.norm(embeddings, axis=1)
+    return np.argsort(-scores, axis=1)[:, :k]
+
+
+@pytest.mark.parametrize("precision,ratio", [("float16", 2), ("int8", 4), ("binary", 32)])
+def test_memory(precision, ratio):
+    embeddings = clustered()
+    quantized = QuantizedEmbeddings.quantize(embeddings, precision)
+    assert quantized.data.nbytes * ratio == embeddings.nbytes
+
+
+# Binary codes are coarse, so they need a longer shortlist
+@pytest.mark.parametrize("precision,rescore", [("float16", 1), ("int8", 2), ("binary", 10)])
+def test_recall(precision, rescore):
+    embeddings = clustered()
+    quantized = QuantizedEmbeddings.quantize(embeddings, precision)
+    queries = embeddings[:50] + 0.05
+    rows = quantized.search(embeddings, queries, k=10, rescore=rescore)
+    expected = exact(embeddings, queries, 10)
+    recall = np.mean([len(set(a) & set(b)) / 10 for a, b in zip(rows, expected)])
+    assert recall >= 0.9
+
+
+def test_full_rescore_is_exact():
+    embeddings = clustered(num=200)
+    quantized = QuantizedEmbeddings.quantize(embeddings, "binary")
+    queries = embeddings[:5] + 0.05
+    rows = quantized.search(embeddings, queries, k=10, rescore=20)
+    assert rows.tolist() == exact(embeddings, queries, 10).tolist()
+
+
+def test_small_corpus():
+    embeddings = clustered(num=3)
+    rows = QuantizedEmbeddings.quantize(embeddings, "int8").search(embeddings, embeddings[0], k=10)
+    assert rows.shape == (1, 3)
+    assert rows[0, 0] == 0
+
+
+def test_unknown_precision():
+    with pytest.raises(ValueError):
+        QuantizedEmbeddings.quantize(clustered(num=10), "int4")
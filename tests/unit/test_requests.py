@@ -6,15 +6,16 @@ import requests
 import sentier_glossary as g
 
 
-@patch("requests.get")
+@patch("requests.Session.get")
 def test_requests(mock: Mock):
     api = g.GlossaryAPI()
     s = api.concepts_for_scheme("isic4")
     assert mock.called
 
 
-@patch("requests.get")
-def test_requests_exception(r: Mock):
+@patch("sentier_glossary.main.time.sleep")
+@patch("requests.Session.get")
+def test_requests_exception(r: Mock, sleep: Mock):
     r.return_value.raise_for_status.side_effect = requests.exceptions.RequestException()
     r.return_value.status_code = 500
 
@@ -24,3 +25,6 @@ def test_requests_exception(r: Mock):
 
     assert "Error fetching data" in str(e.value)
     assert "HTTP 500" in str(e.value)
+    # Server errors are retried first
+    assert r.call_count == 4
+    assert sleep.call_count == 3
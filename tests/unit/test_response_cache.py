@@ -0,0 +1,96 @@
+from unittest.mock import Mock, patch
+
+import pytest
+
+import sentier_glossary as g
+from sentier_glossary.response_cache import MemoryCache, ResponseCache, SQLiteCache
+from sentier_glossary.settings import Settings
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def cache(request, tmp_path):
+    if request.param == "memory":
+        return MemoryCache(maxsize=2, ttl=60)
+    return SQLiteCache(tmp_path / "cache.sqlite", maxsize=2, ttl=60)
+
+
+def test_key_includes_params():
+    url = "https://example.com/latest/concept"
+    assert ResponseCache.key(url, {"lang": "en", "a": 1}) == ResponseCache.key(
+        url, {"a": 1, "lang": "en"}
+    )
+    assert ResponseCache.key(url, {"lang": "en"}) != ResponseCache.key(url, {"lang": "fr"})
+
+
+def test_lru_eviction(cache):
+    cache.set("a", {"v": 1})
+    cache.set("b", {"v": 2})
+    assert cache.get("a") == {"v": 1}
+    cache.set("c", {"v": 3})
+    assert cache.get("b") is None
+    assert cache.get("a") == {"v": 1}
+    assert cache.get("c") == {"v": 3}
+
+
+def test_ttl_expiry(cache):
+    with patch("sentier_glossary.response_cache.time.time", return_value=1000.0):
+        cache.set("a", [1, 2])
+    with patch("sentier_glossary.response_cache.time.time", return_value=1059.0):
+        assert cache.get("a") == [1, 2]
+    with patch("sentier_glossary.response_cache.time.time", return_value=1061.0):
+        assert cache.get("a") is None
+
+
+def test_values_are_copies(cache):
+    value = {"broader": []}
+    cache.set("a", value)
+    value["broader"].append("mutated")
+    cache.get("a")["broader"].append("mutated")
+    assert cache.get("a") == {"broader": []}
+
+
+def test_sqlite_persists(tmp_path):
+    SQLiteCache(tmp_path / "cache.sqlite").set("a", {"v": 1})
+    assert SQLiteCache(tmp_path / "cache.sqlite").get("a") == {"v": 1}
+
+
+def test_sqlite_evicts_in_batches(tmp_path):
+    cache = SQLiteCache(tmp_path / "cache.sqlite", maxsize=20)
+    for idx in range(21):
+        cache.set(str(idx), idx)
+    # The three least recently used, so two more entries fit before evicting again
+    assert len(cache) == 18
+    assert [cache.get(str(idx)) for idx in range(4)] == [None, None, None, 3]
+    cache.set("21", 21)
+    cache.set("22", 22)
+    assert len(cache) == 20
+
+
+@patch("requests.Session.get")
+def test_api_uses_cache(r: Mock):
+    r.return_value.json.side_effect = lambda: {"iri": "http://example.com/1"}
+    api = g.GlossaryAPI(language_code="en")
+    assert api.concept("http://example.com/1") == api.concept("http://example.com/1")
+    assert r.call_count == 1
+
+    api.set_language_code("fr")
+    api.concept("http://example.com/1")
+    assert r.call_count == 2
+
+
+@patch("requests.Session.get")
+def test_api_cache_disabled(r: Mock):
+    r.return_value.json.side_effect = lambda: {}
+    api = g.GlossaryAPI(cfg=Settings(cache_maxsize=0), language_code="en")
+    api.schemes()
+    api.schemes()
+    assert r.call_count == 2
+
+
+@patch("requests.Session.get")
+def test_api_catalogues_not_cached(r: Mock):
+    r.return_value.json.side_effect = lambda: []
+    api = g.GlossaryAPI(language_code="en")
+    api.concepts_for_scheme(g.CommonSchemes.nace21)
+    api.concepts_for_scheme(g.CommonSchemes.nace21)
+    assert r.call_count == 2
@@ -0,0 +1,111 @@
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
+
+import httpx
+import pytest
+import requests
+
+import sentier_glossary as g
+from sentier_glossary.rate_limit import TokenBucket
+from sentier_glossary.settings import Settings
+
+
+def response(status: int, headers: dict | None = None) -> Mock:
+    obj = Mock(status_code=status, headers=headers or {}, content=b"{}")
+    obj.json.return_value = {"status": status}
+    return obj
+
+
+@patch("sentier_glossary.main.time.sleep")
+@patch("requests.Session.get")
+def test_retry_after(r: Mock, sleep: Mock):
+    r.side_effect = [response(503, {"Retry-After": "2"}), response(502), response(200)]
+    api = g.GlossaryAPI(language_code="en")
+    assert api.schemes() == {"status": 200}
+    assert r.call_count == 3
+    assert sleep.call_args_list[0].args == (2.0,)
+    assert 0.5 <= sleep.call_args_list[1].args[0] <= 1.5
+
+
+@patch("sentier_glossary.main.time.sleep")
+@patch("requests.Session.get")
+def test_retry_connection_error(r: Mock, sleep: Mock):
+    r.side_effect = [requests.exceptions.ConnectionError(), response(200)]
+    api = g.GlossaryAPI(language_code="en")
+    assert api.schemes() == {"status": 200}
+
+    r.side_effect = requests.exceptions.ConnectionError()
+    api = g.GlossaryAPI(cfg=Settings(retries=1), language_code="en")
+    with pytest.raises(requests.exceptions.ConnectionError):
+        api.schemes()
+
+
+@patch("sentier_glossary.main.time.sleep")
+@patch("requests.Session.get")
+def test_no_retry_on_client_error(r: Mock, sleep: Mock):
+    r.return_value = response(404)
+    r.return_value.raise_for_status.side_effect = requests.exceptions.HTTPError()
+    api = g.GlossaryAPI(language_code="en")
+    with pytest.raises(requests.exceptions.RequestException):
+        api.concept("http://example.com/1")
+    assert r.call_count == 1
+    sleep.assert_not_called()
+
+
+@patch("requests.Session.get")
+def test_endpoint_timeouts(r: Mock):
+    r.return_value = response(200)
+    api = g.GlossaryAPI(cfg=Settings(endpoint_timeouts={"search": 30}), language_code="en")
+    api.search("wheat")
+    api.schemes()
+    assert [call.kwargs["timeout"] for call in r.call_args_list] == [30, 10]
+
+
+def test_backoff():
+    api = g.GlossaryAPI(cfg=Settings(backoff_jitter=0, backoff_max=3), language_code="en")
+    assert [api._backoff(attempt) for attempt in range(4)] == [0.5, 1, 2, 3]
+    assert api._backoff(0, "1.5") == 1.5
+    assert api._backoff(0, "3600") == 3
+    assert api._backoff(0, "Wed, 21 Oct 2015 07:28:00 GMT") == 0
+    assert api._backoff(1, "soon") == 1
+
+
+def test_token_bucket():
+    bucket = TokenBucket(rate=10, burst=2)
+    with patch("sentier_glossary.rate_limit.time.monotonic", return_value=100.0):
+        bucket._updated = 100.0
+        assert [bucket.reserve() for _ in range(4)] == [0, 0, 0.1, 0.2]
+    with patch("sentier_glossary.rate_limit.time.monotonic", return_value=101.0):
+        # Refilled, but never beyond the burst size
+        assert [bucket.reserve() for _ in range(3)] == [0, 0, 0.1]
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+
+@patch("sentier_glossary.rate_limit.time.sleep")
+@patch("requests.Session.get")
+def test_rate_limit(r: Mock, sleep: Mock):
+    r.return_value = response(200)
+    api = g.GlossaryAPI(
+        cfg=Settings(rate_limit=1, rate_limit_burst=1, cache_maxsize=0), language_code="en"
+    )
+    api.schemes()
+    api.schemes()
+    assert sleep.call_count == 1
+
+
+@patch("asyncio.sleep", new_callable=AsyncMock)
+def test_async_retry(sleep: AsyncMock):
+    statuses = [429, 200]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(statuses.pop(0), headers={"Retry-After": "1"}, json=[])
+
+    async def run():
+        api = g.AsyncGlossaryAPI(language_code="en")
+        api._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        async with api:
+            return await api.schemes()
+
+    assert asyncio.run(run()) == []
+    sleep.assert_awaited_once_with(1.0)
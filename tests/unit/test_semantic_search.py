@@ -0,0 +1,501 @@
+import json
+import threading
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pytest
+import torch
+
+import sentier_glossary as g
+from sentier_glossary.settings import Settings
+
+
+def test_setup_semantic_search_selected_schemes(fake_embedder, fake_glossary):
+    concepts, _ = fake_glossary
+    api = g.GlossaryAPI(cfg=Settings(embedding_cache_dir=None), language_code="en")
+    api.setup_semantic_search(
+        schemes=[g.CommonSchemes.nace21, g.CommonSchemes.isic4.value], max_workers=2
+    )
+
+    assert concepts.call_count == 2
+    assert list(api._indexes) == [
+        ("en", g.CommonSchemes.nace21.value),
+        ("en", g.CommonSchemes.isic4.value),
+    ]
+    index = api._indexes[("en", g.CommonSchemes.nace21.value)].result()
+    assert set(index.catalogue.labels) == {"Wheat", "Common wheat", "Maize", "Corn"}
+    assert index.embeddings.shape == (4, 32)
+
+
+@patch("sentence_transformers.SentenceTransformer")
+def test_setup_semantic_search_is_lazy(model: Mock, fake_glossary):
+    concepts, _ = fake_glossary
+    api = g.GlossaryAPI(cfg=Settings(embedding_cache_dir=None), language_code="en")
+    api.setup_semantic_search()
+    assert not concepts.called
+    assert not model.called
+    assert not api._indexes
+
+
+def test_semantic_search_loads_only_its_scope(fake_embedder, fake_glossary):
+    concepts, _ = fake_glossary
+    api = g.GlossaryAPI(cfg=Settings(embedding_cache_dir=None), language_code="en")
+    api.semantic_search("corn", g.CommonSchemes.nace21)
+    api.semantic_search("wheat", g.CommonSchemes.nace21)
+    assert concepts.call_count == 1
+    assert list(api._indexes) == [("en", g.CommonSchemes.nace21.value)]
+
+
+def test_setup_semantic_search_background(fake_embedder, fake_glossary):
+    concepts, _ = fake_glossary
+    api = g.GlossaryAPI(cfg=Settings(embedding_cache_dir=None), language_code="en")
+    api.setup_semantic_search(schemes=list(g.CommonSchemes), background=True)
+    for cs in g.CommonSchemes:
+        assert api._prepare_scope(cs).scheme_iri == cs.value
+    assert concepts.call_count == len(g.CommonSchemes)
+
+
+def test_setup_semantic_search_background_language(fake_embedder, fake_concepts):
+    started, release = threading.Event(), threading.Event()
+
+    def slow_concepts(scheme_iri, language_code=None):
+        started.set()
+        release.wait(10)
+        return fake_concepts(scheme_iri, language_code)
+
+    api = g.GlossaryAPI(cfg=Settings(embedding_cache_dir=None), language_code="en")
+    schemes = [g.CommonSchemes.nace21, g.CommonSchemes.isic4]
+    with patch(
+        "sentier_glossary.GlossaryAPI.iter_concepts_for_scheme", side_effect=slow_concepts
+    ) as concepts:
+        api.setup_semantic_search(schemes=schemes, max_workers=1, background=True)
+        assert started.wait(10)
+        # Before the second scheme is started
+        api.set_language_code("fr")
+        release.set()
+        for cs in schemes:
+            api._scheme_index(cs.value, "en")
+    assert {call.kwargs["language_code"] for call in concepts.call_args_list} == {"en"}
+    assert sorted(api._indexes) == sorted(("en", cs.value) for cs in schemes)
+
+
+def test_hydrate_deduplicates_and_reuses_catalogue():
+    api = g.GlossaryAPI(cfg=Settings(embedding_cache_dir=None), language_code="en")
+    section = {"iri": "http://example.com/A", "prefLabel": "A - Agriculture"}
+
+    def concept(iri):
+        return {
+            "iri": iri,
+            "prefLabel": iri.rsplit("/", 1)[-1],
+            "relations": [
+                {
+                    "type": "broader",
+                    "source_concept_iri": iri,
+                    "target_concept_iri": "http://example.com/A",
+                },
+                {
+                    "type": "broader",
+                    "source_concept_iri": "http://example.com/x",
+                    "target_concept_iri": iri,
+                },
+            ],
+        }
+
+    with patch("sentier_glossary.GlossaryAPI.concept", side_effect=concept) as mock:
+        results = api._hydrate(
+            ["http://example.com/1", "http://example.com/2", "http://example.com/1"],
+            {section["iri"]: section},
+        )
+
+    assert sorted(c.args[0] for c in mock.call_args_list) == [
+        "http://example.com/1",
+        "http://example.com/2",
+    ]
+    assert [obj["iri"] for obj in results] == ["http://example.com/1", "http://example.com/2"]
+    assert all(obj["broader"] == [section] for obj in results)
+    assert "broader" not in section
+
+
+def test_semantic_search(api):
+    results = api.semantic_search("common wheat", g.CommonSchemes.nace21, min_num_results=1)
+    assert [obj["iri"] for obj in results] == [g.CommonSchemes.nace21.value + "/1"]
+
+    df = api.semantic_search("corn", g.CommonSchemes.nace21, dataframe=True, min_num_results=1)
+    assert df["iri"].tolist() == [g.CommonSchemes.nace21.value + "/2"]
+
+
+def test_semantic_search_ann(api):
+    exact = api.semantic_search("corn", g.CommonSchemes.nace21, min_num_results=2)
+    approximate = api.semantic_search("corn", g.CommonSchemes.nace21, min_num_results=2, nprobe=1)
+    assert exact == approximate
+    assert list(api._embedding_cache.directory.glob("*.ivf.npz"))
+
+
+def test_semantic_search_no_scope(api):
+    results = api.semantic_search("corn", min_num_results=1)
+    assert [obj["scheme_iri"] for obj in results] == [g.CommonSchemes.nace21.value]
+    with pytest.raises(KeyError):
+        api.semantic_search("corn", [])
+
+    empty = g.GlossaryAPI(cfg=Settings(embedding_cache_dir=None), language_code="en")
+    with pytest.raises(KeyError):
+        empty.semantic_search("corn")
+
+
+def test_semantic_search_several_schemes(api):
+    nace, isic = g.CommonSchemes.nace21.value, g.CommonSchemes.isic4.value
+    api._prepare_scope(isic)
+    with (
+        patch.object(api, "_model", wraps=api._model) as model,
+        patch.object(api, "_hydrate", wraps=api._hydrate) as hydrate,
+    ):
+        results = api.semantic_search("corn", [nace, g.CommonSchemes.isic4], min_num_results=2)
+    # One encoding and one hydration for all schemes
+    assert model.call_count == 1
+    assert hydrate.call_count == 1
+    # Both "Corn" labels beat "Maize" in either scheme
+    assert [(obj["iri"], obj["scheme_iri"]) for obj in results] == [
+        (f"{nace}/2", nace),
+        (f"{isic}/2", isic),
+    ]
+
+    df = api.semantic_search("wheat", dataframe=True, min_num_results=2, nprobe=1)
+    assert df["scheme_iri"].tolist() == [nace, isic]
+    df = api.semantic_search_many(["wheet"], min_num_results=1, hybrid=True)
+    assert df["iri"].tolist() == [f"{nace}/1"]
+    lexical = api.lexical_search("corn", None, num_results=2)
+    assert [(obj["iri"], obj["scheme_iri"]) for obj in lexical] == [
+        (f"{nace}/2", nace),
+        (f"{isic}/2", isic),
+    ]
+
+
+def test_semantic_search_many(api):
+    queries = ["corn", "common wheat", "corn"]
+    with patch.object(api, "_hydrate", wraps=api._hydrate) as hydrate:
+        df = api.semantic_search_many(queries, g.CommonSchemes.nace21, min_num_results=1)
+    assert hydrate.call_count == 1
+    assert df.columns.tolist() == [
+        "query_index",
+        "query",
+        "prefLabel",
+        "completeLabel",
+        "broader_iri",
+        "broader_prefLabel",
+        "iri",
+        "scheme_iri",
+    ]
+    assert df["query_index"].tolist() == [0, 1, 2]
+    for index, query in enumerate(queries):
+        expected = api.semantic_search(
+            query, g.CommonSchemes.nace21, dataframe=True, min_num_results=1
+        )
+        assert df[df["query_index"] == index]["iri"].tolist() == expected["iri"].tolist()
+
+
+def test_semantic_search_many_batches(api):
+    df = api.semantic_search_many(
+        ["corn"] * 5, g.CommonSchemes.nace21, min_num_results=1, batch_size=2
+    )
+    assert df["query_index"].tolist() == [0, 1, 2, 3, 4]
+    assert api.semantic_search_many([], g.CommonSchemes.nace21).empty
+
+
+def test_indexes_per_language(fake_embedder, fake_glossary):
+    concepts, _ = fake_glossary
+    with patch("sentence_transformers.SentenceTransformer", side_effect=fake_embedder) as model:
+        api = g.GlossaryAPI(cfg=Settings(embedding_cache_dir=None), language_code="en")
+        api.semantic_search("corn", g.CommonSchemes.nace21)
+        api.set_language_code("fr")
+        api.semantic_search("corn", g.CommonSchemes.nace21)
+        api.set_language_code("en")
+        api.semantic_search("corn", g.CommonSchemes.nace21)
+
+    assert concepts.call_count == 2
+    assert [c.kwargs["language_code"] for c in concepts.call_args_list] == ["en", "fr"]
+    assert model.call_count == 1
+    assert list(api._indexes) == [
+        ("fr", g.CommonSchemes.nace21.value),
+        ("en", g.CommonSchemes.nace21.value),
+    ]
+
+
+def test_indexes_evicted(fake_embedder, fake_glossary):
+    api = g.GlossaryAPI(
+        cfg=Settings(embedding_cache_dir=None, max_scheme_indexes=2), language_code="en"
+    )
+    for cs in [g.CommonSchemes.nace21, g.CommonSchemes.isic4, g.CommonSchemes.nace21]:
+        api._prepare_scope(cs)
+    api._prepare_scope(g.CommonSchemes.cn2024)
+    assert list(api._indexes) == [
+        ("en", g.CommonSchemes.nace21.value),
+        ("en", g.CommonSchemes.cn2024.value),
+    ]
+
+
+def test_indexes_evicted_by_size(fake_embedder, fake_glossary):
+    api = g.GlossaryAPI(cfg=Settings(embedding_cache_dir=None), language_code="en")
+    nbytes = api._prepare_scope(g.CommonSchemes.nace21).nbytes
+    api._cfg.max_scheme_index_bytes = 2 * nbytes
+    api._prepare_scope(g.CommonSchemes.isic4)
+    assert len(api._indexes) == 2
+
+    # Building the lexical index grows isic4 beyond the budget, so nace21 goes
+    api.lexical_search("corn", g.CommonSchemes.isic4)
+    assert list(api._indexes) == [("en", g.CommonSchemes.isic4.value)]
+    # The most recently used index is kept even if it alone is too large
+    api._cfg.max_scheme_index_bytes = 1
+    api._prepare_scope(g.CommonSchemes.cn2024)
+    assert list(api._indexes) == [("en", g.CommonSchemes.cn2024.value)]
+
+
+def test_semantic_search_events(api):
+    stats = api.events.subscribe(g.StatsCollector())
+    api.semantic_search("common wheat", g.CommonSchemes.nace21, min_num_results=1)
+
+    summary = stats.summary()
+    assert {"semantic_search", "encode", "topk", "hydrate"} <= set(summary)
+    assert summary["topk"]["rows"] == 4
+    assert summary["semantic_search"]["total_s"] >= summary["encode"]["total_s"]
+
+
+@pytest.mark.parametrize("precision", ["float16", "int8", "binary"])
+def test_semantic_search_quantized(precision, tmp_path, fake_embedder, fake_glossary):
+    api = g.GlossaryAPI(
+        cfg=Settings(embedding_cache_dir=tmp_path, embedding_precision=precision),
+        language_code="en",
+    )
+    # Quantized search never needs the float32 embeddings on the model device
+    with patch.object(fake_embedder, "device", "meta"):
+        results = api.semantic_search("common wheat", g.CommonSchemes.nace21, min_num_results=1)
+        approximate = api.semantic_search(
+            "corn", g.CommonSchemes.nace21, min_num_results=1, nprobe=1
+        )
+    index = api._prepare_scope(g.CommonSchemes.nace21)
+
+    assert index.quantized.precision == precision
+    assert index.embeddings.device.type == "cpu"
+    assert isinstance(index.host_embeddings, np.memmap)
+    assert [obj["iri"] for obj in results] == [g.CommonSchemes.nace21.value + "/1"]
+    assert [obj["iri"] for obj in approximate] == [g.CommonSchemes.nace21.value + "/2"]
+
+
+def test_lexical_search(api):
+    with patch("sentier_glossary.GlossaryAPI.concept") as concept:
+        results = api.lexical_search("corn", g.CommonSchemes.nace21, num_results=1)
+    assert [obj["iri"] for obj in results] == [g.CommonSchemes.nace21.value + "/2"]
+    concept.assert_not_called()
+
+
+def test_semantic_search_hybrid(api):
+    # Misspelt, so only the lexical ranking knows the answer
+    results = api.semantic_search("wheet", g.CommonSchemes.nace21, min_num_results=1, hybrid=True)
+    assert [obj["iri"] for obj in results] == [g.CommonSchemes.nace21.value + "/1"]
+    df = api.semantic_search_many(["wheet", "maze"], g.CommonSchemes.nace21, 1, hybrid=True)
+    assert df["iri"].tolist() == [g.CommonSchemes.nace21.value + suffix for suffix in ("/1", "/2")]
+
+
+def test_refresh_scheme(api, fake_embedder):
+    scheme = g.CommonSchemes.nace21.value
+    index = api._prepare_scope(scheme)
+    api._ann_index(index)
+    changed = [
+        {"iri": f"{scheme}/1", "prefLabel": "Wheat", "altLabel": "Durum wheat"},
+        {"iri": f"{scheme}/3", "prefLabel": "Oats"},
+    ]
+    with patch("sentier_glossary.GlossaryAPI.iter_concepts_for_scheme", return_value=changed):
+        stats = api.refresh_scheme(g.CommonSchemes.nace21)
+
+    assert stats == {"added": 1, "changed": 1, "removed": 1, "encoded": 2}
+    assert fake_embedder.calls == [2]
+
+    refreshed = api._prepare_scope(scheme)
+    assert refreshed.catalogue.labels == ["Wheat", "Durum wheat", "Oats"]
+    assert torch.equal(refreshed.embeddings[0], index.embeddings[0])
+    assert torch.equal(
+        refreshed.embeddings, fake_embedder().encode(refreshed.catalogue.labels, True)
+    )
+    assert refreshed.ann.offsets[-1] == 3
+    results = api.semantic_search("oats", scheme, min_num_results=1)
+    assert [obj["iri"] for obj in results] == [f"{scheme}/3"]
+    # The superseded files are deleted where the platform allows, while the old index still
+    # reads them
+    directory = api._embedding_cache.directory
+    assert {f"{refreshed.key}.ivf.npz", f"{refreshed.key}.npy"} <= {
+        path.name for path in directory.iterdir()
+    }
+    assert index.embeddings.sum() > 0
+
+
+def test_query_cache(api, fake_embedder):
+    api.semantic_search("corn", g.CommonSchemes.nace21)
+    api.semantic_search(" corn\t", g.CommonSchemes.nace21)
+    embeddings = api._encode_queries(["wheat", "corn", "wheat"])
+    assert fake_embedder.calls == [1, 1]
+    assert torch.equal(embeddings, fake_embedder().encode(["wheat", "corn", "wheat"], True))
+
+
+def test_result_cache(fake_embedder, fake_glossary):
+    scheme = g.CommonSchemes.nace21.value
+    _, concept = fake_glossary
+    api = g.GlossaryAPI(
+        cfg=Settings(embedding_cache_dir=None, result_cache_maxsize=16), language_code="en"
+    )
+    stats = api.events.subscribe(g.StatsCollector())
+    first = api.semantic_search("corn", scheme, min_num_results=1)
+    first[0]["prefLabel"] = "changed by the caller"
+    assert api.semantic_search("corn  ", scheme, min_num_results=1) != first
+    assert concept.call_count == 1
+    assert stats.summary()["result_cache.hit"]["count"] == 1
+    # Other options and languages are cached separately; `None` is the loaded schemes
+    api.semantic_search("corn", scheme, min_num_results=2)
+    api.semantic_search("corn", min_num_results=1)
+    api.set_language_code("fr")
+    api.semantic_search("corn", scheme, min_num_results=1)
+    api.set_language_code("en")
+    assert stats.summary()["result_cache.hit"]["count"] == 2
+    assert stats.summary()["result_cache.miss"]["count"] == 3
+
+    changed = [{"iri": f"{scheme}/3", "prefLabel": "Corn"}]
+    with patch("sentier_glossary.GlossaryAPI.iter_concepts_for_scheme", return_value=changed):
+        api.refresh_scheme(scheme)
+    results = api.semantic_search("corn", scheme, min_num_results=1)
+    assert [obj["iri"] for obj in results] == [f"{scheme}/3"]
+
+
+def test_snapshot(api, tmp_path, fake_concept):
+    scheme = g.CommonSchemes.nace21.value
+    original = api._prepare_scope(scheme)
+    with patch(
+        "sentier_glossary.GlossaryAPI._requests_get",
+        side_effect=lambda url, params: fake_concept(params["concept_iri"]),
+    ) as get:
+        path = api.export_snapshot(tmp_path / "snapshot", include_relations=True)
+    assert get.call_count == 2
+
+    manifest = json.loads((path / "manifest.json").read_text())
+    assert manifest["format"] == 1
+    assert manifest["model_id"] == "all-mpnet-base-v2"
+    assert [(obj["language_code"], obj["scheme_iri"]) for obj in manifest["indexes"]] == [
+        ("en", scheme)
+    ]
+    with pytest.raises(FileExistsError):
+        api.export_snapshot(path)
+
+    with patch("requests.Session.get") as http:
+        offline = g.GlossaryAPI(cfg=Settings(embedding_cache_dir=None), language_code="en")
+        assert offline.load_snapshot(path) == [("en", scheme)]
+        exact = offline.semantic_search("common wheat", scheme, min_num_results=1)
+        approximate = offline.semantic_search("common wheat", scheme, min_num_results=1, nprobe=1)
+        lexical = offline.lexical_search("corn", scheme, num_results=1)
+    http.assert_not_called()
+
+    assert [obj["iri"] for obj in exact] == [f"{scheme}/1"]
+    assert approximate == exact
+    assert "relations" in exact[0]
+    assert [obj["iri"] for obj in lexical] == [f"{scheme}/2"]
+    index = offline._prepare_scope(scheme)
+    assert isinstance(index.catalogue.offsets, np.memmap)
+    assert isinstance(index.ann.centroids, np.memmap)
+    assert torch.equal(index.embeddings, original.embeddings)
+    assert index.catalogue.labels == original.catalogue.labels
+
+
+def test_snapshot_offline(api, tmp_path):
+    scheme = g.CommonSchemes.nace21.value
+    path = api.export_snapshot(tmp_path / "snapshot")
+
+    offline = g.GlossaryAPI(cfg=Settings(embedding_cache_dir=None, retries=0), language_code="en")
+    offline.load_snapshot(path)
+    with patch("requests.Session.get", side_effect=g.main.requests.ConnectionError) as http:
+        results = offline.semantic_search("common wheat", scheme, min_num_results=1)
+        df = offline.semantic_search("corn", scheme, dataframe=True, min_num_results=1)
+    http.assert_not_called()
+    # Without `include_relations`, the `/concepts` listing records
+    assert results == [
+        {
+            "iri": f"{scheme}/1",
+            "prefLabel": "Wheat",
+            "altLabel": "Common wheat",
+            "scheme_iri": scheme,
+        }
+    ]
+    assert df["iri"].tolist() == [f"{scheme}/2"]
+
+
+def test_snapshot_format(api, tmp_path):
+    path = api.export_snapshot(tmp_path / "snapshot")
+    manifest = json.loads((path / "manifest.json").read_text())
+    (path / "manifest.json").write_text(json.dumps(manifest | {"format": 99}))
+    with pytest.raises(ValueError, match="format 99"):
+        g.GlossaryAPI(cfg=Settings(embedding_cache_dir=None)).load_snapshot(path)
+
+
+def test_hierarchy(api, tmp_path, fake_concepts):
+    scheme = g.CommonSchemes.nace21.value
+    child, parent = f"{scheme}/1", f"{scheme}/2"
+    relations = [
+        # "Wheat" is under "Maize", to have something to find
+        {"type": "broader", "source_concept_iri": child, "target_concept_iri": parent},
+        {"type": "exactMatch", "source_concept_iri": child, "target_concept_iri": "urn:x"},
+    ]
+
+    def concept(url, params):
+        [obj] = [obj for obj in fake_concepts(scheme) if obj["iri"] == params["concept_iri"]]
+        return obj | {"definition": f"About {obj['prefLabel']}", "relations": relations}
+
+    with patch("sentier_glossary.GlossaryAPI._requests_get", side_effect=concept) as get:
+        hierarchy = api.hierarchy(g.CommonSchemes.nace21)
+        assert api.hierarchy(scheme) is hierarchy
+    assert get.call_count == 2
+    assert hierarchy.ancestors(f"{scheme}/1") == [f"{scheme}/2"]
+    assert hierarchy.descendants(f"{scheme}/2") == [f"{scheme}/1"]
+
+    with patch("sentier_glossary.GlossaryAPI.concept") as get:
+        results = api.semantic_search("common wheat", scheme, min_num_results=1)
+        df = api.semantic_search("common wheat", scheme, dataframe=True, min_num_results=1)
+    get.assert_not_called()
+    assert results[0]["broader"] == [{"iri": f"{scheme}/2", "prefLabel": "Maize"}]
+    assert results[0]["scheme_iri"] == scheme
+    # The `concept()` payload, not just the `/concepts` listing record
+    assert results[0]["definition"] == "About Wheat"
+    assert results[0]["relations"] == relations
+    assert df["completeLabel"].tolist() == ["Maize ⧺ Wheat"]
+    assert df["broader_iri"].tolist() == [f"{scheme}/2"]
+
+    # Saved in snapshots
+    path = api.export_snapshot(tmp_path / "snapshot")
+    offline = g.GlossaryAPI(cfg=Settings(embedding_cache_dir=None), language_code="en")
+    offline.load_snapshot(path)
+    assert offline.hierarchy(scheme).parents.tolist() == hierarchy.parents.tolist()
+
+
+def test_encode_sentences_process_pool(fake_embedder):
+    class FakePoolEmbedder(fake_embedder):
+        """`FakeEmbedder` with the `sentence_transformers` process pool interface."""
+
+        def start_multi_process_pool(self, target_devices=None):
+            self.devices = target_devices
+            self.stopped = False
+            return {"processes": target_devices}
+
+        def stop_multi_process_pool(self, pool):
+            self.stopped = True
+
+        def encode(self, sentences, convert_to_tensor=False, pool=None, chunk_size=None, **kwargs):
+            if pool is not None:
+                self.sorted = sentences
+            return super().encode(sentences, convert_to_tensor=convert_to_tensor)
+
+    sentences = [" ".join(["wheat"] * (i % 7 + 1) + [f"w{i}"]) for i in range(5000)]
+    with patch("sentence_transformers.SentenceTransformer", FakePoolEmbedder):
+        api = g.GlossaryAPI(
+            cfg=Settings(embedding_cache_dir=None, encode_processes=3), language_code="en"
+        )
+        embeddings = api._encode_sentences(sentences)
+
+    model = api._model()
+    assert model.devices == ["cpu"] * 3
+    assert model.stopped
+    assert [len(s) for s in model.sorted] == sorted(len(s) for s in sentences)
+    assert np.array_equal(embeddings, fake_embedder().encode(sentences))
@@ -0,0 +1,133 @@
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+
+import sentier_glossary as g
+from sentier_glossary.server import MicroBatcher
+from sentier_glossary.settings import Settings
+
+SCHEME = g.CommonSchemes.nace21.value
+
+
+@pytest.fixture
+def api_settings():
+    # Without the query cache, so `FakeEmbedder.calls` counts every encoded query
+    return Settings(embedding_cache_dir=None, query_cache_maxsize=0)
+
+
+def start(server: g.GlossaryServer) -> g.GlossaryServer:
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def test_micro_batcher():
+    batches = []
+
+    def function(items):
+        batches.append(items)
+        return [ValueError(item) if item < 0 else item * 2 for item in items]
+
+    batcher = MicroBatcher(function, max_batch_size=4, max_wait=0.2)
+    futures = [batcher.submit(item) for item in [1, 2, 3, -4, 5]]
+    assert [future.result() for future in futures[:3]] == [2, 4, 6]
+    with pytest.raises(ValueError):
+        futures[3].result()
+    assert futures[4].result() == 10
+    batcher.close()
+    assert [len(batch) for batch in batches] == [4, 1]
+
+
+def test_server(api):
+    server = start(g.GlossaryServer(api, port=0))
+    try:
+        client = g.GlossaryClient(server.url)
+        expected = api.semantic_search("common wheat", SCHEME, min_num_results=1)
+        results = client.semantic_search("common wheat", g.CommonSchemes.nace21, min_num_results=1)
+        assert results == expected
+        df = client.semantic_search("corn", [SCHEME], dataframe=True, min_num_results=1)
+        assert df["iri"].tolist() == [f"{SCHEME}/2"]
+        df = client.semantic_search_many(["corn", "wheat"], SCHEME, min_num_results=1)
+        assert df["query_index"].tolist() == [0, 1]
+        assert df.columns.tolist() == ["query_index", "query", *g.main.DATAFRAME_COLUMNS]
+        assert client.health()["schemes"] == [["en", SCHEME]]
+        with pytest.raises(KeyError):
+            client.semantic_search("corn", [])
+        with pytest.raises(ValueError):
+            client.semantic_search("corn", SCHEME, min_num_results="many")
+    finally:
+        server.shutdown()
+
+
+def test_server_micro_batches(api, fake_embedder):
+    server = start(g.GlossaryServer(api, port=0, max_wait=0.5))
+    try:
+        client = g.GlossaryClient(server.url)
+        queries = ["corn", "wheat", "maize", "common wheat"] * 2
+        with ThreadPoolExecutor(max_workers=len(queries)) as executor:
+            results = list(
+                executor.map(
+                    lambda query: client.semantic_search(query, SCHEME, min_num_results=1),
+                    queries,
+                )
+            )
+    finally:
+        server.shutdown()
+    assert results[:4] == results[4:]
+    assert sum(fake_embedder.calls) == len(queries)
+    assert len(fake_embedder.calls) < len(queries)
+
+
+def test_server_builds_scopes_outside_the_batcher(api, fake_concepts):
+    isic = g.CommonSchemes.isic4.value
+    building, release = threading.Event(), threading.Event()
+
+    def slow_concepts(scheme_iri, language_code=None):
+        building.set()
+        release.wait(10)
+        return fake_concepts(scheme_iri, language_code)
+
+    server = start(g.GlossaryServer(api, port=0))
+    try:
+        client = g.GlossaryClient(server.url)
+        with (
+            patch(
+                "sentier_glossary.GlossaryAPI.iter_concepts_for_scheme", side_effect=slow_concepts
+            ),
+            ThreadPoolExecutor(max_workers=1) as executor,
+        ):
+            slow = executor.submit(client.semantic_search, "corn", isic, min_num_results=1)
+            assert building.wait(10)
+            # Queries in a loaded scheme don't wait for the new scheme to be built
+            results = client.semantic_search("corn", SCHEME, min_num_results=1)
+            assert not slow.done()
+            release.set()
+            assert [obj["iri"] for obj in slow.result()] == [f"{isic}/2"]
+    finally:
+        release.set()
+        server.shutdown()
+    assert [obj["iri"] for obj in results] == [f"{SCHEME}/2"]
+
+
+def test_server_unix_socket(api, tmp_path):
+    socket_path = str(tmp_path / "glossary.sock")
+    server = start(g.GlossaryServer(api, unix_socket=socket_path))
+    try:
+        client = g.GlossaryClient(server.url)
+        assert client.url == f"unix://{socket_path}"
+        results = client.semantic_search("corn", SCHEME, min_num_results=1)
+        assert [obj["iri"] for obj in results] == [f"{SCHEME}/2"]
+    finally:
+        server.shutdown()
+    with pytest.raises(g.main.requests.exceptions.ConnectionError):
+        client.semantic_search("corn", SCHEME)
+
+
+def test_server_unix_socket_unsupported(api, tmp_path, monkeypatch):
+    monkeypatch.delattr(socket, "AF_UNIX")
+    with pytest.raises(OSError, match="Unix sockets"):
+        g.GlossaryServer(api, unix_socket=str(tmp_path / "glossary.sock"))
+    with pytest.raises(OSError, match="Unix sockets"):
+        g.GlossaryClient(f"unix://{tmp_path / 'glossary.sock'}")